@@ -6,12 +6,82 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./institute.db"
     
+    # Connection pool (ignored for in-memory SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    
+    # Startup refuses to serve unless the schema is at the Alembic head;
+    # auto-migrate is meant for single-process dev servers, not gunicorn -w N
+    DB_SCHEMA_CHECK: bool = True
+    DB_AUTO_MIGRATE: bool = False
+    
+    # SQLite profile applied on every new connection
+    SQLITE_TUNING_ENABLED: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456  # 256MB
+    SQLITE_CACHE_SIZE: int = -65536  # negative = KiB, i.e. 64MB
+    
     # JWT
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password hashing (PBKDF2 rounds; workers=0 hashes on the thread pool)
+    PASSWORD_HASH_ROUNDS: int = 29000
+    PASSWORD_HASH_WORKERS: int = 2
+    
+    # Term report card PDFs: rendered in a process pool (0 = thread pool) and
+    # cached on disk under a hash of their inputs
+    REPORT_CARD_WORKERS: int = 2
+    REPORT_CARD_DIR: str = "./report_cards"
+    
+    # Courses/batches listings cached per worker; writes bump a shared version
+    # row so every worker reloads after a change, the TTL is a backstop
+    REFERENCE_CACHE_TTL_SECONDS: int = 300
+    
+    # Admin dashboard totals cached per worker; writes bump a shared version
+    # row so every worker recomputes after a change, the TTL is a backstop
+    DASHBOARD_CACHE_TTL_SECONDS: int = 30
+    
+    # Attendance analytics of closed periods (past days, weeks, months) cached
+    # per worker; back-dated marks bump a shared version row
+    ANALYTICS_CACHE_TTL_SECONDS: int = 3600
+    ANALYTICS_CACHE_MAX_SIZE: int = 256
+    
+    # Warm pool connections, statements and caches in the background after
+    # startup; /ready answers 503 until this finishes
+    WARMUP_ENABLED: bool = True
+    
+    # Per-route latency/status and DB statement metrics served at /metrics to
+    # scrapers sending "Authorization: Bearer <METRICS_TOKEN>"; unset = 403
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: str = ""
+    
+    # Statements slower than this are logged with their parameters, calling
+    # service method and (once per statement shape) EXPLAIN output; 0 disables
+    SLOW_QUERY_THRESHOLD_MS: int = 200
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_TOP_N: int = 20
+    
+    # N+1 guard for development: "off", "log" (warn per request) or "raise"
+    # (fail the statement that pushes one SQL shape past the threshold)
+    QUERY_GUARD_MODE: str = "off"
+    QUERY_GUARD_THRESHOLD: int = 10
+    
+    # Auth cache (per worker; set size to 0 to disable). Deactivating or
+    # deleting a user, or changing their role or password, bumps a shared
+    # version row; other workers notice within AUTH_REVOCATION_CHECK_SECONDS,
+    # which is how long a revoked user can stay authenticated there
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_SIZE: int = 1024
+    AUTH_REVOCATION_CHECK_SECONDS: int = 2
+    
     # CORS
     ALLOWED_ORIGINS: str = "https://institute-web-app-dusky.vercel.app,http://localhost:3000,http://localhost:3001,http://localhost:3002"
     
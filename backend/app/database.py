@@ -1,15 +1,112 @@
-from sqlalchemy import create_engine
+import os
+from typing import Optional, Tuple
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def _is_sqlite(database_url: str) -> bool:
+    return make_url(database_url).get_backend_name() == "sqlite"
+
+
+def _is_memory_sqlite(database_url: str) -> bool:
+    return _is_sqlite(database_url) and make_url(database_url).database in (None, "", ":memory:")
+
+
+# Async drivers used for each sync driver in DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def to_async_url(database_url: str) -> str:
+    """Swap the sync driver in a database URL for its async counterpart"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None) -> None:
+    """Apply the SQLite performance profile to a new DBAPI connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    finally:
+        cursor.close()
+
+
+def build_engine(database_url: str, sqlite_tuning: bool = None) -> Engine:
+    """Create an engine with pool settings from Settings and the SQLite profile"""
+    if sqlite_tuning is None:
+        sqlite_tuning = settings.SQLITE_TUNING_ENABLED
+    
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if _is_sqlite(database_url):
+        options["connect_args"] = {"check_same_thread": False}
+    if not _is_memory_sqlite(database_url):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    
+    new_engine = create_engine(database_url, **options)
+    if _is_sqlite(database_url) and sqlite_tuning:
+        event.listen(new_engine, "connect", apply_sqlite_pragmas)
+    return new_engine
+
+
+def build_async_engine(database_url: str, sqlite_tuning: bool = None) -> AsyncEngine:
+    """Create an async (aiosqlite/asyncpg/aiomysql) engine mirroring build_engine"""
+    if sqlite_tuning is None:
+        sqlite_tuning = settings.SQLITE_TUNING_ENABLED
+    
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if _is_sqlite(database_url):
+        # aiosqlite connections are cheap and use NullPool, so no pool sizing
+        options["connect_args"] = {"check_same_thread": False}
+    else:
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    
+    new_engine = create_async_engine(to_async_url(database_url), **options)
+    if _is_sqlite(database_url) and sqlite_tuning:
+        event.listen(new_engine.sync_engine, "connect", apply_sqlite_pragmas)
+    return new_engine
+
+
+engine = build_engine(settings.DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The async engine is created on first use so the async driver is only
+# imported by deployments that actually serve async routes
+_async_engine = None
+_AsyncSessionLocal = None
+
 Base = declarative_base()
 
 
@@ -20,3 +117,57 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_async_engine() -> AsyncEngine:
+    """Return the shared async engine, creating it on first use"""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        _async_engine = build_async_engine(settings.DATABASE_URL)
+        _AsyncSessionLocal = async_sessionmaker(
+            _async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+
+def get_alembic_config() -> Config:
+    """Alembic config for the migrations directory, bound to DATABASE_URL"""
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "migrations"))
+    config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+    # Leave the application's logging configuration alone
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def get_schema_revisions(bind: Engine = None) -> Tuple[Optional[str], Tuple[str, ...]]:
+    """Revision recorded in the database and the head revision(s) on disk"""
+    heads = ScriptDirectory.from_config(get_alembic_config()).get_heads()
+    with (bind or engine).connect() as connection:
+        current = MigrationContext.configure(connection).get_current_revision()
+    return current, tuple(heads)
+
+
+def ensure_schema_at_head(auto_migrate: bool = None) -> None:
+    """One version-table read instead of create_all's per-table DDL checks"""
+    if auto_migrate is None:
+        auto_migrate = settings.DB_AUTO_MIGRATE
+    
+    current, heads = get_schema_revisions()
+    if current in heads:
+        return
+    if auto_migrate:
+        command.upgrade(get_alembic_config(), "head")
+        return
+    raise RuntimeError(
+        f"Database schema is at revision {current or 'none'}, expected {', '.join(heads)}. "
+        "Run `alembic upgrade head` from the backend directory "
+        "(existing databases created before migrations: `alembic stamp 0001` first)."
+    )
@@ -4,11 +4,14 @@ from app.models.teacher import Teacher
 from app.models.course import Course
 from app.models.batch import Batch, batch_students
 from app.models.attendance import Attendance
+from app.models.attendance_rollup import StudentBatchAttendance, BatchDailyAttendance
 from app.models.fee import Fee, PaymentStatus, PaymentMethod
 from app.models.study_material import StudyMaterial
 from app.models.test import Test, TestResult
 from app.models.notification import Notification
 from app.models.signup_request import SignupRequest, SignupRequestStatus
+from app.models.refresh_token import RefreshToken
+from app.models.cache_version import CacheVersion
 
 __all__ = [
     "User",
@@ -19,6 +22,8 @@ __all__ = [
     "Batch",
     "batch_students",
     "Attendance",
+    "StudentBatchAttendance",
+    "BatchDailyAttendance",
     "Fee",
     "PaymentStatus",
     "PaymentMethod",
@@ -28,4 +33,6 @@ __all__ = [
     "Notification",
     "SignupRequest",
     "SignupRequestStatus",
+    "RefreshToken",
+    "CacheVersion",
 ]
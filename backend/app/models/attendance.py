@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Date, Boolean, String, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, Date, Boolean, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -6,6 +6,14 @@ from app.database import Base
 
 class Attendance(Base):
     __tablename__ = "attendances"
+    __table_args__ = (
+        # Per-student history by date; portal totals are read from student_batch_attendance instead
+        Index("ix_attendances_student_id_date", "student_id", "date", "is_present"),
+        # Teacher views: one batch's register by day
+        Index("ix_attendances_batch_id_date", "batch_id", "date"),
+        # One mark per student, batch and day; attendance marking upserts on it
+        Index("uq_attendances_student_id_batch_id_date", "student_id", "batch_id", "date", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
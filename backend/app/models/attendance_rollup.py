@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date
+from app.database import Base
+
+
+class StudentBatchAttendance(Base):
+    """Running attendance totals of one student in one batch.
+
+    Kept in step with attendances by TeacherService.mark_attendance (same
+    transaction); `python -m app.services.attendance_rollup_service` rebuilds it.
+    """
+    __tablename__ = "student_batch_attendance"
+
+    # The primary key leads with student_id: a student's totals are one short range scan
+    student_id = Column(Integer, ForeignKey("students.id"), primary_key=True)
+    batch_id = Column(Integer, ForeignKey("batches.id"), primary_key=True, index=True)
+    total = Column(Integer, nullable=False, default=0, server_default="0")
+    present = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class BatchDailyAttendance(Base):
+    """Marks taken and present for one batch on one day, maintained like StudentBatchAttendance"""
+    __tablename__ = "batch_daily_attendance"
+
+    batch_id = Column(Integer, ForeignKey("batches.id"), primary_key=True)
+    date = Column(Date, primary_key=True, index=True)
+    total = Column(Integer, nullable=False, default=0, server_default="0")
+    present = Column(Integer, nullable=False, default=0, server_default="0")
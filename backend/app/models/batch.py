@@ -8,7 +8,8 @@ batch_students = Table(
     'batch_students',
     Base.metadata,
     Column('batch_id', Integer, ForeignKey('batches.id'), primary_key=True),
-    Column('student_id', Integer, ForeignKey('students.id'), primary_key=True)
+    # The primary key leads with batch_id; "batches of a student" needs its own index
+    Column('student_id', Integer, ForeignKey('students.id'), primary_key=True, index=True)
 )
 
 
@@ -19,7 +20,7 @@ class Batch(Base):
     name = Column(String(255), nullable=False)
     code = Column(String(50), unique=True, index=True, nullable=False)
     course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
-    teacher_id = Column(Integer, ForeignKey("teachers.id"))
+    teacher_id = Column(Integer, ForeignKey("teachers.id"), index=True)
     timing = Column(String(100))  # e.g., "7-8", "10:00 AM - 11:00 AM"
     days = Column(String(100))  # e.g., "Mon, Wed, Fri", "Tues"
     start_date = Column(DateTime(timezone=True))
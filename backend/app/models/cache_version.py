@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+
+
+class CacheVersion(Base):
+    """Generation counter shared by every worker for one cached dataset.
+
+    Writers bump it in the same transaction as the change; readers keep
+    their cached copy only while the stored version still matches.
+    """
+    __tablename__ = "cache_versions"
+
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Boolean, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -22,6 +22,13 @@ class PaymentMethod(str, enum.Enum):
 
 class Fee(Base):
     __tablename__ = "fees"
+    __table_args__ = (
+        # A student's fees, and the pending count without touching the table
+        Index("ix_fees_student_id_status", "student_id", "status"),
+        # Admin fee list: keyset pages in (due_date, id) order, with or without a status filter
+        Index("ix_fees_due_date_id", "due_date", "id"),
+        Index("ix_fees_status_due_date_id", "status", "due_date", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
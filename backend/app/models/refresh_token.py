@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import backref, relationship
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class RefreshToken(Base):
+    """Server-side record of an issued refresh token (only its SHA-256 is stored)"""
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
+    expires_at = Column(DateTime, index=True, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    user = relationship("User", backref=backref("refresh_tokens", cascade="all, delete-orphan"))
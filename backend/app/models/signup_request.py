@@ -1,5 +1,6 @@
 import enum
-from sqlalchemy import Column, DateTime, Enum as SQLEnum, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, Enum as SQLEnum, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -11,6 +12,13 @@ class SignupRequestStatus(str, enum.Enum):
     REJECTED = "rejected"
 
 
+# SQLite stores server_default=func.now() as "YYYY-MM-DD HH:MM:SS" text; bind
+# datetimes in the same format so cursor and date-range comparisons are exact
+_SQLITE_TIMESTAMP = sqlite.DATETIME(
+    storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+)
+
+
 class SignupRequest(Base):
     __tablename__ = "signup_requests"
 
@@ -27,7 +35,15 @@ class SignupRequest(Base):
     admin_note = Column(Text, nullable=True)
     approved_at = Column(DateTime(timezone=True), nullable=True)
     approved_by = Column(Integer, ForeignKey("users.id"), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True).with_variant(_SQLITE_TIMESTAMP, "sqlite"), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        # Pending-request check on signup: lower(email) = ? AND status = 'pending'
+        Index("ix_signup_requests_email_lower_status", func.lower(email), status),
+        # Admin request list, newest first, optionally filtered by status
+        Index("ix_signup_requests_created_at_id", created_at, id),
+        Index("ix_signup_requests_status_created_at_id", status, created_at, id),
+    )
+
     approver = relationship("User", foreign_keys=[approved_by])
@@ -13,8 +13,8 @@ class StudyMaterial(Base):
     file_url = Column(String(500), nullable=False)
     file_type = Column(String(50))  # pdf, doc, video, etc.
     file_size = Column(Integer)  # in bytes
-    course_id = Column(Integer, ForeignKey("courses.id"))
-    teacher_id = Column(Integer, ForeignKey("teachers.id"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id"), index=True)
+    teacher_id = Column(Integer, ForeignKey("teachers.id"), nullable=False, index=True)
     is_public = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
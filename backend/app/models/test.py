@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -6,12 +6,16 @@ from app.database import Base
 
 class Test(Base):
     __tablename__ = "tests"
+    __table_args__ = (
+        # Student portal: published tests of the enrolled courses
+        Index("ix_tests_course_id_is_published", "course_id", "is_published"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text)
     course_id = Column(Integer, ForeignKey("courses.id"))
-    teacher_id = Column(Integer, ForeignKey("teachers.id"), nullable=False)
+    teacher_id = Column(Integer, ForeignKey("teachers.id"), nullable=False, index=True)
     total_marks = Column(Integer, nullable=False)
     passing_marks = Column(Integer)
     duration_minutes = Column(Integer)
@@ -26,10 +30,14 @@ class Test(Base):
 
 class TestResult(Base):
     __tablename__ = "test_results"
+    __table_args__ = (
+        # One student's result for a test (submission, evaluation, marks upload)
+        Index("ix_test_results_test_id_student_id", "test_id", "student_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     test_id = Column(Integer, ForeignKey("tests.id"), nullable=False)
-    student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
+    student_id = Column(Integer, ForeignKey("students.id"), nullable=False, index=True)
     marks_obtained = Column(Integer, nullable=False)
     percentage = Column(Integer)
     remarks = Column(Text)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, Enum as SQLEnum
 from sqlalchemy.sql import func
 from app.database import Base
 import enum
@@ -26,3 +26,9 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     last_login = Column(DateTime(timezone=True))
+    
+    # Signup and approval compare case-insensitively; these serve lower(...) = ?
+    __table_args__ = (
+        Index("ix_users_email_lower", func.lower(email)),
+        Index("ix_users_username_lower", func.lower(username)),
+    )
@@ -1,10 +1,22 @@
+import os
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
+from datetime import date
+from typing import Callable, Iterable, Iterator, List, Optional
+from app.database import SessionLocal, get_db, get_async_db
 from app.schemas.admin import *
-from app.services.admin_service import AdminService
-from app.utils.auth import get_current_user, require_role
+from app.services.admin_service import AdminService, analytics_cache, dashboard_cache, reference_cache
+from app.services.auth_service import AuthService
+from app.services.report_card_service import ReportCardService
+from app.utils.auth import get_current_user, require_role, get_auth_cache_stats, get_password_hash_async
+from app.utils.date_buckets import BUCKET_PATTERN
+from app.utils.exports import EXPORT_FORMAT_PATTERN, export_response
+from app.utils.report_cards import ensure_report_card, schedule_report_cards, split_cached
+from app.utils.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, with_page_headers
+from app.utils.responses import json_response, model_list_response, stream_json_array
+from app.utils.slow_queries import slow_query_log
 from app.models import User, UserRole
 
 router = APIRouter()
@@ -13,24 +25,77 @@ router = APIRouter()
 @router.get("/dashboard")
 async def get_dashboard_stats(
     current_user: User = Depends(require_role(UserRole.ADMIN)),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get admin dashboard statistics"""
     admin_service = AdminService(db)
-    return admin_service.get_dashboard_stats()
+    return await admin_service.get_dashboard_stats_async()
+
+
+@router.get("/cache-stats")
+async def get_cache_stats(
+    current_user: User = Depends(require_role(UserRole.ADMIN))
+):
+    """Get auth, reference-data, dashboard and analytics cache hit/miss counters for this worker"""
+    return {
+        **get_auth_cache_stats(),
+        "reference_data": reference_cache.stats(),
+        "dashboard": dashboard_cache.stats(),
+        "attendance_analytics": analytics_cache.stats(),
+    }
+
+
+@router.get("/slow-queries")
+async def get_slow_queries(
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    current_user: User = Depends(require_role(UserRole.ADMIN))
+):
+    """Slowest statement shapes seen by this worker, with their query plans"""
+    return slow_query_log.top(limit)
+
+
+@router.delete("/slow-queries")
+async def clear_slow_queries(
+    current_user: User = Depends(require_role(UserRole.ADMIN))
+):
+    """Reset this worker's slow-query table"""
+    slow_query_log.clear()
+    return {"message": "Slow-query log cleared"}
+
+
+@router.delete("/refresh-tokens/expired")
+async def purge_expired_refresh_tokens(
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db)
+):
+    """Delete all expired refresh tokens"""
+    return {"deleted": AuthService(db).purge_expired_refresh_tokens()}
 
 
 # Student Management
 @router.get("/students", response_model=List[StudentResponse])
 async def get_all_students(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status: Optional[str] = Query(None),
+    course: Optional[str] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    include_total: bool = Query(False),
+    skip: int = Query(0, ge=0, deprecated=True),
     current_user: User = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db)
 ):
-    """Get all students"""
-    admin_service = AdminService(db)
-    return admin_service.get_all_students(skip, limit)
+    """Get students a page at a time; the next page's cursor is in the X-Next-Cursor header"""
+    try:
+        admin_service = AdminService(db)
+        page = admin_service.get_all_students(
+            skip, limit, cursor=cursor, status=status, course=course,
+            start_date=start_date, end_date=end_date, include_total=include_total
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return with_page_headers(json_response(page.items), page)
 
 
 @router.post("/students", response_model=StudentResponse)
@@ -42,7 +107,8 @@ async def create_student(
     """Create a new student"""
     try:
         admin_service = AdminService(db)
-        return admin_service.create_student(student_data)
+        password_hash = await get_password_hash_async(student_data.password)
+        return admin_service.create_student(student_data, password_hash=password_hash)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -122,14 +188,24 @@ async def get_student_batches(
 # Teacher Management
 @router.get("/teachers", response_model=List[TeacherResponse])
 async def get_all_teachers(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status: Optional[str] = Query(None),
+    subject: Optional[str] = Query(None),
+    include_total: bool = Query(False),
+    skip: int = Query(0, ge=0, deprecated=True),
     current_user: User = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db)
 ):
-    """Get all teachers"""
-    admin_service = AdminService(db)
-    return admin_service.get_all_teachers(skip, limit)
+    """Get teachers a page at a time; the next page's cursor is in the X-Next-Cursor header"""
+    try:
+        admin_service = AdminService(db)
+        page = admin_service.get_all_teachers(
+            skip, limit, cursor=cursor, status=status, subject=subject, include_total=include_total
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return with_page_headers(json_response(page.items), page)
 
 
 @router.post("/teachers", response_model=TeacherResponse)
@@ -140,7 +216,8 @@ async def create_teacher(
 ):
     """Create a new teacher"""
     admin_service = AdminService(db)
-    return admin_service.create_teacher(teacher_data)
+    password_hash = await get_password_hash_async(teacher_data.password)
+    return admin_service.create_teacher(teacher_data, password_hash=password_hash)
 
 
 @router.put("/teachers/{teacher_id}", response_model=TeacherResponse)
@@ -170,12 +247,19 @@ async def delete_teacher(
 # Course Management
 @router.get("/courses", response_model=List[CourseResponse])
 async def get_all_courses(
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    include_total: bool = Query(False),
     current_user: User = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db)
 ):
-    """Get all courses"""
-    admin_service = AdminService(db)
-    return admin_service.get_all_courses()
+    """Get courses (all of them unless a limit is given)"""
+    try:
+        admin_service = AdminService(db)
+        page = admin_service.get_all_courses(cursor, limit, include_total=include_total)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return with_page_headers(model_list_response(CourseResponse, page.items), page)
 
 
 @router.post("/courses", response_model=CourseResponse)
@@ -216,12 +300,23 @@ async def delete_course(
 # Batch Management
 @router.get("/batches", response_model=List[BatchResponse])
 async def get_all_batches(
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    course_id: Optional[int] = Query(None),
+    teacher_id: Optional[int] = Query(None),
+    include_total: bool = Query(False),
     current_user: User = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db)
 ):
-    """Get all batches"""
-    admin_service = AdminService(db)
-    return admin_service.get_all_batches()
+    """Get batches (all of them unless a limit is given)"""
+    try:
+        admin_service = AdminService(db)
+        page = admin_service.get_all_batches(
+            cursor, limit, course_id=course_id, teacher_id=teacher_id, include_total=include_total
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return with_page_headers(model_list_response(BatchResponse, page.items), page)
 
 
 @router.post("/batches", response_model=BatchResponse)
@@ -266,15 +361,28 @@ async def delete_batch(
 
 
 # Fee Management
-@router.get("/fees")
+@router.get("/fees", response_model=List[FeeResponse])
 async def get_all_fees(
     status: str = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    student_id: Optional[int] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    include_total: bool = Query(False),
     current_user: User = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db)
 ):
-    """Get all fee records"""
-    admin_service = AdminService(db)
-    return admin_service.get_all_fees(status)
+    """Get fee records by due date (all of them unless a limit is given); start/end_date bound the due date"""
+    try:
+        admin_service = AdminService(db)
+        page = admin_service.get_all_fees(
+            status, cursor, limit, student_id=student_id,
+            start_date=start_date, end_date=end_date, include_total=include_total
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return with_page_headers(model_list_response(FeeResponse, page.items), page)
 
 
 @router.post("/fees")
@@ -313,36 +421,183 @@ async def delete_fee(
 
 
 # Reports
+_ATTENDANCE_SUMMARY_COLUMNS = [
+    ("student_id", "Student ID"), ("student_name", "Student"), ("course", "Course"),
+    ("total_classes", "Classes"), ("present_count", "Present"), ("absent_count", "Absent"),
+    ("attendance_percentage", "Attendance %"),
+]
+_ATTENDANCE_RECORD_COLUMNS = [
+    ("date", "Date"), ("student_id", "Student ID"), ("student_name", "Student"), ("course", "Course"),
+    ("batch_code", "Batch Code"), ("batch_name", "Batch"), ("is_present", "Present"), ("remarks", "Remarks"),
+]
+_FEE_RECORD_COLUMNS = [
+    ("id", "Fee ID"), ("student_id", "Student ID"), ("student_name", "Student"), ("course", "Course"),
+    ("amount", "Amount"), ("paid_amount", "Paid"), ("pending_amount", "Pending"), ("due_date", "Due Date"),
+    ("payment_date", "Payment Date"), ("status", "Status"), ("payment_method", "Method"),
+    ("transaction_id", "Transaction ID"), ("remarks", "Remarks"),
+]
+_TEST_MARKS_COLUMNS = [
+    ("id", "Result ID"), ("studentName", "Student"), ("class", "Class"), ("testName", "Test"),
+    ("maxMarks", "Max Marks"), ("obtained", "Obtained"), ("uploadedBy", "Uploaded By"), ("date", "Date"),
+]
+
+
+def _report_rows(build: Callable[[AdminService], Iterable[dict]]) -> Iterator[dict]:
+    """Report rows read by a streamed body, from a session the stream owns.
+
+    get_db sessions are closed before a streamed body is sent; this
+    generator runs in the threadpool while the response is written.
+    """
+    db = SessionLocal()
+    try:
+        yield from build(AdminService(db))
+    finally:
+        db.close()
+
+
+def _export_filename(report: str) -> str:
+    return f"{report}-{date.today().isoformat()}"
+
+
 @router.get("/reports/attendance")
 async def get_attendance_report(
-    start_date: str = Query(None),
-    end_date: str = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    course: Optional[str] = Query(None),
+    batch_id: Optional[int] = Query(None),
+    export_format: str = Query("json", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db)
+):
+    """Get attendance summary report for all students, lowest attendance first (format=csv|xlsx to download)"""
+    if export_format != "json":
+        rows = _report_rows(lambda service: service.iter_attendance_summary_report(
+            start_date, end_date, course, batch_id
+        ))
+        return export_response(rows, _ATTENDANCE_SUMMARY_COLUMNS, export_format,
+                               _export_filename("attendance-summary"), "Attendance")
+    admin_service = AdminService(db)
+    return json_response(admin_service.get_attendance_summary_report(start_date, end_date, course, batch_id))
+
+
+@router.get("/reports/attendance/records")
+async def get_attendance_records_report(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    course: Optional[str] = Query(None),
+    batch_id: Optional[int] = Query(None),
+    export_format: str = Query("json", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    current_user: User = Depends(require_role(UserRole.ADMIN))
+):
+    """Get every attendance mark behind the summary, streamed (JSON array, CSV or XLSX)"""
+    rows = _report_rows(lambda service: service.iter_attendance_records(start_date, end_date, course, batch_id))
+    if export_format == "json":
+        return stream_json_array(rows)
+    return export_response(rows, _ATTENDANCE_RECORD_COLUMNS, export_format,
+                           _export_filename("attendance-records"), "Attendance")
+
+
+@router.get("/reports/attendance/analytics")
+async def get_attendance_analytics(
+    bucket: str = Query("week", pattern=BUCKET_PATTERN),
+    group_by: str = Query("batch", pattern="^(batch|course|teacher)$"),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    course_id: Optional[int] = Query(None),
+    batch_id: Optional[int] = Query(None),
+    teacher_id: Optional[int] = Query(None),
     current_user: User = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db)
 ):
-    """Get attendance summary report for all students"""
+    """Get attendance per day, week or month, grouped by batch, course or teacher (last 90 days by default)"""
     admin_service = AdminService(db)
-    return admin_service.get_attendance_summary_report()
+    try:
+        rows = admin_service.get_attendance_analytics(
+            bucket, group_by, start_date, end_date, course_id, batch_id, teacher_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return json_response(rows)
 
 
 @router.get("/reports/fees")
 async def get_fee_report(
+    status: Optional[str] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    export_format: str = Query("json", alias="format", pattern=EXPORT_FORMAT_PATTERN),
     current_user: User = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db)
 ):
-    """Get fee collection report"""
+    """Get fee collection report; format=csv|xlsx downloads the fee ledger (status and due-date filters)"""
+    if export_format != "json":
+        rows = _report_rows(lambda service: service.iter_fee_records(status, start_date, end_date))
+        return export_response(rows, _FEE_RECORD_COLUMNS, export_format, _export_filename("fee-ledger"), "Fees")
     admin_service = AdminService(db)
     return admin_service.get_fee_report()
 
 
 @router.get("/reports/test-marks")
 async def get_test_marks_report(
+    course_id: Optional[int] = Query(None),
+    teacher_id: Optional[int] = Query(None),
+    test_id: Optional[int] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    export_format: str = Query("json", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    current_user: User = Depends(require_role(UserRole.ADMIN))
+):
+    """Get test marks report, streamed as a JSON array, CSV or XLSX"""
+    rows = _report_rows(lambda service: service.iter_test_marks_report(
+        course_id, teacher_id, test_id, start_date, end_date
+    ))
+    if export_format == "json":
+        return stream_json_array(rows)
+    return export_response(rows, _TEST_MARKS_COLUMNS, export_format, _export_filename("test-marks"), "Test Marks")
+
+
+# Report Cards
+@router.post("/report-cards", status_code=status.HTTP_202_ACCEPTED)
+async def generate_report_cards(
+    course: str = Query(...),
+    start_date: date = Query(...),
+    end_date: date = Query(...),
     current_user: User = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db)
 ):
-    """Get test marks report"""
-    admin_service = AdminService(db)
-    return admin_service.get_test_marks_report()
+    """Queue term report cards for every student of a course; cards whose inputs are unchanged are reused"""
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date is before start_date")
+    cards = ReportCardService(db).get_course_cards(course, start_date, end_date)
+    cached, missing = split_cached(cards)
+    schedule_report_cards(cards, missing)
+    return {"course": course, "students": len(cards), "cached": len(cached), "queued": len(missing)}
+
+
+@router.get("/report-cards/{student_id}")
+async def get_report_card(
+    student_id: int,
+    start_date: date = Query(...),
+    end_date: date = Query(...),
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+    db: Session = Depends(get_db)
+):
+    """Download a student's term report card, rendering it first if it is not cached"""
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date is before start_date")
+    card = ReportCardService(db).get_student_card(student_id, start_date, end_date)
+    if card is None:
+        raise HTTPException(status_code=404, detail="Student not found")
+    for _ in range(2):
+        path = await ensure_report_card(card)
+        try:
+            stat_result = os.stat(path)
+        except FileNotFoundError:
+            # Removed as superseded by a render of newer data; render this one again
+            continue
+        return FileResponse(path, stat_result=stat_result, media_type="application/pdf",
+                            filename=f"report-card-{student_id}-{start_date}-{end_date}.pdf")
+    raise HTTPException(status_code=503, detail="Report card was replaced while rendering, please retry")
 
 
 @router.get("/reports/assignments")
@@ -352,4 +607,4 @@ async def get_assignments_report(
 ):
     """Get assignments/tests report"""
     admin_service = AdminService(db)
-    return admin_service.get_assignments_report()
+    return json_response(admin_service.get_assignments_report())
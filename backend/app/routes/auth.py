@@ -2,9 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException, status, Body
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.schemas.auth import UserCreate, UserLogin, Token, UserResponse
+from typing import Optional
+from app.schemas.auth import UserCreate, UserLogin, Token, UserResponse, RefreshTokenRequest
 from app.services.auth_service import AuthService
-from app.utils.auth import get_current_user
+from app.utils.auth import get_current_user, get_password_hash_async
 from app.models import User
 
 router = APIRouter()
@@ -15,7 +16,8 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user"""
     auth_service = AuthService(db)
     try:
-        user = auth_service.register_user(user_data)
+        password_hash = await get_password_hash_async(user_data.password)
+        user = auth_service.register_user(user_data, password_hash=password_hash)
         return user
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -25,7 +27,7 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
 async def login(credentials: UserLogin, db: Session = Depends(get_db)):
     """Login user and return access token (JSON)"""
     auth_service = AuthService(db)
-    token = auth_service.login(credentials.email, credentials.password)
+    token = await auth_service.login_async(credentials.email, credentials.password)
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -42,7 +44,7 @@ async def login_for_swagger(
     """OAuth2 compatible login for Swagger UI (form data)"""
     auth_service = AuthService(db)
     # OAuth2PasswordRequestForm uses 'username' field but we want email
-    token = auth_service.login(form_data.username, form_data.password)
+    token = await auth_service.login_async(form_data.username, form_data.password)
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -59,17 +61,28 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_user)):
-    """Logout current user"""
+async def logout(
+    payload: Optional[RefreshTokenRequest] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Logout current user, revoking the supplied refresh token"""
+    if payload:
+        AuthService(db).revoke_refresh_token(payload.refresh_token)
     return {"message": "Successfully logged out"}
 
 
 @router.post("/refresh", response_model=Token)
-async def refresh_token(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Refresh access token"""
+async def refresh_token(payload: RefreshTokenRequest, db: Session = Depends(get_db)):
+    """Exchange a refresh token for a new access token (the refresh token is rotated)"""
     auth_service = AuthService(db)
-    token = auth_service.create_access_token({"sub": current_user.email, "role": current_user.role})
-    return {"access_token": token, "token_type": "bearer"}
+    token = auth_service.refresh(payload.refresh_token)
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token"
+        )
+    return token
 
 
 @router.post("/reset-password")
@@ -79,7 +92,7 @@ async def reset_password(
     db: Session = Depends(get_db)
 ):
     """Reset user password"""
-    from app.utils.auth import get_password_hash
+    from app.utils.auth import invalidate_cached_user
     
     # Find user by email
     user = db.query(User).filter(User.email == email).first()
@@ -87,7 +100,10 @@ async def reset_password(
         raise HTTPException(status_code=404, detail="User with this email not found")
     
     # Update password
-    user.password_hash = get_password_hash(new_password)
+    user.password_hash = await get_password_hash_async(new_password)
     db.commit()
+    invalidate_cached_user(user.email)
+    # Sessions started with the old password must log in again
+    AuthService(db).revoke_user_refresh_tokens(user.id)
     
     return {"message": "Password reset successfully"}
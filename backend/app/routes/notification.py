@@ -1,7 +1,8 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models import User, UserRole
 from app.schemas.notification import (
     NotificationCreate,
@@ -18,11 +19,11 @@ router = APIRouter()
 @router.get("/", response_model=List[NotificationResponse], include_in_schema=False)
 async def list_notifications(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     service = NotificationService(db)
     role_filter = current_user.role.value if current_user.role else None
-    return service.get_recent_notifications(role_filter=role_filter)
+    return await service.get_recent_notifications_async(role_filter=role_filter)
 
 
 @router.post("", response_model=NotificationResponse, status_code=status.HTTP_201_CREATED)
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
@@ -15,7 +15,9 @@ from app.schemas.signup import (
 )
 from app.services.notification_service import NotificationService
 from app.services.signup_service import SignupService
-from app.utils.auth import require_role
+from app.utils.auth import require_role, get_password_hash_async
+from app.utils.pagination import MAX_PAGE_SIZE, with_page_headers
+from app.utils.responses import model_list_response
 
 router = APIRouter()
 
@@ -28,7 +30,8 @@ async def submit_signup_request(payload: SignupSubmissionRequest, db: Session =
 
     signup_service = SignupService(db)
     try:
-        signup_request = signup_service.create_request(payload)
+        password_hash = await get_password_hash_async(payload.password)
+        signup_request = signup_service.create_request(payload, password_hash=password_hash)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
@@ -63,11 +66,22 @@ async def submit_signup_request(payload: SignupSubmissionRequest, db: Session =
 @router.get("/requests", response_model=List[SignupRequestResponse])
 async def list_signup_requests(
     status: Optional[SignupRequestStatus] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    include_total: bool = Query(False),
     current_user: User = Depends(require_role(UserRole.ADMIN)),
     db: Session = Depends(get_db),
 ):
     service = SignupService(db)
-    return service.list_requests(status)
+    try:
+        page = service.list_requests(
+            status, cursor, limit, start_date=start_date, end_date=end_date, include_total=include_total
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return with_page_headers(model_list_response(SignupRequestResponse, page.items), page)
 
 
 @router.post("/{request_id}/approve", response_model=SignupRequestResponse)
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.schemas.student import *
 from app.services.student_service import StudentService
-from app.utils.auth import get_current_user, require_role
+from app.utils.auth import get_current_user, require_role, require_principal_role
 from app.models import User, UserRole
+from app.schemas.auth import Principal
 
 router = APIRouter()
 
@@ -14,7 +16,7 @@ STUDENT DATA ISOLATION - SECURITY POLICY:
 
 All routes in this module enforce strict data isolation:
 1. Authentication: require_role(UserRole.STUDENT) ensures only students can access
-2. Authorization: current_user.id from JWT token identifies the authenticated student
+2. Authorization: user_id and student_id claims from the JWT identify the authenticated student
 3. Service Layer: All methods filter data by user_id, preventing access to other students' data
 4. No URL-based student_id parameters: Student identity comes from JWT, not URL
 
@@ -35,52 +37,52 @@ Students CANNOT:
 
 @router.get("/dashboard")
 async def get_student_dashboard(
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
-    db: Session = Depends(get_db)
+    principal: Principal = Depends(require_principal_role(UserRole.STUDENT)),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get student dashboard data - ONLY authenticated student's own data"""
     student_service = StudentService(db)
-    return student_service.get_dashboard(current_user.id)
+    return await student_service.get_dashboard_async(principal.user_id, student_id=principal.student_id)
 
 
 @router.get("/attendance")
 async def get_my_attendance(
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    principal: Principal = Depends(require_principal_role(UserRole.STUDENT)),
     db: Session = Depends(get_db)
 ):
     """Get student's attendance records"""
     student_service = StudentService(db)
-    return student_service.get_student_attendance(current_user.id)
+    return student_service.get_student_attendance(principal.user_id, student_id=principal.student_id)
 
 
 @router.get("/fees")
 async def get_my_fees(
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    principal: Principal = Depends(require_principal_role(UserRole.STUDENT)),
     db: Session = Depends(get_db)
 ):
     """Get student's fee records"""
     student_service = StudentService(db)
-    return student_service.get_student_fees(current_user.id)
+    return student_service.get_student_fees(principal.user_id, student_id=principal.student_id)
 
 
 @router.get("/tests")
 async def get_my_tests(
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    principal: Principal = Depends(require_principal_role(UserRole.STUDENT)),
     db: Session = Depends(get_db)
 ):
     """Get student's test results"""
     student_service = StudentService(db)
-    return student_service.get_student_tests(current_user.id)
+    return student_service.get_student_tests(principal.user_id, student_id=principal.student_id)
 
 
 @router.get("/study-materials")
 async def get_study_materials(
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    principal: Principal = Depends(require_principal_role(UserRole.STUDENT)),
     db: Session = Depends(get_db)
 ):
     """Get available study materials"""
     student_service = StudentService(db)
-    return student_service.get_study_materials(current_user.id)
+    return student_service.get_study_materials(principal.user_id, student_id=principal.student_id)
 
 
 @router.get("/study-materials/{material_id}/download")
@@ -108,29 +110,29 @@ async def download_study_material(
 async def submit_test(
     test_id: int,
     submission: TestSubmission,
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    principal: Principal = Depends(require_principal_role(UserRole.STUDENT)),
     db: Session = Depends(get_db)
 ):
     """Submit a test"""
     student_service = StudentService(db)
-    return student_service.submit_test(current_user.id, test_id, submission)
+    return student_service.submit_test(principal.user_id, test_id, submission, student_id=principal.student_id)
 
 
 @router.get("/batches")
 async def get_my_batches(
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    principal: Principal = Depends(require_principal_role(UserRole.STUDENT)),
     db: Session = Depends(get_db)
 ):
     """Get student's enrolled batches"""
     student_service = StudentService(db)
-    return student_service.get_student_batches(current_user.id)
+    return student_service.get_student_batches(principal.user_id, student_id=principal.student_id)
 
 
 @router.get("/available-tests")
 async def get_available_tests(
-    current_user: User = Depends(require_role(UserRole.STUDENT)),
+    principal: Principal = Depends(require_principal_role(UserRole.STUDENT)),
     db: Session = Depends(get_db)
 ):
     """Get available tests/assignments for student"""
     student_service = StudentService(db)
-    return student_service.get_available_tests(current_user.id)
+    return student_service.get_available_tests(principal.user_id, student_id=principal.student_id)
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.schemas.teacher import *
 from app.services.teacher_service import TeacherService
-from app.utils.auth import get_current_user, require_role
+from app.utils.auth import get_current_user, require_role, require_principal_role
+from app.utils.responses import json_response, model_list_response
 from app.models import User, UserRole
+from app.schemas.auth import Principal
 
 router = APIRouter()
 
@@ -27,33 +30,41 @@ router = APIRouter()
 
 @router.get("/dashboard")
 async def get_teacher_dashboard(
-    current_user: User = Depends(require_role(UserRole.TEACHER)),
+    principal: Principal = Depends(require_principal_role(UserRole.TEACHER)),
     db: Session = Depends(get_db)
 ):
     """Get teacher dashboard data"""
     teacher_service = TeacherService(db)
-    return teacher_service.get_dashboard(current_user.id)
+    return teacher_service.get_dashboard(principal.user_id, teacher_id=principal.teacher_id)
 
 
 @router.get("/batches")
 async def get_my_batches(
-    current_user: User = Depends(require_role(UserRole.TEACHER)),
-    db: Session = Depends(get_db)
+    principal: Principal = Depends(require_principal_role(UserRole.TEACHER)),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get teacher's assigned batches"""
     teacher_service = TeacherService(db)
-    return teacher_service.get_teacher_batches(current_user.id)
+    return json_response(
+        await teacher_service.get_teacher_batches_async(principal.user_id, teacher_id=principal.teacher_id)
+    )
 
 
 @router.post("/attendance", response_model=List[AttendanceResponse])
 async def mark_attendance(
     attendance_data: AttendanceCreate,
-    current_user: User = Depends(require_role(UserRole.TEACHER)),
+    principal: Principal = Depends(require_principal_role(UserRole.TEACHER)),
     db: Session = Depends(get_db)
 ):
-    """Mark attendance for students"""
-    teacher_service = TeacherService(db)
-    return teacher_service.mark_attendance(current_user.id, attendance_data)
+    """Mark attendance for students (re-marking a day overwrites it)"""
+    try:
+        teacher_service = TeacherService(db)
+        return model_list_response(
+            AttendanceResponse,
+            teacher_service.mark_attendance(principal.user_id, attendance_data, teacher_id=principal.teacher_id),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/attendance/batch/{batch_id}")
@@ -70,75 +81,75 @@ async def get_batch_attendance(
 @router.post("/study-materials")
 async def upload_study_material(
     material_data: StudyMaterialCreate,
-    current_user: User = Depends(require_role(UserRole.TEACHER)),
+    principal: Principal = Depends(require_principal_role(UserRole.TEACHER)),
     db: Session = Depends(get_db)
 ):
     """Upload study material"""
     teacher_service = TeacherService(db)
-    return teacher_service.create_study_material(current_user.id, material_data)
+    return teacher_service.create_study_material(principal.user_id, material_data, teacher_id=principal.teacher_id)
 
 
 @router.get("/study-materials")
 async def get_my_study_materials(
-    current_user: User = Depends(require_role(UserRole.TEACHER)),
+    principal: Principal = Depends(require_principal_role(UserRole.TEACHER)),
     db: Session = Depends(get_db)
 ):
     """Get teacher's uploaded study materials"""
     teacher_service = TeacherService(db)
-    return teacher_service.get_teacher_study_materials(current_user.id)
+    return teacher_service.get_teacher_study_materials(principal.user_id, teacher_id=principal.teacher_id)
 
 
 @router.post("/tests")
 async def create_test(
     test_data: TestCreate,
-    current_user: User = Depends(require_role(UserRole.TEACHER)),
+    principal: Principal = Depends(require_principal_role(UserRole.TEACHER)),
     db: Session = Depends(get_db)
 ):
     """Create a new test"""
     teacher_service = TeacherService(db)
-    return teacher_service.create_test(current_user.id, test_data)
+    return teacher_service.create_test(principal.user_id, test_data, teacher_id=principal.teacher_id)
 
 
 @router.get("/tests")
 async def get_my_tests(
-    current_user: User = Depends(require_role(UserRole.TEACHER)),
+    principal: Principal = Depends(require_principal_role(UserRole.TEACHER)),
     db: Session = Depends(get_db)
 ):
     """Get teacher's created tests"""
     teacher_service = TeacherService(db)
-    return teacher_service.get_teacher_tests(current_user.id)
+    return teacher_service.get_teacher_tests(principal.user_id, teacher_id=principal.teacher_id)
 
 
 @router.post("/tests/{test_id}/evaluate")
 async def evaluate_test(
     test_id: int,
     evaluation: TestEvaluation,
-    current_user: User = Depends(require_role(UserRole.TEACHER)),
+    principal: Principal = Depends(require_principal_role(UserRole.TEACHER)),
     db: Session = Depends(get_db)
 ):
     """Evaluate a student's test (only for tests created by this teacher)"""
     teacher_service = TeacherService(db)
-    return teacher_service.evaluate_test(current_user.id, test_id, evaluation)
+    return teacher_service.evaluate_test(principal.user_id, test_id, evaluation, teacher_id=principal.teacher_id)
 
 
 @router.post("/tests/{test_id}/results")
 async def upload_test_results(
     test_id: int,
     results: BulkTestResultCreate,
-    current_user: User = Depends(require_role(UserRole.TEACHER)),
+    principal: Principal = Depends(require_principal_role(UserRole.TEACHER)),
     db: Session = Depends(get_db)
 ):
     """Upload test results for multiple students"""
     teacher_service = TeacherService(db)
-    return teacher_service.upload_test_results(current_user.id, test_id, results.results)
+    return teacher_service.upload_test_results(principal.user_id, test_id, results.results, teacher_id=principal.teacher_id)
 
 
 @router.get("/students/performance/{student_id}")
 async def get_student_performance(
     student_id: int,
-    current_user: User = Depends(require_role(UserRole.TEACHER)),
+    principal: Principal = Depends(require_principal_role(UserRole.TEACHER)),
     db: Session = Depends(get_db)
 ):
     """Get performance report for a specific student (only showing this teacher's test results)"""
     teacher_service = TeacherService(db)
-    return teacher_service.get_student_performance(current_user.id, student_id)
+    return teacher_service.get_student_performance(principal.user_id, student_id, teacher_id=principal.teacher_id)
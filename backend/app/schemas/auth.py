@@ -36,9 +36,23 @@ class UserResponse(UserBase):
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    refresh_token: Optional[str] = None
     user: dict
 
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+
 class TokenData(BaseModel):
     email: Optional[str] = None
     role: Optional[UserRole] = None
+
+
+class Principal(BaseModel):
+    """Authenticated caller as carried in the signed access token claims"""
+    user_id: int
+    email: str
+    role: UserRole
+    student_id: Optional[int] = None
+    teacher_id: Optional[int] = None
@@ -3,6 +3,8 @@ from app.services.admin_service import AdminService
 from app.services.student_service import StudentService
 from app.services.teacher_service import TeacherService
 from app.services.payment_service import PaymentService
+from app.services.report_card_service import ReportCardService
+from app.services.attendance_rollup_service import AttendanceRollupService
 
 __all__ = [
     "AuthService",
@@ -10,4 +12,6 @@ __all__ = [
     "StudentService",
     "TeacherService",
     "PaymentService",
+    "ReportCardService",
+    "AttendanceRollupService",
 ]
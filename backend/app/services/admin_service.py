@@ -1,43 +1,148 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from datetime import datetime, date
-from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
+from sqlalchemy import case, event, func, inspect, select, update
+from datetime import datetime, date, time, timedelta
+from itertools import chain
+from typing import Iterator, List, Optional, Union
 from app.models import *
 from app.schemas.admin import *
-from app.utils.auth import get_password_hash
+from app.config import settings
+from app.services.attendance_rollup_service import (
+    ANALYTICS_VERSION, BUMP_ANALYTICS_VERSION, AttendanceRollupService
+)
+from app.utils.auth import get_password_hash, invalidate_cached_user
+from app.utils.cache import TTLCache, detached_copy
+from app.utils.date_buckets import bucket_start, date_bucket
+from app.utils.pagination import Page, keyset_paginate, paginate_sorted
+
+# Course and batch listings are read on most admin pages and change rarely;
+# entries are stored with the cache_versions generation they were read at
+reference_cache = TTLCache(max_size=16, ttl_seconds=settings.REFERENCE_CACHE_TTL_SECONDS)
+REFERENCE_DATA_KEY = "reference_data"
+_REFERENCE_MODELS = (Course, Batch)
+
+_REFERENCE_VERSION = select(CacheVersion.version).where(CacheVersion.name == REFERENCE_DATA_KEY)
+_BUMP_REFERENCE_VERSION = (
+    update(CacheVersion)
+    .where(CacheVersion.name == REFERENCE_DATA_KEY)
+    .values(version=CacheVersion.version + 1)
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_reference_data(session: Session, flush_context) -> None:
+    """Bump the shared reference-data version so every worker reloads courses and batches"""
+    if any(isinstance(obj, _REFERENCE_MODELS) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.connection().execute(_BUMP_REFERENCE_VERSION)
+        reference_cache.clear()
+
+# Dashboard totals, stored with the cache_versions generation they were read at
+dashboard_cache = TTLCache(max_size=1, ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS)
+DASHBOARD_STATS_KEY = "dashboard_stats"
+_DASHBOARD_MODELS = (Student, Teacher, Course, Batch, Fee)
+
+_DASHBOARD_VERSION = select(CacheVersion.version).where(CacheVersion.name == DASHBOARD_STATS_KEY)
+_BUMP_DASHBOARD_VERSION = (
+    update(CacheVersion)
+    .where(CacheVersion.name == DASHBOARD_STATS_KEY)
+    .values(version=CacheVersion.version + 1)
+)
+# Every dashboard figure in one round trip: the fee sums aggregate the fees
+# table once, the counts ride along as scalar subqueries
+_DASHBOARD_STATS = select(
+    _DASHBOARD_VERSION.scalar_subquery().label("version"),
+    select(func.count(Student.id)).scalar_subquery().label("total_students"),
+    select(func.count(Teacher.id)).scalar_subquery().label("total_teachers"),
+    select(func.count(Course.id)).scalar_subquery().label("total_courses"),
+    select(func.count(Batch.id)).scalar_subquery().label("total_batches"),
+    func.coalesce(func.sum(Fee.amount), 0).label("total_fees"),
+    func.coalesce(func.sum(Fee.paid_amount), 0).label("collected_fees"),
+).select_from(Fee)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_dashboard_stats(session: Session, flush_context) -> None:
+    """Bump the shared dashboard version in the flushing transaction.
+
+    Other workers see the new version once this transaction commits and
+    recompute on their next read; the TTL bounds staleness from writes that
+    bypass the ORM (Core statements, bulk deletes).
+    """
+    if any(isinstance(obj, _DASHBOARD_MODELS) for obj in chain(session.new, session.dirty, session.deleted)):
+        session.connection().execute(_BUMP_DASHBOARD_VERSION)
+        dashboard_cache.delete(DASHBOARD_STATS_KEY)
+
+
+# Attendance analytics of closed periods, stored with the analytics version they were read at
+analytics_cache = TTLCache(max_size=settings.ANALYTICS_CACHE_MAX_SIZE, ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS)
+ANALYTICS_GROUPS = ("batch", "course", "teacher")
+_ANALYTICS_MODELS = (Batch, Course, Teacher)
+
+
+def _renames_teacher(obj) -> bool:
+    """Teacher groups are labelled with User.full_name; logins only touch last_login"""
+    return (
+        isinstance(obj, User)
+        and obj.role == UserRole.TEACHER
+        and inspect(obj).attrs.full_name.history.has_changes()
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_attendance_analytics(session: Session, flush_context) -> None:
+    """Renaming or reassigning a batch, course or teacher regroups closed periods too"""
+    if any(isinstance(obj, _ANALYTICS_MODELS) or _renames_teacher(obj)
+           for obj in chain(session.dirty, session.deleted)):
+        session.connection().execute(BUMP_ANALYTICS_VERSION)
+        analytics_cache.clear()
+
+
+def _dashboard_stats_from_row(row) -> dict:
+    stats = row._asdict()
+    version = stats.pop("version")
+    stats["pending_fees"] = stats["total_fees"] - stats["collected_fees"]
+    # Without a version row (schema not migrated) every read recomputes
+    if version is not None:
+        dashboard_cache.set(DASHBOARD_STATS_KEY, (version, stats))
+    return dict(stats)
 
 
 class AdminService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Union[Session, AsyncSession]):
         self.db = db
     
     def get_dashboard_stats(self) -> dict:
         """Get dashboard statistics"""
-        total_students = self.db.query(Student).count()
-        total_teachers = self.db.query(Teacher).count()
-        total_courses = self.db.query(Course).count()
-        total_batches = self.db.query(Batch).count()
-        
-        # Fee statistics
-        total_fees = self.db.query(func.sum(Fee.amount)).scalar() or 0
-        collected_fees = self.db.query(func.sum(Fee.paid_amount)).scalar() or 0
-        pending_fees = total_fees - collected_fees
-        
-        return {
-            "total_students": total_students,
-            "total_teachers": total_teachers,
-            "total_courses": total_courses,
-            "total_batches": total_batches,
-            "total_fees": total_fees,
-            "collected_fees": collected_fees,
-            "pending_fees": pending_fees
-        }
+        cached = dashboard_cache.get(DASHBOARD_STATS_KEY)
+        if cached is not None and cached[0] == self.db.scalar(_DASHBOARD_VERSION):
+            return dict(cached[1])
+        return _dashboard_stats_from_row(self.db.execute(_DASHBOARD_STATS).one())
+    
+    async def get_dashboard_stats_async(self) -> dict:
+        """Async variant of get_dashboard_stats for use with an AsyncSession"""
+        cached = dashboard_cache.get(DASHBOARD_STATS_KEY)
+        if cached is not None and cached[0] == await self.db.scalar(_DASHBOARD_VERSION):
+            return dict(cached[1])
+        return _dashboard_stats_from_row((await self.db.execute(_DASHBOARD_STATS)).one())
     
     # Student Management
-    def get_all_students(self, skip: int = 0, limit: int = 100) -> List[dict]:
-        """Get all students"""
-        students = self.db.query(Student).offset(skip).limit(limit).all()
-        return [
+    def get_all_students(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+                         status: Optional[str] = None, course: Optional[str] = None,
+                         start_date: Optional[date] = None, end_date: Optional[date] = None,
+                         include_total: bool = False) -> Page:
+        """Get a page of students in id order, continuing after `cursor` (skip is the legacy offset)"""
+        # Users arrive in one IN query per page, not one lazy load per student
+        query = self.db.query(Student).options(selectinload(Student.user))
+        if status:
+            query = query.filter(Student.status == status)
+        if course:
+            query = query.filter(Student.course == course)
+        if start_date:
+            query = query.filter(Student.enrollment_date >= start_date)
+        if end_date:
+            query = query.filter(Student.enrollment_date <= end_date)
+        page = keyset_paginate(query, [Student.id], cursor, limit, include_total, offset=0 if cursor else skip)
+        page.items = [
             {
                 "id": s.id,
                 "name": s.user.full_name,
@@ -49,11 +154,12 @@ class AdminService:
                 "status": s.status,
                 "enrollment_date": s.enrollment_date
             }
-            for s in students
+            for s in page.items
         ]
+        return page
     
-    def create_student(self, student_data: StudentCreate) -> dict:
-        """Create a new student with validation"""
+    def create_student(self, student_data: StudentCreate, password_hash: Optional[str] = None) -> dict:
+        """Create a new student with validation (password_hash may be pre-computed off the event loop)"""
         # Validate batch timing conflicts if batch code is provided
         if student_data.batch:
             # Find the batch by code
@@ -73,7 +179,7 @@ class AdminService:
             full_name=student_data.name,
             phone=student_data.phone,
             role=UserRole.STUDENT,
-            password_hash=get_password_hash(student_data.password),
+            password_hash=password_hash or get_password_hash(student_data.password),
             is_active=True
         )
         self.db.add(user)
@@ -157,6 +263,7 @@ class AdminService:
             student.status = student_data.status
         
         self.db.commit()
+        invalidate_cached_user(student.user.email)
         self.db.refresh(student)
         
         # Return combined data for response
@@ -194,6 +301,7 @@ class AdminService:
         for fee in list(student.fees):
             self.db.delete(fee)
 
+        AttendanceRollupService(self.db).remove_student(student.id, student.attendances)
         for attendance in list(student.attendances):
             self.db.delete(attendance)
 
@@ -210,6 +318,8 @@ class AdminService:
             self.db.delete(user)
 
         self.db.commit()
+        if user:
+            invalidate_cached_user(user.email)
     
     def enroll_student_in_batch(self, student_id: int, batch_id: int):
         """Enroll a student in a batch with timing conflict validation"""
@@ -261,30 +371,34 @@ class AdminService:
     
     def get_student_batches(self, student_id: int) -> List[dict]:
         """Get all batches a student is enrolled in"""
-        student = self.db.query(Student).filter(Student.id == student_id).first()
-        if not student:
+        if self.db.query(Student.id).filter(Student.id == student_id).first() is None:
             raise ValueError("Student not found")
         
-        return [
-            {
-                "id": b.id,
-                "name": b.name,
-                "code": b.code,
-                "timing": b.timing,
-                "days": b.days,
-                "course_name": b.course.name if b.course else None,
-                "teacher_name": b.teacher.user.full_name if b.teacher else None
-            }
-            for b in student.batches
-        ]
+        # Course and teacher names joined in, instead of walking b.course / b.teacher.user
+        rows = self.db.query(
+            Batch.id, Batch.name, Batch.code, Batch.timing, Batch.days,
+            Course.name.label("course_name"), User.full_name.label("teacher_name")
+        ).join(batch_students, batch_students.c.batch_id == Batch.id)\
+            .outerjoin(Course, Course.id == Batch.course_id)\
+            .outerjoin(Teacher, Teacher.id == Batch.teacher_id)\
+            .outerjoin(User, User.id == Teacher.user_id)\
+            .filter(batch_students.c.student_id == student_id)\
+            .order_by(Batch.id).all()
+        return [row._asdict() for row in rows]
     
     # Teacher Management
-    def get_all_teachers(self, skip: int = 0, limit: int = 100) -> List[dict]:
-        """Get all teachers with their assigned batches"""
-        teachers = self.db.query(Teacher)\
-            .options(joinedload(Teacher.batches), joinedload(Teacher.user))\
-            .offset(skip).limit(limit).all()
-        return [
+    def get_all_teachers(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+                         status: Optional[str] = None, subject: Optional[str] = None,
+                         include_total: bool = False) -> Page:
+        """Get a page of teachers with their assigned batches, in id order after `cursor`"""
+        # selectinload keeps LIMIT on teacher rows; a joined collection would multiply them
+        query = self.db.query(Teacher).options(joinedload(Teacher.user), selectinload(Teacher.batches))
+        if status:
+            query = query.filter(Teacher.status == status)
+        if subject:
+            query = query.filter(Teacher.subject == subject)
+        page = keyset_paginate(query, [Teacher.id], cursor, limit, include_total, offset=0 if cursor else skip)
+        page.items = [
             {
                 "id": t.id,
                 "name": t.user.full_name,
@@ -296,11 +410,12 @@ class AdminService:
                 "status": t.status,
                 "assignedBatches": [batch.name for batch in t.batches] if t.batches else []
             }
-            for t in teachers
+            for t in page.items
         ]
+        return page
     
-    def create_teacher(self, teacher_data: TeacherCreate) -> dict:
-        """Create a new teacher"""
+    def create_teacher(self, teacher_data: TeacherCreate, password_hash: Optional[str] = None) -> dict:
+        """Create a new teacher (password_hash may be pre-computed off the event loop)"""
         # Create user first
         user = User(
             email=teacher_data.email,
@@ -308,7 +423,7 @@ class AdminService:
             full_name=teacher_data.name,
             phone=teacher_data.phone,
             role=UserRole.TEACHER,
-            password_hash=get_password_hash(teacher_data.password),
+            password_hash=password_hash or get_password_hash(teacher_data.password),
             is_active=True
         )
         self.db.add(user)
@@ -357,6 +472,7 @@ class AdminService:
                 user.phone = teacher_data.phone
         
         self.db.commit()
+        invalidate_cached_user(teacher.user.email)
         self.db.refresh(teacher)
         
         return {
@@ -378,14 +494,31 @@ class AdminService:
         
         # Also delete the associated user
         user = teacher.user
+        email = user.email
         self.db.delete(teacher)
         self.db.delete(user)
         self.db.commit()
+        invalidate_cached_user(email)
+    
+    def _cached_reference(self, key: str, model) -> list:
+        """Every row of model in id order, reused while the reference-data version is unchanged"""
+        # Read the version before the rows: a write landing in between only costs a reload
+        version = self.db.scalar(_REFERENCE_VERSION)
+        cached = reference_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        rows = [detached_copy(row) for row in self.db.query(model).order_by(model.id).all()]
+        # Without a version row (schema not migrated) every read reloads
+        if version is not None:
+            reference_cache.set(key, (version, rows))
+        return rows
     
     # Course Management
-    def get_all_courses(self) -> List[Course]:
-        """Get all courses"""
-        return self.db.query(Course).all()
+    def get_all_courses(self, cursor: Optional[str] = None, limit: Optional[int] = None,
+                        include_total: bool = False) -> Page:
+        """Get courses in id order (detached copies, cached per worker), paged from the cache"""
+        courses = self._cached_reference("courses", Course)
+        return paginate_sorted(courses, Course.id, cursor, limit, include_total)
     
     def create_course(self, course_data: CourseCreate) -> Course:
         """Create a new course"""
@@ -418,9 +551,17 @@ class AdminService:
         self.db.commit()
     
     # Batch Management
-    def get_all_batches(self) -> List[Batch]:
-        """Get all batches"""
-        return self.db.query(Batch).all()
+    def get_all_batches(self, cursor: Optional[str] = None, limit: Optional[int] = None,
+                        course_id: Optional[int] = None, teacher_id: Optional[int] = None,
+                        include_total: bool = False) -> Page:
+        """Get batches in id order (detached copies, cached per worker), filtered and paged from the cache"""
+        batches = self._cached_reference("batches", Batch)
+        
+        def matches(batch: Batch) -> bool:
+            return (course_id is None or batch.course_id == course_id) and \
+                (teacher_id is None or batch.teacher_id == teacher_id)
+        
+        return paginate_sorted(batches, Batch.id, cursor, limit, include_total, matches)
     
     def create_batch(self, batch_data: BatchCreate) -> Batch:
         """Create a new batch with validation"""
@@ -516,16 +657,26 @@ class AdminService:
         if not batch:
             raise ValueError(f"Batch with id {batch_id} not found")
         
+        AttendanceRollupService(self.db).remove_batch(batch_id)
         self.db.delete(batch)
         self.db.commit()
     
     # Fee Management
-    def get_all_fees(self, status: Optional[str] = None) -> List[Fee]:
-        """Get all fee records"""
+    def get_all_fees(self, status: Optional[str] = None, cursor: Optional[str] = None,
+                     limit: Optional[int] = None, student_id: Optional[int] = None,
+                     start_date: Optional[date] = None, end_date: Optional[date] = None,
+                     include_total: bool = False) -> Page:
+        """Get fee records ordered by due date, optionally a page at a time after `cursor`"""
         query = self.db.query(Fee)
         if status:
             query = query.filter(Fee.status == status)
-        return query.all()
+        if student_id:
+            query = query.filter(Fee.student_id == student_id)
+        if start_date:
+            query = query.filter(Fee.due_date >= start_date)
+        if end_date:
+            query = query.filter(Fee.due_date <= end_date)
+        return keyset_paginate(query, [Fee.due_date, Fee.id], cursor, limit, include_total)
     
     def create_fee(self, fee_data: FeeCreate) -> Fee:
         """Create a new fee record"""
@@ -560,21 +711,21 @@ class AdminService:
     # Reports
     def get_attendance_report(self, start_date: Optional[str], end_date: Optional[str]) -> dict:
         """Get attendance report"""
-        from datetime import datetime
-        
-        query = self.db.query(Attendance)
+        query = select(
+            func.coalesce(func.sum(BatchDailyAttendance.total), 0),
+            func.coalesce(func.sum(BatchDailyAttendance.present), 0),
+        )
         
         if start_date:
             # Convert MM/DD/YYYY to YYYY-MM-DD
             parsed_date = datetime.strptime(start_date, "%m/%d/%Y").date()
-            query = query.filter(Attendance.date >= parsed_date)
+            query = query.where(BatchDailyAttendance.date >= parsed_date)
         if end_date:
             # Convert MM/DD/YYYY to YYYY-MM-DD
             parsed_date = datetime.strptime(end_date, "%m/%d/%Y").date()
-            query = query.filter(Attendance.date <= parsed_date)
+            query = query.where(BatchDailyAttendance.date <= parsed_date)
         
-        total_records = query.count()
-        present_count = query.filter(Attendance.is_present == True).count()
+        total_records, present_count = (int(value) for value in self.db.execute(query).one())
         
         return {
             "total_records": total_records,
@@ -583,6 +734,101 @@ class AdminService:
             "attendance_percentage": (present_count / total_records * 100) if total_records > 0 else 0
         }
     
+    def get_attendance_analytics(
+        self,
+        bucket: str = "week",
+        group_by: str = "batch",
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        course_id: Optional[int] = None,
+        batch_id: Optional[int] = None,
+        teacher_id: Optional[int] = None,
+    ) -> List[dict]:
+        """Attendance per day, week or month and per batch, course or teacher.
+
+        Aggregates batch_daily_attendance in one GROUP BY. Periods that closed
+        before today's are cached per worker and checked against the shared
+        analytics version; the current period is always read live. The range
+        defaults to the 90 days up to today, widened to whole periods.
+        """
+        if group_by not in ANALYTICS_GROUPS:
+            raise ValueError(f"Unknown analytics grouping: {group_by}")
+        end_date = end_date or date.today()
+        start_date = bucket_start(start_date or end_date - timedelta(days=90), bucket)
+        if start_date > end_date:
+            raise ValueError("start_date must not be after end_date")
+        filters = (course_id, batch_id, teacher_id)
+        
+        rows = []
+        current_period = bucket_start(date.today(), bucket)
+        if start_date < current_period:
+            closed_end = min(end_date, current_period - timedelta(days=1))
+            key = (bucket, group_by, start_date, closed_end, filters)
+            # Read the version before the rows: a write landing in between only costs a recompute
+            version = self.db.scalar(ANALYTICS_VERSION)
+            cached = analytics_cache.get(key)
+            if cached is not None and cached[0] == version:
+                closed = cached[1]
+            else:
+                closed = self._attendance_analytics_rows(bucket, group_by, start_date, closed_end, *filters)
+                # Without a version row (schema not migrated) every read recomputes
+                if version is not None:
+                    analytics_cache.set(key, (version, closed))
+            rows.extend(closed)
+        if end_date >= current_period:
+            rows.extend(self._attendance_analytics_rows(
+                bucket, group_by, max(start_date, current_period), end_date, *filters
+            ))
+        return [dict(row) for row in rows]
+    
+    def _attendance_analytics_rows(
+        self, bucket: str, group_by: str, start_date: date, end_date: date,
+        course_id: Optional[int], batch_id: Optional[int], teacher_id: Optional[int],
+    ) -> List[dict]:
+        period = date_bucket(BatchDailyAttendance.date, bucket, self.db.get_bind().dialect.name).label("period")
+        if group_by == "batch":
+            group_id, group_name = Batch.id, Batch.name
+        elif group_by == "course":
+            group_id, group_name = Course.id, Course.name
+        else:
+            group_id, group_name = Batch.teacher_id, User.full_name
+        total = func.sum(BatchDailyAttendance.total)
+        present = func.sum(BatchDailyAttendance.present)
+        
+        query = (
+            select(period, group_id.label("group_id"), group_name.label("group_name"),
+                   total.label("total"), present.label("present"))
+            .select_from(BatchDailyAttendance)
+            .join(Batch, Batch.id == BatchDailyAttendance.batch_id)
+            .where(BatchDailyAttendance.date.between(start_date, end_date), BatchDailyAttendance.total > 0)
+        )
+        if group_by == "course":
+            query = query.join(Course, Course.id == Batch.course_id)
+        elif group_by == "teacher":
+            query = query.outerjoin(Teacher, Teacher.id == Batch.teacher_id)\
+                .outerjoin(User, User.id == Teacher.user_id)
+        if course_id is not None:
+            query = query.where(Batch.course_id == course_id)
+        if batch_id is not None:
+            query = query.where(Batch.id == batch_id)
+        if teacher_id is not None:
+            query = query.where(Batch.teacher_id == teacher_id)
+        query = query.group_by(period, group_id, group_name).order_by(period, group_id)
+        
+        rows = []
+        for row in self.db.execute(query):
+            total_classes, present_count = int(row.total), int(row.present)
+            rows.append({
+                "period": row.period.isoformat(),
+                "group_id": row.group_id,
+                "group": row.group_name or "Unassigned",
+                "total_classes": total_classes,
+                "present_count": present_count,
+                "absent_count": total_classes - present_count,
+                "attendance_percentage": round(present_count / total_classes * 100, 2),
+            })
+        return rows
+    
     def get_fee_report(self) -> dict:
         """Get fee collection report"""
         total_fees = self.db.query(func.sum(Fee.amount)).scalar() or 0
@@ -601,53 +847,180 @@ class AdminService:
             "overdue_count": overdue_fees
         }
     
-    def get_attendance_summary_report(self) -> List[dict]:
-        """Get detailed attendance report for all students"""
-        students = self.db.query(Student).all()
-        report = []
-        
-        for student in students:
-            # Get all attendance records for this student
-            attendance_records = self.db.query(Attendance).filter(Attendance.student_id == student.id).all()
-            total_classes = len(attendance_records)
-            present_count = sum(1 for a in attendance_records if a.is_present)
-            percentage = (present_count / total_classes * 100) if total_classes > 0 else 0
-            
-            report.append({
-                "student_id": student.id,
-                "student_name": student.user.full_name,
-                "course": student.course,
-                "total_classes": total_classes,
-                "present_count": present_count,
-                "absent_count": total_classes - present_count,
-                "attendance_percentage": round(percentage, 2)
-            })
+    def iter_fee_records(self, status: Optional[str] = None, start_date: Optional[date] = None,
+                         end_date: Optional[date] = None, chunk_size: int = 1000) -> Iterator[dict]:
+        """Fee ledger rows with student names, by due date, fetched chunk_size at a time"""
+        query = self.db.query(
+            Fee.id, Fee.student_id, User.full_name, Student.course, Fee.amount, Fee.paid_amount,
+            Fee.due_date, Fee.payment_date, Fee.status, Fee.payment_method, Fee.transaction_id, Fee.remarks
+        ).join(Student, Student.id == Fee.student_id)\
+            .join(User, User.id == Student.user_id)
+        if status:
+            query = query.filter(Fee.status == status)
+        if start_date:
+            query = query.filter(Fee.due_date >= start_date)
+        if end_date:
+            query = query.filter(Fee.due_date <= end_date)
         
-        return report
+        for row in query.order_by(Fee.due_date, Fee.id).yield_per(chunk_size):
+            yield {
+                "id": row.id,
+                "student_id": row.student_id,
+                "student_name": row.full_name,
+                "course": row.course,
+                "amount": row.amount,
+                "paid_amount": row.paid_amount or 0,
+                "pending_amount": row.amount - (row.paid_amount or 0),
+                "due_date": row.due_date,
+                "payment_date": row.payment_date,
+                "status": row.status,
+                "payment_method": row.payment_method,
+                "transaction_id": row.transaction_id,
+                "remarks": row.remarks
+            }
     
-    def get_test_marks_report(self) -> List[dict]:
-        """Get test marks report for all students"""
-        from app.models.test import TestResult
+    def get_attendance_summary_report(self, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                                      course: Optional[str] = None, batch_id: Optional[int] = None) -> List[dict]:
+        """Attendance totals per student, lowest percentage first (students with no classes last)"""
+        return list(self.iter_attendance_summary_report(start_date, end_date, course, batch_id))
+    
+    def iter_attendance_summary_report(self, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                                       course: Optional[str] = None, batch_id: Optional[int] = None,
+                                       chunk_size: int = 1000) -> Iterator[dict]:
+        """get_attendance_summary_report rows, fetched chunk_size at a time"""
+        if start_date or end_date:
+            # One GROUP BY over the attendances in the range
+            counts = select(
+                Attendance.student_id,
+                func.count(Attendance.id).label("total_classes"),
+                func.sum(case((Attendance.is_present.is_(True), 1), else_=0)).label("present_count"),
+            ).group_by(Attendance.student_id)
+            if start_date:
+                counts = counts.where(Attendance.date >= start_date)
+            if end_date:
+                counts = counts.where(Attendance.date <= end_date)
+            if batch_id:
+                counts = counts.where(Attendance.batch_id == batch_id)
+        else:
+            # All-time totals come from the per-student, per-batch rollup
+            counts = select(
+                StudentBatchAttendance.student_id,
+                func.sum(StudentBatchAttendance.total).label("total_classes"),
+                func.sum(StudentBatchAttendance.present).label("present_count"),
+            ).group_by(StudentBatchAttendance.student_id)
+            if batch_id:
+                counts = counts.where(StudentBatchAttendance.batch_id == batch_id)
+        counts = counts.subquery()
         
-        test_results = self.db.query(TestResult).all()
-        report = []
+        total_classes = func.coalesce(counts.c.total_classes, 0)
+        present_count = func.coalesce(counts.c.present_count, 0)
+        query = self.db.query(
+            Student.id, User.full_name, Student.course, total_classes, present_count
+        ).join(User, User.id == Student.user_id)\
+            .outerjoin(counts, counts.c.student_id == Student.id)
+        if course:
+            query = query.filter(Student.course == course)
+        if batch_id:
+            query = query.join(batch_students, batch_students.c.student_id == Student.id)\
+                .filter(batch_students.c.batch_id == batch_id)
+        rows = query.order_by(
+            case((total_classes == 0, 1), else_=0),
+            present_count * 1.0 / func.nullif(total_classes, 0),
+            Student.id,
+        ).yield_per(chunk_size)
         
-        for result in test_results:
-            test = result.test
-            student = result.student
-            report.append({
-                "id": result.id,
-                "studentName": student.user.full_name if student else "N/A",
-                "class": student.course if student else "N/A",
-                "subject": test.title if test else "N/A",
-                "testName": test.title if test else "Test",
-                "maxMarks": test.total_marks if test else 100,
-                "obtained": result.marks_obtained or 0,
-                "uploadedBy": test.teacher.user.full_name if test and test.teacher else "Admin",
-                "date": result.created_at.strftime("%Y-%m-%d") if result.created_at else "N/A"
-            })
+        for student_id, full_name, student_course, total, present in rows:
+            # SUM comes back as Decimal on MySQL
+            total, present = int(total), int(present)
+            yield {
+                "student_id": student_id,
+                "student_name": full_name,
+                "course": student_course,
+                "total_classes": total,
+                "present_count": present,
+                "absent_count": total - present,
+                "attendance_percentage": round(present / total * 100, 2) if total else 0
+            }
+    
+    def iter_attendance_records(self, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                                course: Optional[str] = None, batch_id: Optional[int] = None,
+                                chunk_size: int = 1000) -> Iterator[dict]:
+        """Every attendance mark with student and batch names, fetched chunk_size at a time"""
+        query = self.db.query(
+            Attendance.id, Attendance.date, Attendance.is_present, Attendance.remarks,
+            Student.id.label("student_id"), User.full_name, Student.course, Batch.code, Batch.name
+        ).join(Student, Student.id == Attendance.student_id)\
+            .join(User, User.id == Student.user_id)\
+            .join(Batch, Batch.id == Attendance.batch_id)
+        if start_date:
+            query = query.filter(Attendance.date >= start_date)
+        if end_date:
+            query = query.filter(Attendance.date <= end_date)
+        if course:
+            query = query.filter(Student.course == course)
+        if batch_id:
+            query = query.filter(Attendance.batch_id == batch_id)
         
-        return report
+        # Primary key order streams without a sort step, so the first rows arrive at once
+        for row in query.order_by(Attendance.id).yield_per(chunk_size):
+            yield {
+                "id": row.id,
+                "date": row.date,
+                "student_id": row.student_id,
+                "student_name": row.full_name,
+                "course": row.course,
+                "batch_code": row.code,
+                "batch_name": row.name,
+                "is_present": row.is_present,
+                "remarks": row.remarks
+            }
+    
+    def get_test_marks_report(self, course_id: Optional[int] = None, teacher_id: Optional[int] = None,
+                              test_id: Optional[int] = None, start_date: Optional[date] = None,
+                              end_date: Optional[date] = None) -> List[dict]:
+        """Get test marks report for all students"""
+        return list(self.iter_test_marks_report(course_id, teacher_id, test_id, start_date, end_date))
+    
+    def iter_test_marks_report(self, course_id: Optional[int] = None, teacher_id: Optional[int] = None,
+                               test_id: Optional[int] = None, start_date: Optional[date] = None,
+                               end_date: Optional[date] = None, chunk_size: int = 1000) -> Iterator[dict]:
+        """Test marks report rows from one joined query, fetched chunk_size rows at a time"""
+        student_user, teacher_user = aliased(User), aliased(User)
+        query = self.db.query(
+            TestResult.id, TestResult.marks_obtained, TestResult.created_at,
+            Test.title, Test.total_marks, Student.id.label("student_id"), Student.course,
+            student_user.full_name.label("student_name"), teacher_user.full_name.label("teacher_name")
+        ).select_from(TestResult)\
+            .outerjoin(Test, Test.id == TestResult.test_id)\
+            .outerjoin(Student, Student.id == TestResult.student_id)\
+            .outerjoin(student_user, student_user.id == Student.user_id)\
+            .outerjoin(Teacher, Teacher.id == Test.teacher_id)\
+            .outerjoin(teacher_user, teacher_user.id == Teacher.user_id)
+        if course_id:
+            query = query.filter(Test.course_id == course_id)
+        if teacher_id:
+            query = query.filter(Test.teacher_id == teacher_id)
+        if test_id:
+            query = query.filter(TestResult.test_id == test_id)
+        if start_date:
+            query = query.filter(TestResult.created_at >= datetime.combine(start_date, time.min))
+        if end_date:
+            query = query.filter(TestResult.created_at < datetime.combine(end_date + timedelta(days=1), time.min))
+        
+        for row in query.order_by(TestResult.id).yield_per(chunk_size):
+            has_test = row.title is not None
+            has_student = row.student_id is not None
+            yield {
+                "id": row.id,
+                "studentName": row.student_name if has_student else "N/A",
+                "class": row.course if has_student else "N/A",
+                "subject": row.title if has_test else "N/A",
+                "testName": row.title if has_test else "Test",
+                "maxMarks": row.total_marks if has_test else 100,
+                "obtained": row.marks_obtained or 0,
+                "uploadedBy": row.teacher_name or "Admin",
+                "date": row.created_at.strftime("%Y-%m-%d") if row.created_at else "N/A"
+            }
     
     def get_assignments_report(self) -> List[dict]:
         """Get assignments/tests report"""
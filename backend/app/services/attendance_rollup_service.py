@@ -0,0 +1,136 @@
+"""
+Attendance rollups: running totals per student and batch, and per batch and day.
+
+Rebuild them from the attendances table (backfill, or after writes that
+bypassed TeacherService.mark_attendance), from the backend directory:
+    python -m app.services.attendance_rollup_service
+"""
+import argparse
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.database import SessionLocal
+from app.models import Attendance, Batch, BatchDailyAttendance, CacheVersion, Student, StudentBatchAttendance
+from app.utils.upsert import upsert_increment
+
+# cache_versions row of the attendance analytics cache: bumped whenever a
+# rollup change can reach a period that has already closed
+ANALYTICS_VERSION_KEY = "attendance_analytics"
+ANALYTICS_VERSION = select(CacheVersion.version).where(CacheVersion.name == ANALYTICS_VERSION_KEY)
+BUMP_ANALYTICS_VERSION = (
+    update(CacheVersion)
+    .where(CacheVersion.name == ANALYTICS_VERSION_KEY)
+    .values(version=CacheVersion.version + 1)
+)
+
+
+def student_totals_query(student_id: int, batch_ids: Optional[List[int]] = None) -> Select:
+    """(total, present) of a student across batch_ids (all batches when None), from the rollup"""
+    query = select(
+        func.coalesce(func.sum(StudentBatchAttendance.total), 0),
+        func.coalesce(func.sum(StudentBatchAttendance.present), 0),
+    ).where(StudentBatchAttendance.student_id == student_id)
+    if batch_ids is not None:
+        query = query.where(StudentBatchAttendance.batch_id.in_(batch_ids))
+    return query
+
+
+class AttendanceRollupService:
+    """Keeps student_batch_attendance and batch_daily_attendance in step with attendances.
+
+    Writers call these inside their own transaction and commit themselves.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply_marks(self, batch_id: int, day: date, previous: Dict[int, bool], current: Dict[int, bool]) -> None:
+        """Add one day's submission: previous holds the marks stored before it, current the marks saved"""
+        student_rows = []
+        day_total = day_present = 0
+        for student_id, is_present in current.items():
+            if student_id in previous:
+                total, present = 0, int(bool(is_present)) - int(bool(previous[student_id]))
+            else:
+                total, present = 1, int(bool(is_present))
+            if total or present:
+                student_rows.append({"student_id": student_id, "batch_id": batch_id,
+                                     "total": total, "present": present})
+                day_total += total
+                day_present += present
+
+        upsert_increment(self.db, StudentBatchAttendance, student_rows,
+                         conflict_columns=("student_id", "batch_id"), increment_columns=("total", "present"))
+        if student_rows:
+            upsert_increment(self.db, BatchDailyAttendance,
+                             [{"batch_id": batch_id, "date": day, "total": day_total, "present": day_present}],
+                             conflict_columns=("batch_id", "date"), increment_columns=("total", "present"))
+            if day < date.today():
+                self.db.execute(BUMP_ANALYTICS_VERSION)
+
+    def remove_student(self, student_id: int, marks: Iterable[Attendance]) -> None:
+        """Take a student's marks out of the rollups before the student is deleted"""
+        totals, presents = Counter(), Counter()
+        for mark in marks:
+            totals[(mark.batch_id, mark.date)] += 1
+            presents[(mark.batch_id, mark.date)] += int(bool(mark.is_present))
+        upsert_increment(
+            self.db, BatchDailyAttendance,
+            [{"batch_id": batch_id, "date": day, "total": -count, "present": -presents[(batch_id, day)]}
+             for (batch_id, day), count in totals.items()],
+            conflict_columns=("batch_id", "date"), increment_columns=("total", "present"),
+        )
+        self.db.execute(delete(StudentBatchAttendance).where(StudentBatchAttendance.student_id == student_id))
+        if totals:
+            self.db.execute(BUMP_ANALYTICS_VERSION)
+
+    def remove_batch(self, batch_id: int) -> None:
+        """Drop a batch's rollup rows before the batch is deleted"""
+        self.db.execute(delete(StudentBatchAttendance).where(StudentBatchAttendance.batch_id == batch_id))
+        self.db.execute(delete(BatchDailyAttendance).where(BatchDailyAttendance.batch_id == batch_id))
+        self.db.execute(BUMP_ANALYTICS_VERSION)
+
+    def rebuild(self) -> dict:
+        """Recompute both rollups from attendances in one transaction; returns the row counts"""
+        # Marks of deleted students or batches are left out, as the live updates leave them out
+        marks = select(Attendance).join(Student, Student.id == Attendance.student_id)\
+            .join(Batch, Batch.id == Attendance.batch_id).subquery()
+        present = func.sum(case((marks.c.is_present.is_(True), 1), else_=0))
+
+        self.db.execute(delete(StudentBatchAttendance))
+        self.db.execute(delete(BatchDailyAttendance))
+        self.db.execute(insert(StudentBatchAttendance).from_select(
+            ["student_id", "batch_id", "total", "present"],
+            select(marks.c.student_id, marks.c.batch_id, func.count(), present)
+            .group_by(marks.c.student_id, marks.c.batch_id),
+        ))
+        self.db.execute(insert(BatchDailyAttendance).from_select(
+            ["batch_id", "date", "total", "present"],
+            select(marks.c.batch_id, marks.c.date, func.count(), present)
+            .group_by(marks.c.batch_id, marks.c.date),
+        ))
+        self.db.execute(BUMP_ANALYTICS_VERSION)
+        self.db.commit()
+        return {
+            "student_batch_attendance": self.db.scalar(select(func.count()).select_from(StudentBatchAttendance)),
+            "batch_daily_attendance": self.db.scalar(select(func.count()).select_from(BatchDailyAttendance)),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        counts = AttendanceRollupService(db).rebuild()
+    finally:
+        db.close()
+    print(", ".join(f"{table}: {rows} rows" for table, rows in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
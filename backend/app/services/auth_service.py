@@ -1,8 +1,18 @@
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from app.models import User, UserRole
+from typing import Optional
+from app.models import User, UserRole, RefreshToken
 from app.schemas.auth import UserCreate, Token
-from app.utils.auth import get_password_hash, verify_password, create_access_token
+from app.config import settings
+from app.utils.auth import (
+    get_password_hash,
+    verify_and_update_password,
+    verify_and_update_password_async,
+    create_access_token,
+    build_token_claims,
+    generate_refresh_token,
+    hash_refresh_token,
+)
 from app.utils.validators import validate_email, validate_password
 
 
@@ -10,8 +20,8 @@ class AuthService:
     def __init__(self, db: Session):
         self.db = db
     
-    def register_user(self, user_data: UserCreate) -> User:
-        """Register a new user"""
+    def register_user(self, user_data: UserCreate, password_hash: Optional[str] = None) -> User:
+        """Register a new user (password_hash may be pre-computed off the event loop)"""
         normalized_email = user_data.email.strip().lower()
         # Validate email
         if not validate_email(normalized_email):
@@ -38,7 +48,7 @@ class AuthService:
             full_name=user_data.full_name,
             phone=user_data.phone,
             role=user_data.role,
-            password_hash=get_password_hash(user_data.password),
+            password_hash=password_hash or get_password_hash(user_data.password),
             is_active=True
         )
         
@@ -50,34 +60,127 @@ class AuthService:
     
     def login(self, email: str, password: str) -> Token:
         """Authenticate user and return token"""
-        normalized_email = email.strip().lower()
-        user = self.db.query(User).filter(User.email == normalized_email).first()
+        user = self._get_user_by_email(email)
+        if not user:
+            return None
         
-        if not user or not verify_password(password, user.password_hash):
+        is_valid, new_hash = verify_and_update_password(password, user.password_hash)
+        if not is_valid:
             return None
         
+        return self._complete_login(user, new_hash)
+    
+    async def login_async(self, email: str, password: str) -> Token:
+        """Authenticate user with password verification off the event loop"""
+        user = self._get_user_by_email(email)
+        if not user:
+            return None
+
+        # Hand the connection back to the pool while PBKDF2 runs, otherwise
+        # every in-flight login pins one and the pool runs dry under load
+        self.db.expunge(user)
+        self.db.rollback()
+
+        is_valid, new_hash = await verify_and_update_password_async(password, user.password_hash)
+        if not is_valid:
+            return None
+
+        return self._complete_login(self.db.merge(user, load=False), new_hash)
+    
+    def _get_user_by_email(self, email: str) -> Optional[User]:
+        normalized_email = email.strip().lower()
+        return self.db.query(User).filter(User.email == normalized_email).first()
+    
+    def _complete_login(self, user: User, new_hash: Optional[str] = None) -> Token:
+        """Record the login, rehash if PBKDF2 rounds changed, and issue a token"""
         if not user.is_active:
             raise ValueError("User account is inactive")
         
-        # Update last login
+        # Create access token carrying user, role and profile IDs
+        access_token = create_access_token(data=build_token_claims(user, self.db))
+        refresh_token = self._issue_refresh_token(user.id)
+        user_data = self._user_data(user)
+        
+        # Update last login and upgrade the stored hash transparently. Committing
+        # last means the connection goes back to the pool before the response.
         user.last_login = datetime.utcnow()
+        if new_hash:
+            user.password_hash = new_hash
         self.db.commit()
         
-        # Create access token
-        access_token = create_access_token(
-            data={"sub": user.email, "role": user.role.value}
-        )
-        
-        # Prepare user data
-        user_data = {
+        return Token(access_token=access_token, token_type="bearer", refresh_token=refresh_token, user=user_data)
+    
+    def _user_data(self, user: User) -> dict:
+        return {
             "id": user.id,
             "email": user.email,
             "full_name": user.full_name,
             "role": user.role.value,
             "is_active": user.is_active
         }
+    
+    def _issue_refresh_token(self, user_id: int) -> str:
+        """Add a refresh token row to the session and return the raw token"""
+        token, token_hash = generate_refresh_token()
+        self.db.add(RefreshToken(
+            token_hash=token_hash,
+            user_id=user_id,
+            expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+        ))
+        return token
+    
+    def refresh(self, refresh_token: str) -> Optional[Token]:
+        """Exchange a refresh token for a new access token, rotating the refresh token"""
+        # One indexed lookup on token_hash, joined to the owning user
+        row = (
+            self.db.query(RefreshToken.id, RefreshToken.expires_at, User)
+            .join(User, User.id == RefreshToken.user_id)
+            .filter(RefreshToken.token_hash == hash_refresh_token(refresh_token))
+            .first()
+        )
+        if not row or row.expires_at <= datetime.utcnow():
+            return None
+        user = row.User
+        
+        # Single-use: the delete only matches for the first concurrent caller
+        consumed = (
+            self.db.query(RefreshToken)
+            .filter(RefreshToken.id == row.id)
+            .delete(synchronize_session=False)
+        )
+        if not consumed or not user.is_active:
+            self.db.commit()
+            return None
         
-        return Token(access_token=access_token, token_type="bearer", user=user_data)
+        access_token = create_access_token(data=build_token_claims(user, self.db))
+        new_refresh_token = self._issue_refresh_token(user.id)
+        user_data = self._user_data(user)
+        self.db.commit()
+        
+        return Token(access_token=access_token, token_type="bearer", refresh_token=new_refresh_token, user=user_data)
+    
+    def revoke_refresh_token(self, refresh_token: str) -> None:
+        """Revoke a single refresh token (logout)"""
+        self.db.query(RefreshToken).filter(
+            RefreshToken.token_hash == hash_refresh_token(refresh_token)
+        ).delete(synchronize_session=False)
+        self.db.commit()
+    
+    def revoke_user_refresh_tokens(self, user_id: int) -> int:
+        """Revoke every refresh token of a user (password reset, deactivation)"""
+        deleted = self.db.query(RefreshToken).filter(
+            RefreshToken.user_id == user_id
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return deleted
+    
+    def purge_expired_refresh_tokens(self) -> int:
+        """Delete all expired refresh tokens in one statement"""
+        deleted = self.db.query(RefreshToken).filter(
+            RefreshToken.expires_at <= datetime.utcnow()
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return deleted
     
     def create_access_token(self, data: dict) -> str:
         """Create a new access token"""
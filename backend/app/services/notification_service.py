@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta
 import json
-from typing import List, Optional
+from typing import List, Optional, Union
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 from app.models import Notification
 from app.schemas.notification import (
@@ -11,7 +13,7 @@ from app.schemas.notification import (
 
 
 class NotificationService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Union[Session, AsyncSession]):
         self.db = db
 
     def _serialize(self, notification: Notification) -> NotificationResponse:
@@ -50,18 +52,33 @@ class NotificationService:
             query = query.filter(Notification.is_active == True)  # noqa: E712
 
         notifications = query.all()
-        responses = [self._serialize(notification) for notification in notifications]
+        return self._filter_for_role([self._serialize(notification) for notification in notifications], role_filter)
 
-        if role_filter:
-            filtered = []
-            for notification in responses:
-                if not notification.recipient_roles:
-                    filtered.append(notification)
-                elif role_filter in notification.recipient_roles:
-                    filtered.append(notification)
-            return filtered
+    async def get_recent_notifications_async(self, include_inactive: bool = False, role_filter: Optional[str] = None) -> List[NotificationResponse]:
+        cutoff = datetime.utcnow() - timedelta(days=365)
+        query = (
+            select(Notification)
+            .options(joinedload(Notification.creator))
+            .filter(Notification.created_at >= cutoff)
+            .order_by(Notification.created_at.desc())
+        )
+        if not include_inactive:
+            query = query.filter(Notification.is_active == True)  # noqa: E712
+
+        notifications = (await self.db.execute(query)).scalars().all()
+        return self._filter_for_role([self._serialize(notification) for notification in notifications], role_filter)
+
+    def _filter_for_role(self, responses: List[NotificationResponse], role_filter: Optional[str]) -> List[NotificationResponse]:
+        if not role_filter:
+            return responses
 
-        return responses
+        filtered = []
+        for notification in responses:
+            if not notification.recipient_roles:
+                filtered.append(notification)
+            elif role_filter in notification.recipient_roles:
+                filtered.append(notification)
+        return filtered
 
     def get_notification(self, notification_id: int) -> Optional[Notification]:
         return (
@@ -1,7 +1,6 @@
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import List
-import razorpay
 from app.models import Fee, PaymentStatus, PaymentMethod
 from app.schemas.payment import PaymentCreate, PaymentVerify
 from app.config import settings
@@ -11,6 +10,8 @@ class PaymentService:
     def __init__(self, db: Session):
         self.db = db
         if settings.RAZORPAY_KEY_ID and settings.RAZORPAY_KEY_SECRET:
+            # Imported here so the SDK (~0.2s) is not loaded by every worker at boot
+            import razorpay
             self.razorpay_client = razorpay.Client(
                 auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
             )
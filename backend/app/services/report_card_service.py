@@ -0,0 +1,84 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import case, func, select
+from datetime import datetime, date, time, timedelta
+from typing import Dict, Optional
+from app.models import Attendance, Fee, Student, Test, TestResult, User
+
+
+class ReportCardService:
+    """Builds the inputs of term report cards; rendering lives in app.utils.report_cards"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_course_cards(self, course: str, start_date: date, end_date: date) -> Dict[int, dict]:
+        """Report card inputs for every student of a course, keyed by student id"""
+        return self._load_cards(Student.course == course, start_date, end_date)
+
+    def get_student_card(self, student_id: int, start_date: date, end_date: date) -> Optional[dict]:
+        """Report card inputs for one student, or None if the student does not exist"""
+        return self._load_cards(Student.id == student_id, start_date, end_date).get(student_id)
+
+    def _load_cards(self, student_filter, start_date: date, end_date: date) -> Dict[int, dict]:
+        # Four statements however many students match: the students, then one
+        # query each for test results, attendance counts and fee totals
+        cards = {
+            student_id: {
+                "student_id": student_id,
+                "student_name": full_name,
+                "course": course,
+                "batch": batch,
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "results": [],
+                "attendance": {"total": 0, "present": 0},
+                "fees": {"due": 0, "paid": 0},
+            }
+            for student_id, full_name, course, batch in self.db.query(
+                Student.id, User.full_name, Student.course, Student.batch
+            ).join(User, User.id == Student.user_id).filter(student_filter).order_by(Student.id)
+        }
+        if not cards:
+            return cards
+        student_ids = select(Student.id).where(student_filter)
+
+        taken_at = func.coalesce(Test.test_date, TestResult.created_at)
+        results = self.db.query(
+            TestResult.student_id, Test.title, Test.total_marks, TestResult.marks_obtained, taken_at
+        ).join(Test, Test.id == TestResult.test_id).filter(
+            TestResult.student_id.in_(student_ids),
+            taken_at >= datetime.combine(start_date, time.min),
+            taken_at < datetime.combine(end_date + timedelta(days=1), time.min),
+        ).order_by(TestResult.student_id, taken_at, TestResult.id)
+        for student_id, title, total_marks, marks, when in results:
+            cards[student_id]["results"].append({
+                "test": title,
+                "max": total_marks,
+                "obtained": marks or 0,
+                "date": when.strftime("%Y-%m-%d") if when else None,
+            })
+
+        attendance = self.db.query(
+            Attendance.student_id,
+            func.count(Attendance.id),
+            func.sum(case((Attendance.is_present.is_(True), 1), else_=0)),
+        ).filter(
+            Attendance.student_id.in_(student_ids),
+            Attendance.date >= start_date,
+            Attendance.date <= end_date,
+        ).group_by(Attendance.student_id)
+        for student_id, total, present in attendance:
+            # SUM comes back as Decimal on MySQL
+            cards[student_id]["attendance"] = {"total": int(total), "present": int(present)}
+
+        fees = self.db.query(
+            Fee.student_id, func.sum(Fee.amount), func.sum(func.coalesce(Fee.paid_amount, 0))
+        ).filter(
+            Fee.student_id.in_(student_ids),
+            Fee.due_date >= start_date,
+            Fee.due_date <= end_date,
+        ).group_by(Fee.student_id)
+        for student_id, due, paid in fees:
+            cards[student_id]["fees"] = {"due": int(due or 0), "paid": int(paid or 0)}
+
+        return cards
@@ -1,18 +1,19 @@
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 from typing import List, Optional
-from sqlalchemy import func
+from sqlalchemy import bindparam, exists, func, select
 from sqlalchemy.orm import Session
 from app.models import User, UserRole
 from app.models.signup_request import SignupRequest, SignupRequestStatus
 from app.schemas.signup import SignupSubmissionRequest, SignupDecisionPayload
-from app.utils.auth import get_password_hash
+from app.utils.auth import get_password_hash, invalidate_cached_user
+from app.utils.pagination import Page, keyset_paginate
 
 
 class SignupService:
     def __init__(self, db: Session):
         self.db = db
 
-    def create_request(self, payload: SignupSubmissionRequest) -> SignupRequest:
+    def create_request(self, payload: SignupSubmissionRequest, password_hash: Optional[str] = None) -> SignupRequest:
         normalized_email = payload.email.strip().lower()
         normalized_username = payload.username.strip()
 
@@ -26,7 +27,7 @@ class SignupService:
             academic_focus=payload.academic_focus.strip(),
             motivations=payload.motivations.strip() if payload.motivations else None,
             username=normalized_username,
-            password_hash=get_password_hash(payload.password),
+            password_hash=password_hash or get_password_hash(payload.password),
             status=SignupRequestStatus.PENDING,
         )
         self.db.add(request)
@@ -34,11 +35,18 @@ class SignupService:
         self.db.refresh(request)
         return request
 
-    def list_requests(self, status: Optional[SignupRequestStatus] = None) -> List[SignupRequest]:
-        query = self.db.query(SignupRequest).order_by(SignupRequest.created_at.desc())
+    def list_requests(self, status: Optional[SignupRequestStatus] = None, cursor: Optional[str] = None,
+                      limit: Optional[int] = None, start_date: Optional[date] = None,
+                      end_date: Optional[date] = None, include_total: bool = False) -> Page:
+        # Newest first; id breaks ties between requests made in the same second
+        query = self.db.query(SignupRequest)
         if status:
             query = query.filter(SignupRequest.status == status)
-        return query.all()
+        if start_date:
+            query = query.filter(SignupRequest.created_at >= datetime.combine(start_date, time.min))
+        if end_date:
+            query = query.filter(SignupRequest.created_at < datetime.combine(end_date + timedelta(days=1), time.min))
+        return keyset_paginate(query, [SignupRequest.created_at, SignupRequest.id], cursor, limit, include_total, descending=True)
 
     def get_request(self, request_id: int) -> Optional[SignupRequest]:
         return self.db.query(SignupRequest).filter(SignupRequest.id == request_id).first()
@@ -68,6 +76,7 @@ class SignupService:
             signup_request.admin_note = payload.note
 
         self.db.commit()
+        invalidate_cached_user(user.email)
         self.db.refresh(signup_request)
         return signup_request
 
@@ -85,22 +94,29 @@ class SignupService:
         return signup_request
 
     def _ensure_unique_user(self, email: str, username: str, check_pending: bool = True) -> None:
-        email_exists = self.db.query(User).filter(func.lower(User.email) == email.lower()).first()
+        """Email, username and pending-request checks in one round trip, each served by a lower(...) index"""
+        statement = _IDENTITY_OR_PENDING_TAKEN if check_pending else _IDENTITY_TAKEN
+        email_exists, username_exists, *pending = self.db.execute(
+            statement, {"email": email.lower(), "username": username.lower()}
+        ).one()
+
         if email_exists:
             raise ValueError("Email already registered")
-
-        username_exists = self.db.query(User).filter(func.lower(User.username) == username.lower()).first()
         if username_exists:
             raise ValueError("Username already taken")
-
-        if check_pending:
-            pending_request = (
-                self.db.query(SignupRequest)
-                .filter(
-                    func.lower(SignupRequest.email) == email.lower(),
-                    SignupRequest.status == SignupRequestStatus.PENDING,
-                )
-                .first()
-            )
-            if pending_request:
-                raise ValueError("Signup request already pending for this email")
+        if pending and pending[0]:
+            raise ValueError("Signup request already pending for this email")
+
+
+# Built once: reusing the statement objects keeps SQLAlchemy from regenerating
+# their cache keys, which costs far more than the indexed lookups themselves
+_IDENTITY_TAKEN = select(
+    exists().where(func.lower(User.email) == bindparam("email")),
+    exists().where(func.lower(User.username) == bindparam("username")),
+)
+_IDENTITY_OR_PENDING_TAKEN = _IDENTITY_TAKEN.add_columns(
+    exists().where(
+        func.lower(SignupRequest.email) == bindparam("email"),
+        SignupRequest.status == SignupRequestStatus.PENDING,
+    )
+)
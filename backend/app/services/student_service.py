@@ -1,8 +1,11 @@
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional, Union
 from datetime import datetime
-from app.models import Student, Attendance, Fee, Test, TestResult, StudyMaterial, Course
+from app.models import Student, Fee, Test, TestResult, StudyMaterial, Course, Batch, batch_students, StudentBatchAttendance
 from app.schemas.student import TestSubmission
+from app.services.attendance_rollup_service import student_totals_query
 
 
 class StudentService:
@@ -16,23 +19,43 @@ class StudentService:
     - No access to other students' information (attendance, fees, tests, etc.)
     - Authorization enforced at route level with require_role(UserRole.STUDENT)
     - Data access enforced at service level by querying with user_id
+    - student_id may be passed alongside user_id when it comes from the signed
+      JWT claims, which skips the user_id -> student_id lookup
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Union[Session, AsyncSession]):
         self.db = db
     
-    def get_dashboard(self, user_id: int) -> dict:
+    def _resolve_student_id(self, user_id: int, student_id: Optional[int] = None) -> int:
+        """Return the student profile ID, using the JWT claim when available"""
+        if student_id is not None:
+            return student_id
+        
+        row = self.db.query(Student.id).filter(Student.user_id == user_id).first()
+        if not row:
+            raise ValueError("Student profile not found")
+        return row.id
+    
+    def _get_enrolled_course_ids(self, student_id: int) -> List[int]:
+        """Get course IDs of the batches a student is enrolled in"""
+        rows = self.db.query(Batch.course_id).join(
+            batch_students, batch_students.c.batch_id == Batch.id
+        ).filter(batch_students.c.student_id == student_id).all()
+        return [row.course_id for row in rows if row.course_id]
+    
+    def get_dashboard(self, user_id: int, student_id: Optional[int] = None) -> dict:
         """Get student dashboard data - ONLY for authenticated student's own data"""
-        student = self.db.query(Student).filter(Student.user_id == user_id).first()
+        query = self.db.query(Student).options(joinedload(Student.user))
+        if student_id is not None:
+            query = query.filter(Student.id == student_id, Student.user_id == user_id)
+        else:
+            query = query.filter(Student.user_id == user_id)
+        student = query.first()
         if not student:
             raise ValueError("Student profile not found")
         
         # Get statistics - all filtered by student.id (derived from user_id)
-        total_attendance = self.db.query(Attendance).filter(Attendance.student_id == student.id).count()
-        present_count = self.db.query(Attendance).filter(
-            Attendance.student_id == student.id,
-            Attendance.is_present == True
-        ).count()
+        total_attendance, present_count = self.db.execute(student_totals_query(student.id)).one()
         
         attendance_percentage = (present_count / total_attendance * 100) if total_attendance > 0 else 0
         
@@ -56,27 +79,60 @@ class StudentService:
             "total_tests": total_tests
         }
     
-    def get_student_attendance(self, user_id: int) -> dict:
-        """Get student's attendance records - ONLY for authenticated student"""
-        student = self.db.query(Student).filter(Student.user_id == user_id).first()
+    async def get_dashboard_async(self, user_id: int, student_id: Optional[int] = None) -> dict:
+        """Async variant of get_dashboard for use with an AsyncSession"""
+        query = select(Student).options(joinedload(Student.user))
+        if student_id is not None:
+            query = query.filter(Student.id == student_id, Student.user_id == user_id)
+        else:
+            query = query.filter(Student.user_id == user_id)
+        student = (await self.db.execute(query)).scalars().first()
         if not student:
             raise ValueError("Student profile not found")
         
-        # Get all attendance records
-        attendance_records = self.db.query(Attendance).filter(Attendance.student_id == student.id).all()
+        total_attendance, present_count = (await self.db.execute(student_totals_query(student.id))).one()
+        
+        attendance_percentage = (present_count / total_attendance * 100) if total_attendance > 0 else 0
+        
+        pending_fees = await self.db.scalar(
+            select(func.count(Fee.id)).filter(
+                Fee.student_id == student.id,
+                Fee.status != "paid"
+            )
+        )
+        
+        total_tests = await self.db.scalar(
+            select(func.count(TestResult.id)).filter(TestResult.student_id == student.id)
+        )
+        
+        return {
+            "student_id": student.id,
+            "name": student.user.full_name,
+            "email": student.user.email,
+            "course": student.course,
+            "batch": student.batch,
+            "attendance_percentage": round(attendance_percentage, 2),
+            "pending_fees": pending_fees,
+            "total_tests": total_tests
+        }
+    
+    def get_student_attendance(self, user_id: int, student_id: Optional[int] = None) -> dict:
+        """Get student's attendance records - ONLY for authenticated student"""
+        student_id = self._resolve_student_id(user_id, student_id)
+        
+        # Per-batch totals from the rollup, grouped by batch name
+        rows = self.db.query(
+            Batch.name, StudentBatchAttendance.total, StudentBatchAttendance.present
+        ).select_from(StudentBatchAttendance)\
+            .outerjoin(Batch, Batch.id == StudentBatchAttendance.batch_id)\
+            .filter(StudentBatchAttendance.student_id == student_id, StudentBatchAttendance.total > 0)\
+            .order_by(StudentBatchAttendance.batch_id)
         
-        # Group by batch/subject
         batch_attendance = {}
-        for record in attendance_records:
-            batch_name = record.batch.name if record.batch else "Unknown"
-            if batch_name not in batch_attendance:
-                batch_attendance[batch_name] = {
-                    "total": 0,
-                    "present": 0
-                }
-            batch_attendance[batch_name]["total"] += 1
-            if record.is_present:
-                batch_attendance[batch_name]["present"] += 1
+        for name, total, present in rows:
+            stats = batch_attendance.setdefault(name or "Unknown", {"total": 0, "present": 0})
+            stats["total"] += total
+            stats["present"] += present
         
         # Format response
         attendance_summary = []
@@ -106,13 +162,11 @@ class StudentService:
             }
         }
     
-    def get_student_fees(self, user_id: int) -> dict:
+    def get_student_fees(self, user_id: int, student_id: Optional[int] = None) -> dict:
         """Get student's fee records with summary"""
-        student = self.db.query(Student).filter(Student.user_id == user_id).first()
-        if not student:
-            raise ValueError("Student profile not found")
+        student_id = self._resolve_student_id(user_id, student_id)
         
-        fees = self.db.query(Fee).filter(Fee.student_id == student.id).order_by(Fee.due_date.desc()).all()
+        fees = self.db.query(Fee).filter(Fee.student_id == student_id).order_by(Fee.due_date.desc()).all()
         
         # Calculate totals
         total_fees = sum(f.amount for f in fees)
@@ -146,22 +200,19 @@ class StudentService:
             }
         }
     
-    def get_student_tests(self, user_id: int) -> dict:
+    def get_student_tests(self, user_id: int, student_id: Optional[int] = None) -> dict:
         """Get student's test results grouped by subject"""
-        student = self.db.query(Student).filter(Student.user_id == user_id).first()
-        if not student:
-            raise ValueError("Student profile not found")
+        student_id = self._resolve_student_id(user_id, student_id)
         
-        # Get student's batches and course IDs
-        student_batches = student.batches if hasattr(student, 'batches') else []
-        course_ids = [b.course_id for b in student_batches if b.course_id]
+        # Get course IDs of student's batches
+        course_ids = self._get_enrolled_course_ids(student_id)
         
         if not course_ids:
             return {"subjects": []}
         
         # Get all test results for this student with enrolled courses
         results = self.db.query(TestResult).join(Test).filter(
-            TestResult.student_id == student.id,
+            TestResult.student_id == student_id,
             Test.course_id.in_(course_ids)
         ).all()
         
@@ -222,17 +273,12 @@ class StudentService:
         
         return {"subjects": subjects}
     
-    def get_study_materials(self, user_id: int) -> dict:
+    def get_study_materials(self, user_id: int, student_id: Optional[int] = None) -> dict:
         """Get available study materials grouped by subject"""
-        student = self.db.query(Student).filter(Student.user_id == user_id).first()
-        if not student:
-            raise ValueError("Student profile not found")
-        
-        # Get student's batches
-        student_batches = student.batches if hasattr(student, 'batches') else []
+        student_id = self._resolve_student_id(user_id, student_id)
         
         # Get course IDs from student's enrolled batches
-        course_ids = [b.course_id for b in student_batches if b.course_id]
+        course_ids = self._get_enrolled_course_ids(student_id)
         
         # Only get materials from enrolled courses
         if not course_ids:
@@ -282,11 +328,9 @@ class StudentService:
         
         return {"subjects": subjects}
     
-    def submit_test(self, user_id: int, test_id: int, submission: TestSubmission) -> TestResult:
+    def submit_test(self, user_id: int, test_id: int, submission: TestSubmission, student_id: Optional[int] = None) -> TestResult:
         """Submit a test"""
-        student = self.db.query(Student).filter(Student.user_id == user_id).first()
-        if not student:
-            raise ValueError("Student profile not found")
+        student_id = self._resolve_student_id(user_id, student_id)
         
         test = self.db.query(Test).filter(Test.id == test_id).first()
         if not test:
@@ -295,7 +339,7 @@ class StudentService:
         # Check if already submitted
         existing_result = self.db.query(TestResult).filter(
             TestResult.test_id == test_id,
-            TestResult.student_id == student.id
+            TestResult.student_id == student_id
         ).first()
         
         if existing_result:
@@ -307,7 +351,7 @@ class StudentService:
         # Create test result
         result = TestResult(
             test_id=test_id,
-            student_id=student.id,
+            student_id=student_id,
             marks_obtained=submission.marks_obtained,
             percentage=int(percentage),
             remarks=submission.remarks,
@@ -320,23 +364,20 @@ class StudentService:
         
         return result
     
-    def get_student_batches(self, user_id: int) -> List:
+    def get_student_batches(self, user_id: int, student_id: Optional[int] = None) -> List:
         """Get student's enrolled batches"""
-        student = self.db.query(Student).filter(Student.user_id == user_id).first()
-        if not student:
-            raise ValueError("Student profile not found")
+        student_id = self._resolve_student_id(user_id, student_id)
         
-        return student.batches
+        return self.db.query(Batch).join(
+            batch_students, batch_students.c.batch_id == Batch.id
+        ).filter(batch_students.c.student_id == student_id).all()
     
-    def get_available_tests(self, user_id: int) -> dict:
+    def get_available_tests(self, user_id: int, student_id: Optional[int] = None) -> dict:
         """Get available tests/assignments for student"""
-        student = self.db.query(Student).filter(Student.user_id == user_id).first()
-        if not student:
-            raise ValueError("Student profile not found")
+        student_id = self._resolve_student_id(user_id, student_id)
         
-        # Get student's batches and course IDs
-        student_batches = student.batches if hasattr(student, 'batches') else []
-        course_ids = [b.course_id for b in student_batches if b.course_id]
+        # Get course IDs of student's batches
+        course_ids = self._get_enrolled_course_ids(student_id)
         
         if not course_ids:
             return {"tests": []}
@@ -352,7 +393,7 @@ class StudentService:
             # Check if student has submitted/completed
             test_result = self.db.query(TestResult).filter(
                 TestResult.test_id == test.id,
-                TestResult.student_id == student.id
+                TestResult.student_id == student_id
             ).first()
             
             # Get course info
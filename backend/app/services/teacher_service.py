@@ -1,8 +1,12 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
 from datetime import datetime, date
-from typing import List
-from app.models import Teacher, Batch, Attendance, StudyMaterial, Test, TestResult, Student
+from typing import List, Optional, Union
+from app.models import Teacher, Batch, batch_students, Attendance, StudyMaterial, Test, TestResult, Student
 from app.schemas.teacher import *
+from app.services.attendance_rollup_service import AttendanceRollupService, student_totals_query
+from app.utils.upsert import upsert
 
 
 class TeacherService:
@@ -16,14 +20,31 @@ class TeacherService:
     - No fee-related functionality exposed to teachers
     - Test results filtered: teachers only see marks from their own tests
     - Modification of test marks: only allowed for teacher's own tests
+    - teacher_id may be passed alongside user_id when it comes from the signed
+      JWT claims, which skips the user_id -> teacher_id lookup
     """
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Union[Session, AsyncSession]):
         self.db = db
     
-    def get_dashboard(self, user_id: int) -> dict:
+    def _resolve_teacher_id(self, user_id: int, teacher_id: Optional[int] = None) -> int:
+        """Return the teacher profile ID, using the JWT claim when available"""
+        if teacher_id is not None:
+            return teacher_id
+        
+        row = self.db.query(Teacher.id).filter(Teacher.user_id == user_id).first()
+        if not row:
+            raise ValueError("Teacher profile not found")
+        return row.id
+    
+    def get_dashboard(self, user_id: int, teacher_id: Optional[int] = None) -> dict:
         """Get teacher dashboard data"""
-        teacher = self.db.query(Teacher).filter(Teacher.user_id == user_id).first()
+        query = self.db.query(Teacher).options(joinedload(Teacher.user))
+        if teacher_id is not None:
+            query = query.filter(Teacher.id == teacher_id, Teacher.user_id == user_id)
+        else:
+            query = query.filter(Teacher.user_id == user_id)
+        teacher = query.first()
         if not teacher:
             raise ValueError("Teacher profile not found")
         
@@ -45,67 +66,124 @@ class TeacherService:
             "total_tests": total_tests
         }
     
-    def get_teacher_batches(self, user_id: int) -> List[dict]:
+    def get_teacher_batches(self, user_id: int, teacher_id: Optional[int] = None) -> List[dict]:
         """Get teacher's assigned batches with students"""
-        teacher = self.db.query(Teacher).filter(Teacher.user_id == user_id).first()
-        if not teacher:
-            raise ValueError("Teacher profile not found")
+        teacher_id = self._resolve_teacher_id(user_id, teacher_id)
         
-        batches = self.db.query(Batch).filter(Batch.teacher_id == teacher.id).all()
+        batches = self.db.query(Batch).filter(Batch.teacher_id == teacher_id).all()
         
-        result = []
-        for batch in batches:
-            result.append({
-                "id": batch.id,
-                "name": batch.name,
-                "code": batch.code,
-                "timing": batch.timing,
-                "days": batch.days,
-                "course_id": batch.course_id,
-                "students": [
-                    {
-                        "id": student.id,
-                        "name": student.user.full_name if student.user else "Unknown",
-                        "user": {
-                            "id": student.user.id,
-                            "full_name": student.user.full_name,
-                            "email": student.user.email
-                        } if student.user else None
-                    }
-                    for student in batch.students
-                ]
-            })
-        
-        return result
+        return [self._serialize_batch(batch) for batch in batches]
     
-    def mark_attendance(self, user_id: int, attendance_data: AttendanceCreate) -> List[Attendance]:
-        """Mark attendance for students"""
-        teacher = self.db.query(Teacher).filter(Teacher.user_id == user_id).first()
-        if not teacher:
-            raise ValueError("Teacher profile not found")
+    async def get_teacher_batches_async(self, user_id: int, teacher_id: Optional[int] = None) -> List[dict]:
+        """Async variant of get_teacher_batches for use with an AsyncSession"""
+        if teacher_id is None:
+            teacher_id = await self.db.scalar(select(Teacher.id).filter(Teacher.user_id == user_id))
+            if teacher_id is None:
+                raise ValueError("Teacher profile not found")
+        
+        # Lazy loading is not available on AsyncSession, so load students eagerly
+        batches = (await self.db.execute(
+            select(Batch)
+            .options(selectinload(Batch.students).selectinload(Student.user))
+            .filter(Batch.teacher_id == teacher_id)
+        )).scalars().all()
+        
+        return [self._serialize_batch(batch) for batch in batches]
+    
+    def _serialize_batch(self, batch: Batch) -> dict:
+        return {
+            "id": batch.id,
+            "name": batch.name,
+            "code": batch.code,
+            "timing": batch.timing,
+            "days": batch.days,
+            "course_id": batch.course_id,
+            "students": [
+                {
+                    "id": student.id,
+                    "name": student.user.full_name if student.user else "Unknown",
+                    "user": {
+                        "id": student.user.id,
+                        "full_name": student.user.full_name,
+                        "email": student.user.email
+                    } if student.user else None
+                }
+                for student in batch.students
+            ]
+        }
+    
+    def mark_attendance(self, user_id: int, attendance_data: AttendanceCreate, teacher_id: Optional[int] = None) -> List[Attendance]:
+        """Mark attendance for students (re-submitting a day updates it instead of duplicating)"""
+        teacher_id = self._resolve_teacher_id(user_id, teacher_id)
+        
+        # A repeated student in one submission keeps its last record
+        records = {record.student_id: record for record in attendance_data.records}
+        
+        # Submissions for one batch run one at a time: the batch row lock is held
+        # until commit, so the previous marks read below stay what the upsert
+        # replaces and two first submissions of a day cannot both count as new
+        if self.db.get_bind().dialect.name == "sqlite":
+            # No FOR UPDATE on SQLite; a no-op write takes the database write lock instead
+            self.db.execute(
+                update(Batch.__table__)
+                .where(Batch.__table__.c.id == attendance_data.batch_id)
+                .values(teacher_id=Batch.__table__.c.teacher_id)
+            )
         
-        batch = self.db.query(Batch).filter(Batch.id == attendance_data.batch_id).first()
-        if not batch or batch.teacher_id != teacher.id:
+        # Batch ownership and membership of every submitted student in one query
+        membership = self.db.execute(
+            select(Batch.teacher_id, batch_students.c.student_id)
+            .outerjoin(batch_students, and_(
+                batch_students.c.batch_id == Batch.id,
+                batch_students.c.student_id.in_(list(records)),
+            ))
+            .filter(Batch.id == attendance_data.batch_id)
+            .with_for_update(of=Batch)
+        ).all()
+        if not membership or membership[0].teacher_id != teacher_id:
             raise ValueError("Unauthorized to mark attendance for this batch")
         
-        attendance_records = []
-        for record in attendance_data.records:
-            attendance = Attendance(
-                student_id=record.student_id,
-                batch_id=attendance_data.batch_id,
-                date=attendance_data.date,
-                is_present=record.is_present,
-                remarks=record.remarks,
-                marked_by=teacher.user_id
-            )
-            self.db.add(attendance)
-            attendance_records.append(attendance)
-        
-        self.db.commit()
+        members = {row.student_id for row in membership if row.student_id is not None}
+        outsiders = sorted(set(records) - members)
+        if outsiders:
+            raise ValueError(f"Students not enrolled in this batch: {', '.join(map(str, outsiders))}")
+        
+        # Marks already stored for the day, so the rollups get only the difference
+        # (a locking read, so MySQL's REPEATABLE READ returns the latest commit too)
+        previous = dict(self.db.execute(
+            select(Attendance.student_id, Attendance.is_present).filter(
+                Attendance.batch_id == attendance_data.batch_id,
+                Attendance.date == attendance_data.date,
+                Attendance.student_id.in_(list(records)),
+            ).with_for_update()
+        ).all())
+        
+        attendance_records = upsert(
+            self.db,
+            Attendance,
+            [
+                {
+                    "student_id": student_id,
+                    "batch_id": attendance_data.batch_id,
+                    "date": attendance_data.date,
+                    "is_present": record.is_present,
+                    "remarks": record.remarks,
+                    "marked_by": user_id,
+                }
+                for student_id, record in records.items()
+            ],
+            conflict_columns=("student_id", "batch_id", "date"),
+            update_columns=("is_present", "remarks", "marked_by"),
+        )
+        AttendanceRollupService(self.db).apply_marks(
+            attendance_data.batch_id, attendance_data.date, previous,
+            {student_id: record.is_present for student_id, record in records.items()},
+        )
         
-        # Refresh all records to get database values
+        # Detached before commit so the returned rows are not expired and re-read one by one
         for attendance in attendance_records:
-            self.db.refresh(attendance)
+            self.db.expunge(attendance)
+        self.db.commit()
         
         return attendance_records
     
@@ -113,11 +191,9 @@ class TeacherService:
         """Get attendance for a specific batch"""
         return self.db.query(Attendance).filter(Attendance.batch_id == batch_id).all()
     
-    def create_study_material(self, user_id: int, material_data: StudyMaterialCreate) -> StudyMaterial:
+    def create_study_material(self, user_id: int, material_data: StudyMaterialCreate, teacher_id: Optional[int] = None) -> StudyMaterial:
         """Upload study material"""
-        teacher = self.db.query(Teacher).filter(Teacher.user_id == user_id).first()
-        if not teacher:
-            raise ValueError("Teacher profile not found")
+        teacher_id = self._resolve_teacher_id(user_id, teacher_id)
         
         material = StudyMaterial(
             title=material_data.title,
@@ -126,7 +202,7 @@ class TeacherService:
             file_type=material_data.file_type,
             file_size=material_data.file_size,
             course_id=material_data.course_id,
-            teacher_id=teacher.id,
+            teacher_id=teacher_id,
             is_public=material_data.is_public
         )
         
@@ -136,25 +212,21 @@ class TeacherService:
         
         return material
     
-    def get_teacher_study_materials(self, user_id: int) -> List[StudyMaterial]:
+    def get_teacher_study_materials(self, user_id: int, teacher_id: Optional[int] = None) -> List[StudyMaterial]:
         """Get teacher's uploaded study materials"""
-        teacher = self.db.query(Teacher).filter(Teacher.user_id == user_id).first()
-        if not teacher:
-            raise ValueError("Teacher profile not found")
+        teacher_id = self._resolve_teacher_id(user_id, teacher_id)
         
-        return self.db.query(StudyMaterial).filter(StudyMaterial.teacher_id == teacher.id).all()
+        return self.db.query(StudyMaterial).filter(StudyMaterial.teacher_id == teacher_id).all()
     
-    def create_test(self, user_id: int, test_data: TestCreate) -> Test:
+    def create_test(self, user_id: int, test_data: TestCreate, teacher_id: Optional[int] = None) -> Test:
         """Create a new test"""
-        teacher = self.db.query(Teacher).filter(Teacher.user_id == user_id).first()
-        if not teacher:
-            raise ValueError("Teacher profile not found")
+        teacher_id = self._resolve_teacher_id(user_id, teacher_id)
         
         test = Test(
             title=test_data.title,
             description=test_data.description,
             course_id=test_data.course_id,
-            teacher_id=teacher.id,
+            teacher_id=teacher_id,
             total_marks=test_data.total_marks,
             passing_marks=test_data.passing_marks,
             duration_minutes=test_data.duration_minutes,
@@ -167,13 +239,11 @@ class TeacherService:
         
         return test
     
-    def get_teacher_tests(self, user_id: int) -> List[dict]:
+    def get_teacher_tests(self, user_id: int, teacher_id: Optional[int] = None) -> List[dict]:
         """Get teacher's created tests with course info"""
-        teacher = self.db.query(Teacher).filter(Teacher.user_id == user_id).first()
-        if not teacher:
-            raise ValueError("Teacher profile not found")
+        teacher_id = self._resolve_teacher_id(user_id, teacher_id)
         
-        tests = self.db.query(Test).filter(Test.teacher_id == teacher.id).all()
+        tests = self.db.query(Test).filter(Test.teacher_id == teacher_id).all()
         
         result = []
         for test in tests:
@@ -192,14 +262,12 @@ class TeacherService:
         
         return result
     
-    def upload_test_results(self, user_id: int, test_id: int, results_data: List) -> List[TestResult]:
+    def upload_test_results(self, user_id: int, test_id: int, results_data: List, teacher_id: Optional[int] = None) -> List[TestResult]:
         """Upload test results for multiple students"""
-        teacher = self.db.query(Teacher).filter(Teacher.user_id == user_id).first()
-        if not teacher:
-            raise ValueError("Teacher profile not found")
+        teacher_id = self._resolve_teacher_id(user_id, teacher_id)
         
         test = self.db.query(Test).filter(Test.id == test_id).first()
-        if not test or test.teacher_id != teacher.id:
+        if not test or test.teacher_id != teacher_id:
             raise ValueError("Test not found or unauthorized")
         
         results = []
@@ -237,15 +305,13 @@ class TeacherService:
         
         return results
     
-    def evaluate_test(self, user_id: int, test_id: int, evaluation: TestEvaluation) -> TestResult:
+    def evaluate_test(self, user_id: int, test_id: int, evaluation: TestEvaluation, teacher_id: Optional[int] = None) -> TestResult:
         """Evaluate a student's test (ONLY for tests created by this teacher)"""
-        teacher = self.db.query(Teacher).filter(Teacher.user_id == user_id).first()
-        if not teacher:
-            raise ValueError("Teacher profile not found")
+        teacher_id = self._resolve_teacher_id(user_id, teacher_id)
         
         # Verify test ownership
         test = self.db.query(Test).filter(Test.id == test_id).first()
-        if not test or test.teacher_id != teacher.id:
+        if not test or test.teacher_id != teacher_id:
             raise ValueError("Test not found or unauthorized - You can only modify your own test results")
         
         result = self.db.query(TestResult).filter(
@@ -269,40 +335,32 @@ class TeacherService:
         
         return result
     
-    def get_student_performance(self, user_id: int, student_id: int) -> dict:
+    def get_student_performance(self, user_id: int, student_id: int, teacher_id: Optional[int] = None) -> dict:
         """Get performance report for a specific student (ONLY showing this teacher's test results)"""
-        teacher = self.db.query(Teacher).filter(Teacher.user_id == user_id).first()
-        if not teacher:
-            raise ValueError("Teacher profile not found")
+        teacher_id = self._resolve_teacher_id(user_id, teacher_id)
         
         student = self.db.query(Student).filter(Student.id == student_id).first()
         if not student:
             raise ValueError("Student not found")
         
         # Verify student is in one of teacher's batches
-        teacher_batch_ids = [batch.id for batch in teacher.batches]
+        teacher_batch_ids = [row.id for row in self.db.query(Batch.id).filter(Batch.teacher_id == teacher_id).all()]
         student_in_teacher_batch = any(batch.id in teacher_batch_ids for batch in student.batches)
         
         if not student_in_teacher_batch:
             raise ValueError("Unauthorized - Student not in your batches")
         
-        # Attendance (only from teacher's batches)
-        total_attendance = self.db.query(Attendance).filter(
-            Attendance.student_id == student_id,
-            Attendance.batch_id.in_(teacher_batch_ids)
-        ).count()
-        present_count = self.db.query(Attendance).filter(
-            Attendance.student_id == student_id,
-            Attendance.batch_id.in_(teacher_batch_ids),
-            Attendance.is_present == True
-        ).count()
+        # Attendance (only from teacher's batches), from the per-batch rollup
+        total_attendance, present_count = self.db.execute(
+            student_totals_query(student_id, teacher_batch_ids)
+        ).one()
         
         attendance_percentage = (present_count / total_attendance * 100) if total_attendance > 0 else 0
         
         # Test results - ONLY from tests created by THIS teacher
         test_results = self.db.query(TestResult).join(Test).filter(
             TestResult.student_id == student_id,
-            Test.teacher_id == teacher.id
+            Test.teacher_id == teacher_id
         ).all()
         total_tests = len(test_results)
         average_marks = sum([r.percentage for r in test_results]) / total_tests if total_tests > 0 else 0
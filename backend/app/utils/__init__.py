@@ -1,11 +1,21 @@
 from app.utils.auth import (
     verify_password,
     get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    verify_and_update_password_async,
     create_access_token,
     decode_access_token,
+    generate_refresh_token,
+    hash_refresh_token,
     get_current_user,
     require_role,
-    require_roles
+    require_roles,
+    invalidate_cached_user,
+    get_auth_cache_stats,
+    build_token_claims,
+    get_current_principal,
+    require_principal_role
 )
 from app.utils.validators import (
     validate_email,
@@ -31,11 +41,21 @@ from app.utils.formatters import (
 __all__ = [
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "get_password_hash_async",
+    "verify_and_update_password_async",
     "create_access_token",
     "decode_access_token",
+    "generate_refresh_token",
+    "hash_refresh_token",
     "get_current_user",
     "require_role",
     "require_roles",
+    "invalidate_cached_user",
+    "get_auth_cache_stats",
+    "build_token_claims",
+    "get_current_principal",
+    "require_principal_role",
     "validate_email",
     "validate_phone",
     "validate_password",
@@ -1,29 +1,63 @@
+import hashlib
+import secrets
+import time
+from itertools import chain
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event, inspect, select, update
 from sqlalchemy.orm import Session
 from app.config import settings
 from app.database import get_db
-from app.models import User, UserRole
-
-pwd_context = CryptContext(
-    schemes=["pbkdf2_sha256"],  # Using PBKDF2 instead of bcrypt (no 72 byte limit)
-    deprecated="auto"
+from app.models import CacheVersion, User, UserRole, Student, Teacher
+from app.schemas.auth import Principal
+from app.utils.cache import TTLCache, detached_copy
+from app.utils.passwords import (
+    pwd_context,
+    verify_password,
+    get_password_hash,
+    verify_and_update_password,
+    verify_password_async,
+    get_password_hash_async,
+    verify_and_update_password_async,
 )
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/token")
 
+# Decoded JWT payloads keyed by raw token, and resolved users keyed by token
+# subject, stored with the cache_versions generation they were read at
+token_payload_cache = TTLCache(max_size=settings.AUTH_CACHE_MAX_SIZE, ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS)
+principal_cache = TTLCache(max_size=settings.AUTH_CACHE_MAX_SIZE, ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hashed password"""
-    return pwd_context.verify(plain_password, hashed_password)
+# The shared principals version, re-read by each worker at most every AUTH_REVOCATION_CHECK_SECONDS
+PRINCIPALS_KEY = "principals"
+principals_version_cache = TTLCache(max_size=1, ttl_seconds=settings.AUTH_REVOCATION_CHECK_SECONDS)
+_PRINCIPALS_VERSION = select(CacheVersion.version).where(CacheVersion.name == PRINCIPALS_KEY)
+_BUMP_PRINCIPALS_VERSION = (
+    update(CacheVersion)
+    .where(CacheVersion.name == PRINCIPALS_KEY)
+    .values(version=CacheVersion.version + 1)
+)
+# Changes that must end cached authentication on every worker (logins only touch last_login)
+_PRINCIPAL_COLUMNS = ("email", "role", "is_active", "password_hash")
 
 
-def get_password_hash(password: str) -> str:
-    """Hash a password using PBKDF2 (no length limit)"""
-    return pwd_context.hash(password)
+@event.listens_for(Session, "after_flush")
+def _invalidate_principals(session: Session, flush_context) -> None:
+    """Bump the shared principals version when a user is deleted or changes role, status or password"""
+    if any(
+        isinstance(obj, User) and (
+            obj in session.deleted
+            or any(inspect(obj).attrs[column].history.has_changes() for column in _PRINCIPAL_COLUMNS)
+        )
+        for obj in chain(session.dirty, session.deleted)
+    ):
+        session.connection().execute(_BUMP_PRINCIPALS_VERSION)
+        principal_cache.clear()
+        principals_version_cache.clear()
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -48,6 +82,69 @@ def decode_access_token(token: str) -> dict:
         return None
 
 
+def generate_refresh_token() -> Tuple[str, str]:
+    """Return a new opaque refresh token and the SHA-256 digest stored for it"""
+    token = secrets.token_urlsafe(32)
+    return token, hash_refresh_token(token)
+
+
+def hash_refresh_token(token: str) -> str:
+    """Digest used to look a refresh token up (high-entropy, so no salt or PBKDF2)"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _decode_cached_token(token: str) -> Optional[dict]:
+    """Decode a token, reusing the payload while the token is still unexpired"""
+    payload = token_payload_cache.get(token)
+    # exp is seconds since the epoch; naive utcnow().timestamp() would be read as local time
+    now = time.time()
+    if payload is not None and payload.get("exp", 0) > now:
+        return payload
+    
+    payload = decode_access_token(token)
+    if payload is not None and payload.get("exp"):
+        token_payload_cache.set(token, payload, ttl_seconds=payload["exp"] - now)
+    return payload
+
+
+def _load_user(db: Session, email: str) -> Optional[User]:
+    return db.query(User).filter(User.email == email).first()
+
+
+def _snapshot_user(user: User) -> User:
+    """Detached copy of a user's column values, safe to keep across sessions"""
+    return detached_copy(user)
+
+
+def invalidate_cached_user(email: Optional[str]) -> None:
+    """Drop a cached principal after the user is updated, deactivated or deleted.
+
+    Other workers drop theirs once they next read the principals version.
+    """
+    if email:
+        principal_cache.delete(email)
+    principals_version_cache.clear()
+
+
+async def _principals_version(db: Session) -> Optional[int]:
+    version = principals_version_cache.get(PRINCIPALS_KEY)
+    if version is None:
+        version = await run_in_threadpool(db.scalar, _PRINCIPALS_VERSION)
+        # Without a version row (schema not migrated) principals are not cached
+        if version is not None:
+            principals_version_cache.set(PRINCIPALS_KEY, version)
+    return version
+
+
+def get_auth_cache_stats() -> dict:
+    """Hit/miss counters for the token and principal caches"""
+    return {
+        "token_payloads": token_payload_cache.stats(),
+        "principals": principal_cache.stats(),
+        "principals_version": principals_version_cache.stats(),
+    }
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
@@ -59,7 +156,7 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    payload = decode_access_token(token)
+    payload = _decode_cached_token(token)
     if payload is None:
         raise credentials_exception
     
@@ -67,9 +164,19 @@ async def get_current_user(
     if email is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
+    # Read before the user: a change landing in between only costs a reload
+    version = await _principals_version(db)
+    cached = principal_cache.get(email)
+    if cached is not None and cached[0] == version:
+        # Attach a fresh copy to this session without hitting the database
+        user = db.merge(cached[1], load=False)
+    else:
+        # A blocking query: run it in the threadpool so async routes keep the event loop free
+        user = await run_in_threadpool(_load_user, db, email)
+        if user is None:
+            raise credentials_exception
+        if version is not None:
+            principal_cache.set(email, (version, _snapshot_user(user)))
     
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Inactive user")
@@ -77,6 +184,47 @@ async def get_current_user(
     return user
 
 
+def build_token_claims(user: User, db: Session) -> dict:
+    """Signed claims identifying the user and their student/teacher profile"""
+    claims = {"sub": user.email, "user_id": user.id, "role": user.role.value}
+    if user.role == UserRole.STUDENT:
+        row = db.query(Student.id).filter(Student.user_id == user.id).first()
+        if row:
+            claims["student_id"] = row.id
+    elif user.role == UserRole.TEACHER:
+        row = db.query(Teacher.id).filter(Teacher.user_id == user.id).first()
+        if row:
+            claims["teacher_id"] = row.id
+    return claims
+
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    current_user: User = Depends(get_current_user)
+) -> Principal:
+    """Get the authenticated user together with the profile IDs from the token"""
+    payload = _decode_cached_token(token) or {}
+    return Principal(
+        user_id=current_user.id,
+        email=current_user.email,
+        role=current_user.role,
+        student_id=payload.get("student_id"),
+        teacher_id=payload.get("teacher_id"),
+    )
+
+
+def require_principal_role(role: UserRole):
+    """Dependency to require a specific role, returning the token principal"""
+    async def role_checker(principal: Principal = Depends(get_current_principal)) -> Principal:
+        if principal.role != role:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"User does not have required role: {role}"
+            )
+        return principal
+    return role_checker
+
+
 def require_role(role: UserRole):
     """Dependency to require specific user role"""
     async def role_checker(current_user: User = Depends(get_current_user)) -> User:
@@ -0,0 +1,37 @@
+from datetime import date, timedelta
+from sqlalchemy import Date, cast, func, literal_column
+
+BUCKETS = ("day", "week", "month")
+BUCKET_PATTERN = "^(day|week|month)$"
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    """First day of the day, ISO week (Monday) or month containing day"""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def date_bucket(column, bucket: str, dialect: str):
+    """SQL for bucket_start(column, bucket) on a DATE column.
+
+    Arguments are rendered as literals, not bound parameters, so the same
+    expression in SELECT and GROUP BY compiles to identical SQL (PostgreSQL
+    rejects a GROUP BY whose expression differs only by parameter).
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown date bucket: {bucket}")
+    if bucket == "day":
+        return column
+    if dialect == "postgresql":
+        return cast(func.date_trunc(literal_column(f"'{bucket}'"), column), Date)
+    if dialect == "sqlite":
+        # 'weekday 0' moves forward to Sunday (or stays on it); six days back is that ISO week's Monday
+        modifiers = ("'weekday 0'", "'-6 days'") if bucket == "week" else ("'start of month'",)
+        return func.date(column, *(literal_column(modifier) for modifier in modifiers), type_=Date)
+    if dialect == "mysql":
+        offset = func.weekday(column) if bucket == "week" else func.dayofmonth(column) - literal_column("1")
+        return func.subdate(column, offset, type_=Date)
+    raise NotImplementedError(f"date_bucket is not implemented for the {dialect} dialect")
@@ -0,0 +1,140 @@
+import os
+import secrets
+import time
+from contextvars import ContextVar
+from typing import Optional
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    REGISTRY,
+)
+from fastapi import Header, HTTPException, status
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+
+# prometheus_client switches every metric below to per-process mmap files when
+# this variable is set (gunicorn.conf.py sets it), and /metrics then merges them
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route"],
+)
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP responses by route template and status code",
+    ["method", "route", "status"],
+)
+DB_STATEMENTS_PER_REQUEST = Histogram(
+    "http_request_db_statements",
+    "SQL statements executed while serving one request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL while serving one request",
+    ["method", "route"],
+)
+DB_STATEMENTS = Counter(
+    "db_statements_total",
+    "SQL statements executed, including outside requests",
+)
+
+
+class RequestDBStats:
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+
+# Holds the stats object of the request being served; sync DB work run in the
+# threadpool inherits the context, so it updates the same object
+_request_db_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+
+def get_request_db_stats() -> Optional[RequestDBStats]:
+    """DB statement count and time so far for the current request"""
+    return _request_db_stats.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Stored on the per-statement context so a failed statement leaves nothing behind
+    context._metrics_query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._metrics_query_started
+    DB_STATEMENTS.inc()
+    stats = _request_db_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += elapsed
+
+
+def _route_label(scope: dict) -> str:
+    # The route template keeps label cardinality bounded (/students/{student_id})
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and DB usage per route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestDBStats()
+        token = _request_db_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_db_stats.reset(token)
+            method = scope["method"]
+            route = _route_label(scope)
+            REQUEST_LATENCY.labels(method, route).observe(time.perf_counter() - started)
+            REQUESTS.labels(method, route, str(status_code)).inc()
+            DB_STATEMENTS_PER_REQUEST.labels(method, route).observe(stats.statements)
+            DB_TIME_PER_REQUEST.labels(method, route).observe(stats.seconds)
+
+
+def render_metrics() -> tuple:
+    """Prometheus exposition of every worker's metrics and its content type"""
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def require_metrics_token(authorization: Optional[str] = Header(None)) -> None:
+    """Only scrapers presenting METRICS_TOKEN as a bearer token may read /metrics"""
+    expected = settings.METRICS_TOKEN
+    presented = (authorization or "").encode()
+    if not expected or not secrets.compare_digest(presented, f"Bearer {expected}".encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to read metrics")
@@ -0,0 +1,112 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, List, Optional, Sequence
+from fastapi import Response
+from sqlalchemy import literal, tuple_
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# List bodies stay plain JSON arrays; paging metadata travels in headers
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+@dataclass
+class Page:
+    """One page of a list endpoint"""
+    items: list
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor holding the sort key of the last row on a page"""
+    raw = json.dumps(
+        [value.isoformat() if isinstance(value, date) else value for value in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> tuple:
+    """Sort key values from a cursor, typed like `columns`; ValueError if it was not issued for them"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        return tuple(_parse_value(value, column) for value, column in zip(values, columns))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid pagination cursor")
+
+
+def _parse_value(value: Any, column: Any) -> Any:
+    python_type = column.type.python_type
+    if value is None:
+        raise ValueError
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if not isinstance(value, python_type):
+        raise ValueError
+    return value
+
+
+def keyset_paginate(query: Query, sort_columns: Sequence[Any], cursor: Optional[str] = None,
+                    limit: Optional[int] = None, include_total: bool = False,
+                    descending: bool = False, offset: int = 0) -> Page:
+    """Page through a query in `sort_columns` order, continuing after `cursor`.
+
+    sort_columns must end in a unique column (normally the primary key) and
+    should match an index, so each page is an index range scan whatever its
+    depth. Without a limit every remaining row is returned. `offset` is only
+    for callers still sending the old skip parameter.
+    """
+    total = query.order_by(None).count() if include_total else None
+    if cursor:
+        # Bind with each column's own type so values compare in its storage format
+        values = decode_cursor(cursor, sort_columns)
+        key = tuple_(*sort_columns)
+        after = tuple_(*(literal(value, column.type) for value, column in zip(values, sort_columns)))
+        query = query.filter(key < after if descending else key > after)
+    query = query.order_by(*(column.desc() if descending else column.asc() for column in sort_columns))
+    if offset:
+        query = query.offset(offset)
+    if limit is None:
+        return Page(items=query.all(), total=total)
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in sort_columns])
+    return Page(items=rows, next_cursor=next_cursor, total=total)
+
+
+def paginate_sorted(items: List[Any], sort_column: Any, cursor: Optional[str] = None,
+                    limit: Optional[int] = None, include_total: bool = False,
+                    predicate: Optional[Callable[[Any], bool]] = None) -> Page:
+    """keyset_paginate over an in-memory list already ordered by sort_column (cached reference data)"""
+    if predicate is not None:
+        items = [item for item in items if predicate(item)]
+    total = len(items) if include_total else None
+    if cursor:
+        (after,) = decode_cursor(cursor, [sort_column])
+        items = [item for item in items if getattr(item, sort_column.key) > after]
+    if limit is None or len(items) <= limit:
+        return Page(items=list(items), total=total)
+    items = items[:limit]
+    return Page(items=items, next_cursor=encode_cursor([getattr(items[-1], sort_column.key)]), total=total)
+
+
+def with_page_headers(response: Response, page: Page) -> Response:
+    """Attach the next-page cursor and total count of `page` to a list response"""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if page.total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(page.total)
+    return response
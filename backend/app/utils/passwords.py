@@ -0,0 +1,79 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+from passlib.context import CryptContext
+from app.config import settings
+
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],  # Using PBKDF2 instead of bcrypt (no 72 byte limit)
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+    # Hashes with any other round count are flagged for rehash on next login
+    pbkdf2_sha256__min_rounds=settings.PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__max_rounds=settings.PASSWORD_HASH_ROUNDS,
+)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hashed password"""
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def get_password_hash(password: str) -> str:
+    """Hash a password using PBKDF2 (no length limit)"""
+    return pwd_context.hash(password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if the rounds changed"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def get_hashing_executor() -> Optional[Executor]:
+    """Return the shared hashing process pool (None means the default thread pool)"""
+    global _executor
+    if _executor is None and settings.PASSWORD_HASH_WORKERS > 0:
+        # spawn avoids forking a worker that already runs an event loop and threads
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_hashing_executor() -> None:
+    """Stop the hashing process pool"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _run_off_loop(func, *args):
+    global _executor
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_hashing_executor(), func, *args)
+    except BrokenProcessPool:
+        # A pool worker died; start a fresh pool next time and finish this call on a thread
+        _executor = None
+        return await loop.run_in_executor(None, func, *args)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password without blocking the event loop"""
+    return await _run_off_loop(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash without blocking the event loop"""
+    return await _run_off_loop(get_password_hash, password)
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """verify_and_update_password without blocking the event loop"""
+    return await _run_off_loop(verify_and_update_password, plain_password, hashed_password)
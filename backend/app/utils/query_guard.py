@@ -0,0 +1,117 @@
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+|\$\d+))*\s*\)")
+_NAMED_PARAM = re.compile(r"%\(\w+\)s|:\w+|\$\d+")
+
+
+class NPlusOneError(RuntimeError):
+    """Raised in QUERY_GUARD_MODE=raise when a statement shape repeats too often"""
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse a SQL statement to its shape: literals, params and IN-lists become ?"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _STRING_LITERAL.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _NAMED_PARAM.sub("?", shape)
+    return _IN_LIST.sub("(?)", shape)
+
+
+class QueryCounter:
+    """Statements executed (on any engine) while this counter is active"""
+
+    def __init__(self, threshold: Optional[int] = None, raise_on_repeat: bool = False):
+        self.threshold = threshold
+        self.raise_on_repeat = raise_on_repeat
+        self.statements: List[str] = []
+        self.shapes: Counter = Counter()
+        self._token = None
+
+    def __enter__(self) -> "QueryCounter":
+        self._token = _active_counter.set(self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _active_counter.reset(self._token)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def record(self, statement: str) -> None:
+        shape = normalize_sql(statement)
+        self.statements.append(statement)
+        self.shapes[shape] += 1
+        if self.raise_on_repeat and self.threshold and self.shapes[shape] > self.threshold:
+            raise NPlusOneError(
+                f"Statement repeated {self.shapes[shape]} times (limit {self.threshold}), "
+                f"likely an N+1 lazy load: {shape}"
+            )
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than threshold times, most frequent first"""
+        limit = self.threshold if threshold is None else threshold
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > limit]
+
+    def report(self) -> str:
+        return "\n".join(f"{count:>5} x {shape}" for shape, count in self.shapes.most_common())
+
+
+_active_counter: ContextVar[Optional[QueryCounter]] = ContextVar("active_query_counter", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _active_counter.get()
+    if counter is not None:
+        counter.record(statement)
+
+
+@contextmanager
+def assert_query_budget(max_statements: int, max_repeats: Optional[int] = None):
+    """Fail if the block runs more than max_statements, or one shape more than max_repeats times"""
+    with QueryCounter() as counter:
+        yield counter
+    problems = []
+    if counter.count > max_statements:
+        problems.append(f"{counter.count} statements executed, budget is {max_statements}")
+    if max_repeats is not None and counter.repeated(max_repeats):
+        problems.append(f"a statement shape repeated more than {max_repeats} times")
+    if problems:
+        raise AssertionError("; ".join(problems) + "\n" + counter.report())
+
+
+class QueryGuardMiddleware:
+    """ASGI middleware flagging requests whose statement shapes repeat (opt-in)"""
+
+    def __init__(self, app, mode: str = None, threshold: int = None):
+        self.app = app
+        self.mode = mode or settings.QUERY_GUARD_MODE
+        self.threshold = threshold or settings.QUERY_GUARD_THRESHOLD
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with QueryCounter(self.threshold, raise_on_repeat=self.mode == "raise") as counter:
+            await self.app(scope, receive, send)
+
+        for shape, count in counter.repeated():
+            logger.warning(
+                f"Possible N+1 on {scope['method']} {scope['path']}: "
+                f"{count} x {shape} ({counter.count} statements in request)"
+            )
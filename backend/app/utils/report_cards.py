@@ -0,0 +1,215 @@
+import asyncio
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Set
+from xml.sax.saxutils import escape
+import orjson
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Part of every content hash; bump it when the layout changes so cached cards are re-rendered
+RENDER_VERSION = 1
+
+# Superseded cards younger than this are kept: a concurrent request may have just been handed one
+SUPERSEDED_GRACE_SECONDS = 300
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+# Digest -> render in progress on this worker, so concurrent requests share one render
+_in_flight: Dict[str, asyncio.Future] = {}
+
+# Background batch renders; the event loop only keeps weak references to tasks
+_batches: Set[asyncio.Task] = set()
+
+
+def content_hash(card: dict) -> str:
+    """SHA-256 of a report card's inputs (and the render version)"""
+    payload = orjson.dumps({"version": RENDER_VERSION, "card": card}, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _card_prefix(card: dict) -> str:
+    # One student and term; the digest after it changes with the card's data
+    return f"{card['student_id']}_{card['start_date']}_{card['end_date']}_"
+
+
+def card_path(card: dict, digest: str) -> str:
+    """Cache file of the report card with this content hash"""
+    return os.path.join(settings.REPORT_CARD_DIR, f"{_card_prefix(card)}{digest}.pdf")
+
+
+def remove_superseded_cards(card: dict, path: str) -> int:
+    """Delete older cached cards of the same student and term than path; returns how many"""
+    directory, keep = os.path.split(path)
+    prefix, removed = _card_prefix(card), 0
+    cutoff = time.time() - SUPERSEDED_GRACE_SECONDS
+    with os.scandir(directory or ".") as entries:
+        for entry in entries:
+            if not (entry.name.startswith(prefix) and entry.name.endswith(".pdf")) or entry.name == keep:
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                # Another worker superseded it at the same time
+                pass
+    return removed
+
+
+def render_report_card(card: dict) -> bytes:
+    """Render one report card (the dict built by ReportCardService) as PDF bytes"""
+    # Imported here: reportlab adds ~200 ms to worker start-up and only the pool processes need it
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import mm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    styles = getSampleStyleSheet()
+    buffer = io.BytesIO()
+    document = SimpleDocTemplate(
+        buffer, pagesize=A4, title=f"Report card - {card['student_name']}",
+        leftMargin=18 * mm, rightMargin=18 * mm, topMargin=18 * mm, bottomMargin=18 * mm,
+    )
+    grid = TableStyle([
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#e8eef7")),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+    ])
+
+    story = [
+        Paragraph("Report Card", styles["Title"]),
+        Paragraph(f"{escape(card['student_name'])} &mdash; {escape(card['course'] or 'N/A')}", styles["Heading2"]),
+        Paragraph(f"Term: {card['start_date']} to {card['end_date']}", styles["Normal"]),
+        Spacer(1, 6 * mm),
+        Paragraph("Tests", styles["Heading3"]),
+    ]
+    results: List[dict] = card["results"]
+    if results:
+        rows = [["Date", "Test", "Marks", "Max", "%"]] + [
+            [r["date"] or "N/A", Paragraph(escape(r["test"]), styles["Normal"]), r["obtained"], r["max"],
+             f"{r['obtained'] / r['max'] * 100:.1f}" if r["max"] else "N/A"]
+            for r in results
+        ]
+        table = Table(rows, colWidths=[25 * mm, 85 * mm, 20 * mm, 20 * mm, 20 * mm], repeatRows=1)
+        table.setStyle(grid)
+        story.append(table)
+    else:
+        story.append(Paragraph("No tests this term.", styles["Normal"]))
+
+    attendance, fees = card["attendance"], card["fees"]
+    percentage = attendance["present"] / attendance["total"] * 100 if attendance["total"] else 0
+    summary = Table([
+        ["Attendance", "Classes", "Present", "Attendance %"],
+        ["", attendance["total"], attendance["present"], f"{percentage:.1f}"],
+        ["Fees", "Due", "Paid", "Pending"],
+        ["", fees["due"], fees["paid"], fees["due"] - fees["paid"]],
+    ], colWidths=[35 * mm, 45 * mm, 45 * mm, 45 * mm])
+    summary.setStyle(TableStyle([
+        *grid.getCommands(),
+        ("BACKGROUND", (0, 2), (-1, 2), colors.HexColor("#e8eef7")),
+        ("FONTNAME", (0, 2), (-1, 2), "Helvetica-Bold"),
+    ]))
+    story += [Spacer(1, 6 * mm), Paragraph("Summary", styles["Heading3"]), summary]
+
+    document.build(story)
+    return buffer.getvalue()
+
+
+def render_report_card_file(card: dict, path: str) -> str:
+    """Render a report card to path (atomically, so readers never see half a file).
+
+    Earlier cards of the same student and term are deleted once it is in place.
+    """
+    pdf = render_report_card(card)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, "wb") as handle:
+        handle.write(pdf)
+    os.replace(partial, path)
+    remove_superseded_cards(card, path)
+    return path
+
+
+def get_report_card_executor() -> Optional[Executor]:
+    """Return the shared report card process pool (None means the default thread pool)"""
+    global _executor
+    if _executor is None and settings.REPORT_CARD_WORKERS > 0:
+        # spawn avoids forking a worker that already runs an event loop and threads
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.REPORT_CARD_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_report_card_executor() -> None:
+    """Stop the report card process pool"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _render_off_loop(card: dict, path: str) -> str:
+    global _executor
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_report_card_executor(), render_report_card_file, card, path)
+    except BrokenProcessPool:
+        # A pool worker died; start a fresh pool next time and finish this card on a thread
+        _executor = None
+        return await loop.run_in_executor(None, render_report_card_file, card, path)
+
+
+async def ensure_report_card(card: dict, digest: Optional[str] = None) -> str:
+    """Path of the rendered card, rendering it in the pool unless a card with the same inputs is cached"""
+    digest = digest or content_hash(card)
+    path = card_path(card, digest)
+    if os.path.exists(path):
+        return path
+    future = _in_flight.get(digest)
+    if future is None:
+        future = _in_flight[digest] = asyncio.ensure_future(_render_off_loop(card, path))
+        future.add_done_callback(lambda _: _in_flight.pop(digest, None))
+    return await asyncio.shield(future)
+
+
+def split_cached(cards: Dict[int, dict]) -> tuple:
+    """({student_id: digest} already rendered, {student_id: digest} still to render)"""
+    cached, missing = {}, {}
+    for student_id, card in cards.items():
+        digest = content_hash(card)
+        (cached if os.path.exists(card_path(card, digest)) else missing)[student_id] = digest
+    return cached, missing
+
+
+async def render_report_cards(cards: Dict[int, dict], digests: Dict[int, str]) -> Dict[int, str]:
+    """Render the given cards in the pool; returns {student_id: path}"""
+    paths = await asyncio.gather(*(ensure_report_card(cards[student_id], digest)
+                                   for student_id, digest in digests.items()))
+    return dict(zip(digests, paths))
+
+
+def schedule_report_cards(cards: Dict[int, dict], digests: Dict[int, str]) -> None:
+    """Render the given cards in the background; the request does not wait for them"""
+    if not digests:
+        return
+    task = asyncio.create_task(render_report_cards(cards, digests))
+    _batches.add(task)
+    task.add_done_callback(_finish_batch)
+
+
+def _finish_batch(task: asyncio.Task) -> None:
+    _batches.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Report card rendering failed", exc_info=task.exception())
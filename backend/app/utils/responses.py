@@ -0,0 +1,82 @@
+import json
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, List, Type
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def _orjson_default(value: Any):
+    # orjson handles datetime, date, UUID, enums and dataclasses itself; SQL
+    # aggregates on some backends come back as Decimal
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson, falling back to the stdlib encoder"""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def json_response(content: Any, status_code: int = 200) -> FastJSONResponse:
+    """Send dicts a service has already shaped straight to the encoder.
+
+    Returning a Response from a route skips FastAPI's response_model
+    validation and jsonable_encoder walk, so only use this for content built
+    from plain values (ids, strings, numbers, dates).
+    """
+    return FastJSONResponse(content, status_code=status_code)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def model_list_response(model: Type[BaseModel], objects: Iterable[Any]) -> Response:
+    """Validate ORM objects into `model` once and serialize them in pydantic-core"""
+    adapter = _list_adapter(model)
+    items = adapter.validate_python(list(objects), from_attributes=True)
+    return Response(adapter.dump_json(items), media_type="application/json")
+
+
+def _encode_rows(rows: List[Any]) -> bytes:
+    """Comma-separated JSON encoding of rows, without the enclosing brackets"""
+    if orjson is None:
+        return json.dumps(jsonable_encoder(rows))[1:-1].encode()
+    return orjson.dumps(rows, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)[1:-1]
+
+
+def stream_json_array(rows: Iterable[Any], rows_per_chunk: int = 500) -> StreamingResponse:
+    """Send an iterable of plain rows as one JSON array, encoded rows_per_chunk at a time.
+
+    A sync iterable is consumed in the threadpool, so rows can come straight
+    from a database cursor and only one chunk is held in memory. An error
+    part-way through truncates the body; the status line has already gone.
+    """
+    def chunks() -> Iterator[bytes]:
+        yield b"["
+        separator, batch = b"", []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= rows_per_chunk:
+                yield separator + _encode_rows(batch)
+                separator, batch = b",", []
+        if batch:
+            yield separator + _encode_rows(batch)
+        yield b"]"
+    
+    return StreamingResponse(chunks(), media_type="application/json")
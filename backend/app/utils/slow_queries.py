@@ -0,0 +1,157 @@
+import logging
+import os
+import sys
+import threading
+import time
+from typing import List, Optional
+import greenlet
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import settings
+from app.utils.query_guard import normalize_sql
+
+logger = logging.getLogger(__name__)
+
+_SERVICES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services")
+_MAX_TRACKED_SHAPES = 500
+_MAX_PARAM_LENGTH = 100
+
+
+class SlowQueryLog:
+    """Rolling per-worker table of slow statement shapes, worst first"""
+
+    def __init__(self, max_shapes: int = _MAX_TRACKED_SHAPES):
+        self.max_shapes = max_shapes
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def has_plan(self, shape: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(shape)
+            return entry is not None and entry["plan"] is not None
+
+    def record(self, shape: str, statement: str, parameters, duration_ms: float,
+               caller: Optional[str], plan: Optional[List[str]]) -> None:
+        with self._lock:
+            entry = self._entries.get(shape)
+            if entry is None:
+                if len(self._entries) >= self.max_shapes:
+                    # Make room by forgetting the least slow shape
+                    fastest = min(self._entries, key=lambda key: self._entries[key]["max_ms"])
+                    del self._entries[fastest]
+                entry = self._entries[shape] = {
+                    "shape": shape,
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "callers": [],
+                    "plan": None,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            if duration_ms >= entry["max_ms"]:
+                entry["max_ms"] = duration_ms
+                entry["statement"] = statement
+                entry["parameters"] = parameters
+            if caller and caller not in entry["callers"]:
+                entry["callers"].append(caller)
+            if plan is not None and entry["plan"] is None:
+                entry["plan"] = plan
+
+    def top(self, limit: int = None) -> List[dict]:
+        """The slowest shapes by worst duration, with their captured plan"""
+        limit = limit or settings.SLOW_QUERY_TOP_N
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda entry: entry["max_ms"], reverse=True)[:limit]
+            return [
+                dict(entry, total_ms=round(entry["total_ms"], 1), max_ms=round(entry["max_ms"], 1),
+                     avg_ms=round(entry["total_ms"] / entry["count"], 1), callers=list(entry["callers"]))
+                for entry in entries
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog()
+
+
+def _find_caller() -> Optional[str]:
+    """Innermost app/services frame on the stack, as Class.method"""
+    frame = sys._getframe(2)
+    # AsyncSession runs the driver in a child greenlet; the service coroutine
+    # is on the stack of the greenlet that spawned it
+    current = greenlet.getcurrent()
+    while frame is not None:
+        if frame.f_code.co_filename.startswith(_SERVICES_DIR):
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            return f"{type(owner).__name__}.{name}" if owner is not None else name
+        frame = frame.f_back
+        if frame is None and current.parent is not None:
+            current = current.parent
+            frame = current.gr_frame
+    return None
+
+
+def _format_parameters(statement: str, parameters):
+    lowered = statement.lower()
+    if ("password_hash" in lowered or "token_hash" in lowered) and not lowered.lstrip().startswith("select"):
+        return "<redacted>"
+    if isinstance(parameters, dict):
+        return {key: _shorten(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_shorten(value) for value in parameters]
+    return _shorten(parameters)
+
+
+def _shorten(value):
+    if isinstance(value, (str, bytes)) and len(value) > _MAX_PARAM_LENGTH:
+        return value[:_MAX_PARAM_LENGTH] + "..."
+    return value if isinstance(value, (int, float, bool, type(None))) else str(value)
+
+
+def _explain(conn, statement: str, parameters) -> Optional[List[str]]:
+    """Plan for a read statement, run on the raw DBAPI connection to skip the event hooks"""
+    if not statement.lstrip().lower().startswith(("select", "with")):
+        return None
+    prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return [" | ".join(str(column) for column in row) for row in cursor.fetchall()]
+    except Exception as exc:
+        return [f"EXPLAIN failed: {exc}"]
+    finally:
+        cursor.close()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    context._slow_query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _check_duration(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - context._slow_query_started) * 1000
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS
+    if threshold <= 0 or duration_ms < threshold:
+        return
+
+    shape = normalize_sql(statement)
+    caller = _find_caller()
+    params = _format_parameters(statement, parameters)
+    plan = None
+    # A streamed result (yield_per, stream_results) still has rows pending on this
+    # connection; an EXPLAIN on it would fail or, on MySQL, desync the protocol
+    streaming = context.execution_options.get("stream_results") or context.execution_options.get("yield_per")
+    if settings.SLOW_QUERY_EXPLAIN and not executemany and not streaming and not slow_query_log.has_plan(shape):
+        plan = _explain(conn, statement, parameters)
+
+    logger.warning(
+        f"Slow query {duration_ms:.1f}ms in {caller or 'unknown caller'}: "
+        f"{' '.join(statement.split())} params={params}"
+        + (f"\n  plan: " + "\n        ".join(plan) if plan else "")
+    )
+    slow_query_log.record(shape, statement, params, duration_ms, caller, plan)
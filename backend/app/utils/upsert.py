@@ -0,0 +1,72 @@
+from typing import List, Sequence
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+_ON_CONFLICT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def upsert(db: Session, model, rows: List[dict], conflict_columns: Sequence[str],
+           update_columns: Sequence[str]) -> list:
+    """Insert rows or update the ones whose conflict_columns already exist, in one statement.
+
+    conflict_columns must be covered by a unique index or constraint. Returns
+    the resulting ORM objects; PostgreSQL and SQLite get them from RETURNING,
+    other backends from one follow-up SELECT on the conflict keys.
+    """
+    if not rows:
+        return []
+    dialect = db.get_bind().dialect.name
+
+    if dialect in _ON_CONFLICT_INSERTS:
+        stmt = _ON_CONFLICT_INSERTS[dialect](model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={column: stmt.excluded[column] for column in update_columns},
+        )
+        # populate_existing overwrites stale copies already in the identity map
+        return list(db.scalars(stmt.returning(model), execution_options={"populate_existing": True}))
+
+    if dialect == "mysql":
+        stmt = mysql.insert(model).values(rows)
+        stmt = stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in update_columns})
+        db.execute(stmt)
+    else:
+        raise NotImplementedError(f"upsert is not implemented for the {dialect} dialect")
+
+    key = tuple_(*(getattr(model, column) for column in conflict_columns))
+    keys = [tuple(row[column] for column in conflict_columns) for row in rows]
+    return list(db.scalars(
+        select(model).where(key.in_(keys)), execution_options={"populate_existing": True}
+    ))
+
+
+def upsert_increment(db: Session, model, rows: List[dict], conflict_columns: Sequence[str],
+                     increment_columns: Sequence[str]) -> None:
+    """Insert rows, or add their increment_columns to the rows whose conflict_columns exist, in one statement.
+
+    The addition happens in the database, so concurrent increments of the
+    same row are never lost.
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    table = model.__table__
+
+    if dialect in _ON_CONFLICT_INSERTS:
+        stmt = _ON_CONFLICT_INSERTS[dialect](model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={column: table.c[column] + stmt.excluded[column] for column in increment_columns},
+        )
+    elif dialect == "mysql":
+        stmt = mysql.insert(model).values(rows)
+        stmt = stmt.on_duplicate_key_update({
+            column: table.c[column] + stmt.inserted[column] for column in increment_columns
+        })
+    else:
+        raise NotImplementedError(f"upsert_increment is not implemented for the {dialect} dialect")
+    db.execute(stmt)
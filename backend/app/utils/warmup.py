@@ -0,0 +1,78 @@
+import asyncio
+import time
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+from app.config import settings
+from app.database import SessionLocal, _is_memory_sqlite, engine, get_async_engine
+from app.models import User, Student, Teacher
+from app.services.admin_service import AdminService
+
+
+def _open_pool_connections() -> None:
+    """Check out DB_POOL_SIZE connections at once so each is opened now"""
+    if _is_memory_sqlite(settings.DATABASE_URL):
+        return
+    connections = [engine.connect() for _ in range(settings.DB_POOL_SIZE)]
+    for connection in connections:
+        connection.close()
+
+
+def _compile_hot_statements() -> None:
+    """Run the per-request lookups once so their SQL sits in the compiled cache"""
+    db = SessionLocal()
+    try:
+        # get_current_user / login
+        db.query(User).filter(User.email == "").first()
+        # build_token_claims and the student/teacher profile resolvers
+        db.query(Student.id).filter(Student.user_id == 0).first()
+        db.query(Teacher.id).filter(Teacher.user_id == 0).first()
+    finally:
+        db.close()
+
+
+def _prime_reference_data() -> None:
+    db = SessionLocal()
+    try:
+        admin_service = AdminService(db)
+        admin_service.get_all_courses()
+        admin_service.get_all_batches()
+    finally:
+        db.close()
+
+
+def _import_payment_sdk() -> None:
+    # PaymentService imports the SDK lazily; pay that cost here instead
+    if settings.RAZORPAY_KEY_ID and settings.RAZORPAY_KEY_SECRET:
+        import razorpay  # noqa: F401
+
+
+def run_warmup(app: FastAPI) -> dict:
+    """Run the blocking warm-up steps in order, returning milliseconds per step"""
+    steps = (
+        ("mappers_ms", configure_mappers),
+        ("pool_ms", _open_pool_connections),
+        ("statements_ms", _compile_hot_statements),
+        ("reference_data_ms", _prime_reference_data),
+        ("payment_sdk_ms", _import_payment_sdk),
+        ("openapi_ms", app.openapi),
+    )
+    timings = {}
+    for name, step in steps:
+        started = time.perf_counter()
+        step()
+        timings[name] = round((time.perf_counter() - started) * 1000, 1)
+    return timings
+
+
+async def warm_async_pool() -> dict:
+    """Open connections on the async engine used by the AsyncSession routes"""
+    started = time.perf_counter()
+    async_engine = get_async_engine()
+
+    async def ping():
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(settings.DB_POOL_SIZE)))
+    return {"async_pool_ms": round((time.perf_counter() - started) * 1000, 1)}
@@ -0,0 +1,137 @@
+"""
+Concurrent read/write throughput on SQLite with and without the tuned profile.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_db_pool --threads 8 --seconds 5
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.database import Base, build_engine
+from app.models import User, UserRole, Student, Course, Batch, Attendance
+
+
+def seed(session_factory, students: int) -> tuple:
+    db = session_factory()
+    course = Course(name="Benchmark Course")
+    db.add(course)
+    db.flush()
+    batch = Batch(name="Benchmark Batch", code="BENCH-1", course_id=course.id)
+    db.add(batch)
+    db.flush()
+    student_ids = []
+    for i in range(students):
+        user = User(
+            email=f"bench{i}@example.com",
+            username=f"bench{i}",
+            full_name=f"Bench Student {i}",
+            password_hash="x",
+            role=UserRole.STUDENT,
+        )
+        db.add(user)
+        db.flush()
+        student = Student(user_id=user.id, course=course.name)
+        db.add(student)
+        db.flush()
+        student_ids.append(student.id)
+    db.commit()
+    batch_id = batch.id
+    db.close()
+    return batch_id, student_ids
+
+
+def worker(session_factory, batch_id, student_ids, write_ratio, deadline, counters, lock):
+    reads = writes = errors = 0
+    rng = random.Random()
+    while time.perf_counter() < deadline:
+        db = session_factory()
+        try:
+            student_id = rng.choice(student_ids)
+            if rng.random() < write_ratio:
+                db.add(Attendance(
+                    student_id=student_id,
+                    batch_id=batch_id,
+                    date=date.today() - timedelta(days=rng.randint(0, 365)),
+                    is_present=rng.random() < 0.8,
+                ))
+                db.commit()
+                writes += 1
+            else:
+                db.query(func.count(Attendance.id)).filter(
+                    Attendance.student_id == student_id,
+                    Attendance.is_present == True  # noqa: E712
+                ).scalar()
+                reads += 1
+        except OperationalError:
+            db.rollback()
+            errors += 1
+        finally:
+            db.close()
+    with lock:
+        counters["reads"] += reads
+        counters["writes"] += writes
+        counters["errors"] += errors
+
+
+def run(label: str, tuned: bool, args) -> dict:
+    directory = tempfile.mkdtemp(prefix="bench_db_")
+    engine = build_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", sqlite_tuning=tuned)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    batch_id, student_ids = seed(session_factory, args.students)
+
+    counters = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+    threads = [
+        threading.Thread(target=worker, args=(session_factory, batch_id, student_ids, args.write_ratio, deadline, counters, lock))
+        for _ in range(args.threads)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+
+    total = counters["reads"] + counters["writes"]
+    return {
+        "profile": label,
+        "ops_per_sec": round(total / elapsed, 1),
+        "reads_per_sec": round(counters["reads"] / elapsed, 1),
+        "writes_per_sec": round(counters["writes"] / elapsed, 1),
+        "lock_errors": counters["errors"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"{args.threads} threads, {args.seconds}s, write ratio {args.write_ratio}")
+    print(f"{'profile':<10}{'ops/s':>10}{'reads/s':>10}{'writes/s':>10}{'locked':>8}")
+    for label, tuned in (("default", False), ("tuned", True)):
+        result = run(label, tuned, args)
+        print(
+            f"{result['profile']:<10}{result['ops_per_sec']:>10}{result['reads_per_sec']:>10}"
+            f"{result['writes_per_sec']:>10}{result['lock_errors']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
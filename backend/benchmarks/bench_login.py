@@ -0,0 +1,127 @@
+"""
+Login throughput under concurrent load, with PBKDF2 inline on the event loop
+vs in the hashing process pool, plus how long a /health call waits past its
+scheduled time while logins are in flight.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_login --concurrency 20 --logins 200
+    PASSWORD_HASH_WORKERS=4 python -m benchmarks.bench_login
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_login_'), 'bench.db')}")
+
+import httpx
+from fastapi import Depends, HTTPException
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import Base, SessionLocal, engine, get_db
+from app.models import User, UserRole
+from app.schemas.auth import UserLogin
+from app.services.auth_service import AuthService
+from app.utils.auth import get_password_hash
+from app.utils.passwords import get_hashing_executor, shutdown_hashing_executor
+from main import app
+
+PASSWORD = "benchmark-password"
+
+
+@app.post("/bench/inline-login")
+async def inline_login(credentials: UserLogin, db: Session = Depends(get_db)):
+    """The previous behaviour: PBKDF2 runs on the event loop"""
+    token = AuthService(db).login(credentials.email, credentials.password)
+    if not token:
+        raise HTTPException(status_code=401)
+    return token
+
+
+def seed(users: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    password_hash = get_password_hash(PASSWORD)
+    for i in range(users):
+        db.add(User(
+            email=f"bench{i}@example.com",
+            username=f"bench{i}",
+            full_name=f"Bench User {i}",
+            password_hash=password_hash,
+            role=UserRole.ADMIN,
+            is_active=True,
+        ))
+    db.commit()
+    db.close()
+
+
+async def drive(client: httpx.AsyncClient, path: str, users: int, concurrency: int, total: int) -> tuple:
+    remaining = total
+    done = False
+    probe_latencies = []
+
+    async def runner(offset: int):
+        nonlocal remaining
+        index = offset
+        while remaining > 0:
+            remaining -= 1
+            email = f"bench{index % users}@example.com"
+            index += concurrency
+            response = await client.post(path, json={"email": email, "password": PASSWORD})
+            response.raise_for_status()
+
+    async def probe():
+        # A /health call scheduled 10ms from now; anything past that is time
+        # the event loop spent blocked on someone else's work
+        while not done:
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            await client.get("/health")
+            probe_latencies.append((time.perf_counter() - started) * 1000 - 10)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(runner(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done = True
+    await probe_task
+
+    probe_latencies.sort()
+    p95 = probe_latencies[int(len(probe_latencies) * 0.95) - 1] if probe_latencies else 0
+    return total / elapsed, statistics.median(probe_latencies) if probe_latencies else 0, p95
+
+
+async def main_async(args) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{args.logins} logins, concurrency {args.concurrency}, "
+              f"PBKDF2 rounds {settings.PASSWORD_HASH_ROUNDS}, pool workers {settings.PASSWORD_HASH_WORKERS}")
+        print(f"{'path':<10}{'logins/s':>10}{'health p50 ms':>15}{'health p95 ms':>15}")
+        for label, path in (("inline", "/bench/inline-login"), ("pooled", "/api/auth/login")):
+            await drive(client, path, args.users, args.concurrency, args.concurrency)
+            rate, p50, p95 = await drive(client, path, args.users, args.concurrency, args.logins)
+            print(f"{label:<10}{rate:>10.1f}{p50:>15.1f}{p95:>15.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--users", type=int, default=50)
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    seed(args.users)
+    get_hashing_executor()
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        shutdown_hashing_executor()
+
+
+if __name__ == "__main__":
+    main()
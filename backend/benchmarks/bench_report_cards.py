@@ -0,0 +1,148 @@
+"""
+Term report cards for one course of a synthetic institute.
+
+Loading: a per-student loop over the ORM relationships (user, test results
+and their tests, attendances, fees) vs ReportCardService.get_course_cards,
+which batch-loads the course in four statements. Exits 1 if the two build
+different cards.
+
+Rendering: every card rendered serially in this process vs through the
+report card process pool (REPORT_CARD_WORKERS, started beforehand and timed
+separately), then the same request again with the content-hash cache warm,
+and once more after one student's attendance changes (only that card is
+re-rendered). The pool only beats the serial loop with more than one core.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_report_cards --size medium
+    REPORT_CARD_WORKERS=4 python -m benchmarks.bench_report_cards --size large
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_cards_'), 'bench.db')}")
+os.environ.setdefault("SLOW_QUERY_THRESHOLD_MS", "0")
+os.environ.setdefault("REPORT_CARD_DIR", tempfile.mkdtemp(prefix="bench_cards_pdf_"))
+
+from sqlalchemy import func
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models import Student
+from app.services.report_card_service import ReportCardService
+from app.utils.query_guard import QueryCounter
+from app.utils.report_cards import (
+    render_report_card, render_report_cards, shutdown_report_card_executor, split_cached,
+)
+from benchmarks.datagen import add_size_arguments, generate_institute, reset_database, size_from_args
+
+
+def cards_per_student(db, course: str, start_date: date, end_date: date) -> dict:
+    """The straightforward loader: each student's relationships, filtered in Python"""
+    cards = {}
+    for student in db.query(Student).filter(Student.course == course).order_by(Student.id).all():
+        results = []
+        for result in student.test_results:
+            taken_at = result.test.test_date or result.created_at
+            if taken_at and start_date <= taken_at.date() <= end_date:
+                results.append((taken_at.replace(tzinfo=None), result.id, {
+                    "test": result.test.title,
+                    "max": result.test.total_marks,
+                    "obtained": result.marks_obtained or 0,
+                    "date": taken_at.strftime("%Y-%m-%d"),
+                }))
+        marks = [a for a in student.attendances if start_date <= a.date <= end_date]
+        fees = [f for f in student.fees if start_date <= f.due_date <= end_date]
+        cards[student.id] = {
+            "student_id": student.id,
+            "student_name": student.user.full_name,
+            "course": student.course,
+            "batch": student.batch,
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "results": [row for _, _, row in sorted(results, key=lambda r: r[:2])],
+            "attendance": {"total": len(marks), "present": sum(1 for a in marks if a.is_present)},
+            "fees": {"due": sum(f.amount for f in fees), "paid": sum(f.paid_amount or 0 for f in fees)},
+        }
+    return cards
+
+
+def load(build) -> tuple:
+    db = SessionLocal()
+    try:
+        with QueryCounter() as counter:
+            started = time.perf_counter()
+            cards = build(db)
+            return cards, (time.perf_counter() - started) * 1000, counter.count
+    finally:
+        db.close()
+
+
+def render_pass(cards: dict) -> tuple:
+    """(cached, rendered, ms) for one generate request's worth of work"""
+    started = time.perf_counter()
+    cached, missing = split_cached(cards)
+    asyncio.run(render_report_cards(cards, missing))
+    return len(cached), len(missing), (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_size_arguments(parser)
+    args = parser.parse_args()
+    logging.getLogger("alembic").setLevel(logging.WARNING)
+
+    reset_database()
+    generate_institute(size_from_args(args), seed=args.seed)
+    db = SessionLocal()
+    course, start_date = db.query(Student.course, func.min(Student.enrollment_date))\
+        .group_by(Student.course).order_by(func.count(Student.id).desc()).first()
+    db.close()
+    start_date = min(start_date or date.today(), date.today() - timedelta(days=180))
+    end_date = date.today()
+    print(f"course {course}, term {start_date} to {end_date} ({engine.dialect.name})")
+
+    old, old_ms, old_statements = load(lambda db: cards_per_student(db, course, start_date, end_date))
+    new, new_ms, new_statements = load(lambda db: ReportCardService(db).get_course_cards(course, start_date, end_date))
+    print(f"{len(new)} students, {sum(len(card['results']) for card in new.values())} test results")
+    print(f"{'load':<28}{'ms':>10}{'statements':>12}")
+    print(f"{'per-student relationships':<28}{old_ms:>10.1f}{old_statements:>12}")
+    print(f"{'batch load (course)':<28}{new_ms:>10.1f}{new_statements:>12}")
+
+    started = time.perf_counter()
+    for card in new.values():
+        render_report_card(card)
+    serial_ms = (time.perf_counter() - started) * 1000
+    print(f"\n{'render':<28}{'cached':>8}{'rendered':>10}{'ms':>10}")
+    print(f"{'serial, in process':<28}{0:>8}{len(new):>10}{serial_ms:>10.0f}")
+    try:
+        # Spawning the workers and importing reportlab in each is a one-off per app worker
+        samples = list(new.values())[:max(settings.REPORT_CARD_WORKERS, 1)]
+        primers = {-n: {**card, "student_id": -n} for n, card in enumerate(samples, 1)}
+        _, rendered, startup_ms = render_pass(primers)
+        print(f"{'pool start-up':<28}{0:>8}{rendered:>10}{startup_ms:>10.0f}")
+        cached, rendered, pool_ms = render_pass(new)
+        print(f"{f'pool ({settings.REPORT_CARD_WORKERS} workers)':<28}{cached:>8}{rendered:>10}{pool_ms:>10.0f}")
+        cached, rendered, warm_ms = render_pass(new)
+        print(f"{'pool, cache warm':<28}{cached:>8}{rendered:>10}{warm_ms:>10.0f}")
+        changed = next(iter(new.values()))
+        changed["attendance"] = {**changed["attendance"], "total": changed["attendance"]["total"] + 1}
+        cached, rendered, changed_ms = render_pass(new)
+        print(f"{'pool, one student changed':<28}{cached:>8}{rendered:>10}{changed_ms:>10.0f}")
+    finally:
+        shutdown_report_card_executor()
+
+    # Drop the Python-side change before comparing the loaders
+    new = load(lambda db: ReportCardService(db).get_course_cards(course, start_date, end_date))[0]
+    if old != new:
+        print("the batch-loaded cards differ from the per-student cards")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Response serialization cost on large payloads, without a database in the way.
+
+Three route shapes are compared, each on the stock FastAPI path (stdlib json
+after response_model validation / jsonable_encoder) and on the fast path in
+app/utils/responses.py:
+
+  report   10k service-shaped dicts, like get_test_marks_report
+  orm      10k ORM objects with response_model=List[FeeResponse], like get_all_fees
+  models   10k already-built Pydantic models, which FastAPI dumps and re-validates
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_serialization --rows 10000 --requests 20
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from app.models import Fee
+from app.models.fee import PaymentStatus
+from app.schemas.admin import FeeResponse
+from app.utils.responses import FastJSONResponse, json_response, model_list_response
+
+
+def build_report_rows(rows: int) -> List[dict]:
+    today = date.today()
+    return [
+        {
+            "id": i,
+            "studentName": f"Student {i}",
+            "class": "Class 10",
+            "subject": f"Unit test {i % 12}",
+            "testName": f"Unit test {i % 12}",
+            "maxMarks": 100,
+            "obtained": i % 101,
+            "uploadedBy": f"Teacher {i % 40}",
+            "date": (today - timedelta(days=i % 365)).strftime("%Y-%m-%d"),
+        }
+        for i in range(rows)
+    ]
+
+
+def build_fees(rows: int) -> List[Fee]:
+    today = date.today()
+    return [
+        Fee(
+            id=i,
+            student_id=i % 500,
+            amount=25000,
+            paid_amount=(i % 5) * 5000,
+            due_date=today + timedelta(days=i % 90),
+            payment_date=today if i % 3 else None,
+            status=PaymentStatus.PAID if i % 5 == 4 else PaymentStatus.PENDING,
+            transaction_id=f"txn_{i}" if i % 3 else None,
+            created_at=datetime.now(),
+        )
+        for i in range(rows)
+    ]
+
+
+def build_app(rows: int) -> FastAPI:
+    report = build_report_rows(rows)
+    fees = build_fees(rows)
+    fee_models = [FeeResponse.model_validate(fee) for fee in fees]
+
+    # Two apps so the stock path keeps FastAPI's default JSONResponse
+    stock = FastAPI(default_response_class=JSONResponse)
+    fast = FastAPI(default_response_class=FastJSONResponse)
+
+    @stock.get("/report")
+    async def stock_report():
+        return report
+
+    @fast.get("/report")
+    async def fast_report():
+        return json_response(report)
+
+    @stock.get("/orm", response_model=List[FeeResponse])
+    async def stock_orm():
+        return fees
+
+    @fast.get("/orm", response_model=List[FeeResponse])
+    async def fast_orm():
+        return model_list_response(FeeResponse, fees)
+
+    @stock.get("/models", response_model=List[FeeResponse])
+    async def stock_models():
+        return fee_models
+
+    @fast.get("/models", response_model=List[FeeResponse])
+    async def fast_models():
+        return model_list_response(FeeResponse, fee_models)
+
+    root = FastAPI()
+    root.mount("/stock", stock)
+    root.mount("/fast", fast)
+    return root
+
+
+async def time_requests(client: httpx.AsyncClient, path: str, requests: int) -> tuple:
+    response = await client.get(path)
+    response.raise_for_status()
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(path)
+        response.raise_for_status()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), len(response.content)
+
+
+async def main_async(args) -> None:
+    transport = httpx.ASGITransport(app=build_app(args.rows))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{args.rows} rows, median of {args.requests} requests")
+        print(f"{'payload':<10}{'stock ms':>10}{'fast ms':>10}{'speedup':>10}{'bytes':>12}")
+        for payload in ("report", "orm", "models"):
+            stock_ms, _ = await time_requests(client, f"/stock/{payload}", args.requests)
+            fast_ms, size = await time_requests(client, f"/fast/{payload}", args.requests)
+            print(f"{payload:<10}{stock_ms:>10.1f}{fast_ms:>10.1f}{stock_ms / fast_ms:>9.1f}x{size:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
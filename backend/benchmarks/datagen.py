@@ -0,0 +1,310 @@
+"""
+Synthetic institute data for benchmarks: courses, batches, teachers and
+students, plus months of attendance, monthly fees, tests with results, study
+materials, notifications and pending signup requests.
+
+Rows get explicit ids and are bulk-inserted, so generation scales to tens of
+thousands of students; every account shares one password (PASSWORD) so only
+one hash is computed. The data is deterministic for a given seed.
+
+Usage (from the backend directory, against DATABASE_URL):
+    python -m benchmarks.datagen --size medium --reset
+    python -m benchmarks.datagen --students 5000 --months 12 --reset
+"""
+import argparse
+import os
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from alembic import command
+from sqlalchemy import insert, text
+from app.database import Base, SessionLocal, engine, get_alembic_config
+from app.models import (
+    User, UserRole, Student, Teacher, Course, Batch, batch_students, Attendance, Fee, PaymentStatus,
+    PaymentMethod, Test, TestResult, StudyMaterial, Notification, SignupRequest, SignupRequestStatus,
+)
+from app.services.attendance_rollup_service import AttendanceRollupService
+from app.utils.auth import get_password_hash
+
+PASSWORD = "benchmark-password"
+ADMIN_EMAIL = "admin@bench.example.com"
+
+_CHUNK = 5000
+_CLASS_CATEGORIES = ["9", "10", "11", "12", "JEE Main/Advance", "NEET", "CUET", "B.com(P/H)"]
+_SUBJECTS = ["Mathematics", "Physics", "Chemistry", "Biology", "English", "Accountancy", "Economics"]
+_DAY_PATTERNS = [("Mon, Wed, Fri", (0, 2, 4)), ("Tue, Thu, Sat", (1, 3, 5)), ("Mon - Fri", (0, 1, 2, 3, 4))]
+_TIMINGS = ["7-8", "8-9", "9-10", "10-11", "4-5", "5-6", "6-7", "7-8 PM"]
+
+
+@dataclass
+class InstituteSize:
+    courses: int
+    batches_per_course: int
+    teachers: int
+    students: int
+    months: int
+    tests_per_month: int = 2
+    attendance_rate: float = 0.85
+
+
+SIZES = {
+    "small": InstituteSize(courses=4, batches_per_course=2, teachers=6, students=200, months=3),
+    "medium": InstituteSize(courses=8, batches_per_course=3, teachers=20, students=1000, months=6),
+    "large": InstituteSize(courses=12, batches_per_course=4, teachers=40, students=5000, months=12),
+}
+
+
+def reset_database() -> None:
+    """Drop every table, then rebuild the schema through the Alembic migrations"""
+    Base.metadata.drop_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("DROP TABLE IF EXISTS alembic_version"))
+    command.upgrade(get_alembic_config(), "head")
+
+
+def _bulk_insert(db, table, rows: List[dict]) -> None:
+    for start in range(0, len(rows), _CHUNK):
+        db.execute(insert(table), rows[start:start + _CHUNK])
+
+
+def _sync_sequences(db, tables) -> None:
+    # Explicit ids leave PostgreSQL's serial sequences behind the data
+    if engine.dialect.name != "postgresql":
+        return
+    for table in tables:
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table.name}), 1))"
+        ))
+
+
+def _class_days(start: date, end: date, weekdays) -> List[date]:
+    days, current = [], start
+    while current <= end:
+        if current.weekday() in weekdays:
+            days.append(current)
+        current += timedelta(days=1)
+    return days
+
+
+def generate_institute(size: InstituteSize, seed: int = 42) -> Dict[str, int]:
+    """Insert a synthetic institute into an empty schema, returning row counts per table"""
+    rng = random.Random(seed)
+    today = date.today()
+    start = today - timedelta(days=30 * size.months)
+    now = datetime.now()
+    password_hash = get_password_hash(PASSWORD)
+    rows: Dict[str, List[dict]] = {}
+
+    users = rows["users"] = [{
+        "id": 1, "email": ADMIN_EMAIL, "username": "admin", "full_name": "Bench Admin",
+        "password_hash": password_hash, "role": UserRole.ADMIN, "is_active": True, "is_verified": True,
+    }]
+
+    courses = rows["courses"] = [
+        {
+            "id": i + 1,
+            "name": f"{_CLASS_CATEGORIES[i % len(_CLASS_CATEGORIES)]} {_SUBJECTS[i % len(_SUBJECTS)]}",
+            "class_category": _CLASS_CATEGORIES[i % len(_CLASS_CATEGORIES)],
+            "duration": "12 months",
+            "monthly_fees": "₹3,500",
+            "yearly_fees": "₹40,000",
+            "description": f"Synthetic course {i + 1}",
+        }
+        for i in range(size.courses)
+    ]
+
+    teachers = rows["teachers"] = []
+    for i in range(size.teachers):
+        user_id = len(users) + 1
+        users.append({
+            "id": user_id, "email": f"teacher{i}@bench.example.com", "username": f"teacher{i}",
+            "full_name": f"Teacher {i}", "phone": f"90000{i:05d}", "password_hash": password_hash,
+            "role": UserRole.TEACHER, "is_active": True, "is_verified": True,
+        })
+        teachers.append({
+            "id": i + 1, "user_id": user_id, "subject": _SUBJECTS[i % len(_SUBJECTS)],
+            "qualification": "M.Sc", "experience": f"{rng.randint(1, 15)} years", "status": "Active",
+        })
+
+    batches = rows["batches"] = []
+    batch_weekdays = {}
+    for course in courses:
+        for n in range(size.batches_per_course):
+            batch_id = len(batches) + 1
+            days, weekdays = _DAY_PATTERNS[batch_id % len(_DAY_PATTERNS)]
+            batch_weekdays[batch_id] = weekdays
+            batches.append({
+                "id": batch_id, "name": f"{course['name']} {chr(65 + n)}", "code": f"B{batch_id:04d}",
+                "course_id": course["id"], "teacher_id": (batch_id - 1) % size.teachers + 1,
+                "timing": _TIMINGS[batch_id % len(_TIMINGS)], "days": days,
+                "start_date": datetime.combine(start, datetime.min.time()), "max_students": 60,
+                "created_at": now,
+            })
+
+    students = rows["students"] = []
+    enrollments = rows["batch_students"] = []
+    for i in range(size.students):
+        user_id = len(users) + 1
+        users.append({
+            "id": user_id, "email": f"student{i}@bench.example.com", "username": f"student{i}",
+            "full_name": f"Student {i}", "phone": f"80000{i:05d}", "password_hash": password_hash,
+            "role": UserRole.STUDENT, "is_active": True, "is_verified": True,
+        })
+        primary = batches[i % len(batches)]
+        student_batches = [primary]
+        if rng.random() < 0.3:
+            student_batches.append(rng.choice(batches))
+        course = courses[primary["course_id"] - 1]
+        students.append({
+            "id": i + 1, "user_id": user_id, "course": course["class_category"], "batch": primary["code"],
+            "subjects": course["name"], "status": "Active", "enrollment_date": start,
+        })
+        for batch in {b["id"]: b for b in student_batches}.values():
+            enrollments.append({"batch_id": batch["id"], "student_id": i + 1})
+
+    members: Dict[int, List[int]] = {}
+    for enrollment in enrollments:
+        members.setdefault(enrollment["batch_id"], []).append(enrollment["student_id"])
+
+    attendance = rows["attendance"] = []
+    for batch in batches:
+        teacher_user_id = teachers[batch["teacher_id"] - 1]["user_id"]
+        for day in _class_days(start, today, batch_weekdays[batch["id"]]):
+            for student_id in members.get(batch["id"], []):
+                attendance.append({
+                    "id": len(attendance) + 1, "student_id": student_id, "batch_id": batch["id"], "date": day,
+                    "is_present": rng.random() < size.attendance_rate, "marked_by": teacher_user_id,
+                    "created_at": now,
+                })
+
+    fees = rows["fees"] = []
+    for student in students:
+        for month in range(size.months):
+            due = start + timedelta(days=30 * month + 10)
+            roll = rng.random()
+            if due > today or roll < 0.15:
+                status, paid = (PaymentStatus.OVERDUE if due < today else PaymentStatus.PENDING), 0
+            elif roll < 0.25:
+                status, paid = PaymentStatus.PARTIAL, 1500
+            else:
+                status, paid = PaymentStatus.PAID, 3500
+            fee_id = len(fees) + 1
+            fees.append({
+                "id": fee_id, "student_id": student["id"], "amount": 3500, "due_date": due, "paid_amount": paid,
+                "payment_date": due - timedelta(days=rng.randint(0, 5)) if paid else None, "status": status,
+                "payment_method": PaymentMethod.UPI if paid else None,
+                "transaction_id": f"bench_txn_{fee_id}" if paid else None, "created_at": now,
+            })
+
+    tests = rows["tests"] = []
+    results = rows["test_results"] = []
+    for batch in batches:
+        for month in range(size.months):
+            for n in range(size.tests_per_month):
+                test_date = datetime.combine(start + timedelta(days=30 * month + 7 + 10 * n), datetime.min.time())
+                test_id = len(tests) + 1
+                tests.append({
+                    "id": test_id, "title": f"{batch['name']} test {month + 1}.{n + 1}",
+                    "course_id": batch["course_id"], "teacher_id": batch["teacher_id"], "total_marks": 100,
+                    "passing_marks": 33, "duration_minutes": 60, "test_date": test_date,
+                    "is_published": True, "created_at": now,
+                })
+                if test_date.date() > today:
+                    continue
+                for student_id in members.get(batch["id"], []):
+                    marks = max(0, min(100, int(rng.gauss(65, 15))))
+                    results.append({
+                        "id": len(results) + 1, "test_id": test_id, "student_id": student_id,
+                        "marks_obtained": marks, "percentage": marks, "submitted_at": test_date,
+                        "evaluated_at": test_date + timedelta(days=2), "created_at": test_date,
+                    })
+
+    materials = rows["study_materials"] = []
+    for batch in batches:
+        for n in range(3):
+            materials.append({
+                "id": len(materials) + 1, "title": f"{batch['name']} notes {n + 1}",
+                "file_url": f"uploads/study_materials/bench_{len(materials) + 1}.pdf", "file_type": "pdf",
+                "file_size": rng.randint(50_000, 5_000_000), "course_id": batch["course_id"],
+                "teacher_id": batch["teacher_id"], "is_public": n == 0, "created_at": now,
+            })
+
+    rows["notifications"] = [
+        {
+            "id": n + 1, "title": f"Notice {n + 1}", "message": "Synthetic announcement for benchmarking",
+            "audience": ("all", "students", "teachers")[n % 3], "is_active": True, "created_by": 1,
+            "created_at": now - timedelta(days=n),
+        }
+        for n in range(20)
+    ]
+    rows["signup_requests"] = [
+        {
+            "id": n + 1, "full_name": f"Applicant {n}", "email": f"applicant{n}@bench.example.com",
+            "phone": f"70000{n:05d}", "desired_role": "student", "academic_focus": "JEE",
+            "username": f"applicant{n}", "password_hash": password_hash,
+            "status": SignupRequestStatus.PENDING, "created_at": now,
+        }
+        for n in range(25)
+    ]
+
+    tables = {
+        "users": User.__table__, "courses": Course.__table__, "teachers": Teacher.__table__,
+        "batches": Batch.__table__, "students": Student.__table__, "batch_students": batch_students,
+        "attendance": Attendance.__table__, "fees": Fee.__table__, "tests": Test.__table__,
+        "test_results": TestResult.__table__, "study_materials": StudyMaterial.__table__,
+        "notifications": Notification.__table__, "signup_requests": SignupRequest.__table__,
+    }
+    db = SessionLocal()
+    try:
+        for name, table in tables.items():
+            _bulk_insert(db, table, rows[name])
+        _sync_sequences(db, [table for name, table in tables.items() if name != "batch_students"])
+        db.commit()
+        # Bulk inserts bypass mark_attendance, so backfill the rollups as a deployment would
+        AttendanceRollupService(db).rebuild()
+    finally:
+        db.close()
+    return {name: len(rows[name]) for name in tables}
+
+
+def add_size_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--size", choices=sorted(SIZES), default="small")
+    for field in ("courses", "batches_per_course", "teachers", "students", "months"):
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, help=f"override the preset's {field}")
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def size_from_args(args) -> InstituteSize:
+    overrides = {
+        field: getattr(args, field)
+        for field in ("courses", "batches_per_course", "teachers", "students", "months")
+        if getattr(args, field) is not None
+    }
+    return InstituteSize(**{**asdict(SIZES[args.size]), **overrides})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_size_arguments(parser)
+    parser.add_argument("--reset", action="store_true", help="drop all tables and migrate to head first")
+    args = parser.parse_args()
+
+    if args.reset:
+        reset_database()
+    size = size_from_args(args)
+    started = time.perf_counter()
+    counts = generate_institute(size, seed=args.seed)
+    print(f"{engine.url.render_as_string(hide_password=True)}: {size}")
+    for name, count in counts.items():
+        print(f"{name:<18}{count:>10}")
+    print(f"generated in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Shared pytest fixtures for the backend.
+
+Tests run against a throwaway SQLite database (set TEST_DATABASE_URL to use
+another one; it is dropped and rebuilt), seeded once per session with the
+small synthetic institute from benchmarks/datagen.py.
+"""
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or \
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='pytest_'), 'test.db')}"
+os.environ.setdefault("SECRET_KEY", "test")
+# Nothing but the request under test may run statements while a budget is counted
+os.environ["WARMUP_ENABLED"] = "False"
+os.environ["SLOW_QUERY_THRESHOLD_MS"] = "0"
+# The principals version is re-read only when a test clears it
+os.environ["AUTH_REVOCATION_CHECK_SECONDS"] = "3600"
+
+import logging
+import pytest
+from fastapi.testclient import TestClient
+from app.utils.query_guard import assert_query_budget
+from benchmarks.datagen import ADMIN_EMAIL, PASSWORD, SIZES, generate_institute, reset_database
+
+# A manual script that queries the database at import time, not a test module
+collect_ignore = ["test_teacher_tests.py"]
+
+
+@pytest.fixture(scope="session")
+def institute() -> dict:
+    """Row counts of the seeded synthetic institute"""
+    logging.getLogger("alembic").setLevel(logging.WARNING)
+    reset_database()
+    return generate_institute(SIZES["small"])
+
+
+@pytest.fixture(scope="session")
+def client(institute):
+    """TestClient for the app, with its startup and shutdown run once per session"""
+    from main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def admin_headers(client) -> dict:
+    """Bearer headers for the seeded admin, whose principal is already cached.
+
+    Budgets then count only the endpoint's own statements, not the users
+    lookup of a principal-cache miss.
+    """
+    response = client.post("/api/auth/login", json={"email": ADMIN_EMAIL, "password": PASSWORD})
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    client.get("/api/auth/me", headers=headers).raise_for_status()
+    return headers
+
+
+@pytest.fixture
+def query_budget():
+    """Assert how many SQL statements a block (typically one request) may run.
+
+        def test_students_list(client, admin_headers, query_budget):
+            with query_budget(3, max_repeats=1):
+                client.get("/api/admin/students", headers=admin_headers)
+
+    On failure the assertion lists every statement shape with its count.
+    """
+    return assert_query_budget
@@ -0,0 +1,20 @@
+# Loaded automatically by gunicorn from the working directory (see Procfile).
+import os
+import shutil
+import tempfile
+
+# Each worker writes its metrics to mmap files here; /metrics merges them
+PROMETHEUS_MULTIPROC_DIR = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "institute-prometheus")
+)
+
+
+def on_starting(server):
+    # Counters from a previous run would otherwise be merged into this one
+    shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
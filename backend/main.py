@@ -1,8 +1,22 @@
-from fastapi import FastAPI, Request
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from app.routes import auth, admin, student, teacher, payment, notification, contact, signup
-from app.database import engine, Base
+from app.database import engine, SessionLocal, ensure_schema_at_head
+from app.services.auth_service import AuthService
+from app.utils.passwords import shutdown_hashing_executor
+from app.utils.report_cards import shutdown_report_card_executor
+from app.utils.warmup import run_warmup, warm_async_pool
+from app.utils.metrics import MetricsMiddleware, render_metrics, require_metrics_token
+from app.utils.query_guard import QueryGuardMiddleware
+from app.utils.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.utils.responses import FastJSONResponse
 from app.config import settings
 import logging
 
@@ -10,13 +24,73 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# Milliseconds spent in each startup phase of this worker, logged once per
+# boot so regressions can be compared across releases
+startup_timings = {}
+
+
+def purge_expired_refresh_tokens():
+    """Bulk-delete refresh tokens that expired while the app was down"""
+    db = SessionLocal()
+    try:
+        deleted = AuthService(db).purge_expired_refresh_tokens()
+        if deleted:
+            logger.info(f"Purged {deleted} expired refresh tokens")
+    finally:
+        db.close()
+
+
+async def warm_up(app: FastAPI):
+    """Prime connections, compiled SQL and caches, then mark the worker ready"""
+    started = time.perf_counter()
+    try:
+        startup_timings.update(await asyncio.to_thread(run_warmup, app))
+        startup_timings.update(await warm_async_pool())
+    except Exception as exc:
+        # Warm-up only saves latency; a worker that cannot finish it still serves
+        logger.warning(f"Warm-up incomplete: {exc}")
+    startup_timings["warmup_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    app.state.ready = True
+    logger.info(
+        "Ready; startup timings (ms): " + ", ".join(f"{name}={value}" for name, value in startup_timings.items())
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    started = time.perf_counter()
+    if settings.DB_SCHEMA_CHECK:
+        ensure_schema_at_head()
+    startup_timings["schema_check_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    phase_started = time.perf_counter()
+    purge_expired_refresh_tokens()
+    startup_timings["token_purge_ms"] = round((time.perf_counter() - phase_started) * 1000, 1)
+
+    startup_timings["lifespan_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(
+        "Startup timings (ms): " + ", ".join(f"{name}={value}" for name, value in startup_timings.items())
+    )
+
+    # /health answers immediately; /ready waits for the warm-up to finish
+    warmup_task = asyncio.create_task(warm_up(app)) if settings.WARMUP_ENABLED else None
+    if warmup_task is None:
+        app.state.ready = True
+    yield
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    shutdown_hashing_executor()
+    shutdown_report_card_executor()
+    engine.dispose()
+
 
 app = FastAPI(
     title="Institute Management System API",
     description="API for managing coaching institute operations",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -26,8 +100,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER],
 )
 
+if settings.QUERY_GUARD_MODE != "off":
+    app.add_middleware(QueryGuardMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -46,6 +127,20 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+    async def metrics():
+        """Prometheus metrics merged across all workers"""
+        body, content_type = render_metrics()
+        return Response(content=body, headers={"Content-Type": content_type})
+
+@app.get("/ready")
+async def readiness_check():
+    """503 until the lifespan warm-up has finished on this worker"""
+    if not getattr(app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready", "startup_timings": startup_timings}
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
@@ -56,6 +151,8 @@ app.include_router(notification.router, prefix="/api/notifications", tags=["Noti
 app.include_router(contact.router, prefix="/api/contact", tags=["Contact"])
 app.include_router(signup.router, prefix="/api/signup", tags=["Signup"])
 
+startup_timings["import_ms"] = round((time.perf_counter() - _import_started) * 1000, 1)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
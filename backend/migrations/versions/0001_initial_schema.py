@@ -0,0 +1,254 @@
+"""initial schema
+
+Tables as created by Base.metadata.create_all before migrations were
+introduced. Bring an existing database under Alembic with
+`alembic stamp 0001` followed by `alembic upgrade head`.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('courses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('class_category', sa.String(length=100), nullable=True),
+    sa.Column('duration', sa.String(length=50), nullable=True),
+    sa.Column('monthly_fees', sa.String(length=50), nullable=True),
+    sa.Column('yearly_fees', sa.String(length=50), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_courses_id'), 'courses', ['id'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('username', sa.String(length=100), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=True),
+    sa.Column('role', sa.Enum('ADMIN', 'TEACHER', 'STUDENT', name='userrole'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('profile_picture', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_login', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('notifications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('audience', sa.String(length=50), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('recipient_roles', sa.Text(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_notifications_id'), 'notifications', ['id'], unique=False)
+    op.create_table('signup_requests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('full_name', sa.String(length=255), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('phone', sa.String(length=20), nullable=False),
+    sa.Column('desired_role', sa.String(length=50), nullable=False),
+    sa.Column('academic_focus', sa.String(length=255), nullable=False),
+    sa.Column('motivations', sa.Text(), nullable=True),
+    sa.Column('username', sa.String(length=100), nullable=False),
+    sa.Column('password_hash', sa.String(length=255), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'APPROVED', 'REJECTED', name='signuprequeststatus'), nullable=False),
+    sa.Column('admin_note', sa.Text(), nullable=True),
+    sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('approved_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_signup_requests_id'), 'signup_requests', ['id'], unique=False)
+    op.create_table('students',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('course', sa.String(length=100), nullable=True),
+    sa.Column('batch', sa.String(length=100), nullable=True),
+    sa.Column('subjects', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('enrollment_date', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_index(op.f('ix_students_id'), 'students', ['id'], unique=False)
+    op.create_table('teachers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('subject', sa.String(length=255), nullable=True),
+    sa.Column('qualification', sa.String(length=255), nullable=True),
+    sa.Column('experience', sa.String(length=50), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_index(op.f('ix_teachers_id'), 'teachers', ['id'], unique=False)
+    op.create_table('batches',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('code', sa.String(length=50), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('teacher_id', sa.Integer(), nullable=True),
+    sa.Column('timing', sa.String(length=100), nullable=True),
+    sa.Column('days', sa.String(length=100), nullable=True),
+    sa.Column('start_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('end_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('max_students', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ),
+    sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_batches_code'), 'batches', ['code'], unique=True)
+    op.create_index(op.f('ix_batches_id'), 'batches', ['id'], unique=False)
+    op.create_table('fees',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.Column('due_date', sa.Date(), nullable=False),
+    sa.Column('paid_amount', sa.Integer(), nullable=True),
+    sa.Column('payment_date', sa.Date(), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'PAID', 'OVERDUE', 'PARTIAL', name='paymentstatus'), nullable=True),
+    sa.Column('payment_method', sa.Enum('CASH', 'CARD', 'UPI', 'BANK_TRANSFER', 'ONLINE', name='paymentmethod'), nullable=True),
+    sa.Column('transaction_id', sa.String(length=255), nullable=True),
+    sa.Column('remarks', sa.String(length=500), nullable=True),
+    sa.Column('receipt_url', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('transaction_id')
+    )
+    op.create_index(op.f('ix_fees_id'), 'fees', ['id'], unique=False)
+    op.create_table('study_materials',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('file_url', sa.String(length=500), nullable=False),
+    sa.Column('file_type', sa.String(length=50), nullable=True),
+    sa.Column('file_size', sa.Integer(), nullable=True),
+    sa.Column('course_id', sa.Integer(), nullable=True),
+    sa.Column('teacher_id', sa.Integer(), nullable=False),
+    sa.Column('is_public', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ),
+    sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_study_materials_id'), 'study_materials', ['id'], unique=False)
+    op.create_table('tests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('course_id', sa.Integer(), nullable=True),
+    sa.Column('teacher_id', sa.Integer(), nullable=False),
+    sa.Column('total_marks', sa.Integer(), nullable=False),
+    sa.Column('passing_marks', sa.Integer(), nullable=True),
+    sa.Column('duration_minutes', sa.Integer(), nullable=True),
+    sa.Column('test_date', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_published', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ),
+    sa.ForeignKeyConstraint(['teacher_id'], ['teachers.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_tests_id'), 'tests', ['id'], unique=False)
+    op.create_table('attendances',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('batch_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('is_present', sa.Boolean(), nullable=True),
+    sa.Column('remarks', sa.String(length=500), nullable=True),
+    sa.Column('marked_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['batch_id'], ['batches.id'], ),
+    sa.ForeignKeyConstraint(['marked_by'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_attendances_id'), 'attendances', ['id'], unique=False)
+    op.create_table('batch_students',
+    sa.Column('batch_id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['batch_id'], ['batches.id'], ),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+    sa.PrimaryKeyConstraint('batch_id', 'student_id')
+    )
+    op.create_table('test_results',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('test_id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('marks_obtained', sa.Integer(), nullable=False),
+    sa.Column('percentage', sa.Integer(), nullable=True),
+    sa.Column('remarks', sa.Text(), nullable=True),
+    sa.Column('submitted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('evaluated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+    sa.ForeignKeyConstraint(['test_id'], ['tests.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_test_results_id'), 'test_results', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_test_results_id'), table_name='test_results')
+    op.drop_table('test_results')
+    op.drop_table('batch_students')
+    op.drop_index(op.f('ix_attendances_id'), table_name='attendances')
+    op.drop_table('attendances')
+    op.drop_index(op.f('ix_tests_id'), table_name='tests')
+    op.drop_table('tests')
+    op.drop_index(op.f('ix_study_materials_id'), table_name='study_materials')
+    op.drop_table('study_materials')
+    op.drop_index(op.f('ix_fees_id'), table_name='fees')
+    op.drop_table('fees')
+    op.drop_index(op.f('ix_batches_id'), table_name='batches')
+    op.drop_index(op.f('ix_batches_code'), table_name='batches')
+    op.drop_table('batches')
+    op.drop_index(op.f('ix_teachers_id'), table_name='teachers')
+    op.drop_table('teachers')
+    op.drop_index(op.f('ix_students_id'), table_name='students')
+    op.drop_table('students')
+    op.drop_index(op.f('ix_signup_requests_id'), table_name='signup_requests')
+    op.drop_table('signup_requests')
+    op.drop_index(op.f('ix_notifications_id'), table_name='notifications')
+    op.drop_table('notifications')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_courses_id'), table_name='courses')
+    op.drop_table('courses')
@@ -0,0 +1,48 @@
+"""hot path indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_attendances_student_id_date', 'attendances', ['student_id', 'date', 'is_present'], unique=False)
+    op.create_index('ix_attendances_batch_id_date', 'attendances', ['batch_id', 'date'], unique=False)
+    op.create_index(op.f('ix_batch_students_student_id'), 'batch_students', ['student_id'], unique=False)
+    op.create_index(op.f('ix_batches_teacher_id'), 'batches', ['teacher_id'], unique=False)
+    op.create_index('ix_fees_student_id_status', 'fees', ['student_id', 'status'], unique=False)
+    op.create_index('ix_notifications_is_active_created_at', 'notifications', ['is_active', 'created_at'], unique=False)
+    op.create_index(op.f('ix_study_materials_course_id'), 'study_materials', ['course_id'], unique=False)
+    op.create_index(op.f('ix_study_materials_teacher_id'), 'study_materials', ['teacher_id'], unique=False)
+    op.create_index('ix_test_results_test_id_student_id', 'test_results', ['test_id', 'student_id'], unique=False)
+    op.create_index(op.f('ix_test_results_student_id'), 'test_results', ['student_id'], unique=False)
+    op.create_index('ix_tests_course_id_is_published', 'tests', ['course_id', 'is_published'], unique=False)
+    op.create_index(op.f('ix_tests_teacher_id'), 'tests', ['teacher_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tests_teacher_id'), table_name='tests')
+    op.drop_index('ix_tests_course_id_is_published', table_name='tests')
+    op.drop_index(op.f('ix_test_results_student_id'), table_name='test_results')
+    op.drop_index('ix_test_results_test_id_student_id', table_name='test_results')
+    op.drop_index(op.f('ix_study_materials_teacher_id'), table_name='study_materials')
+    op.drop_index(op.f('ix_study_materials_course_id'), table_name='study_materials')
+    op.drop_index('ix_notifications_is_active_created_at', table_name='notifications')
+    op.drop_index('ix_fees_student_id_status', table_name='fees')
+    op.drop_index(op.f('ix_batches_teacher_id'), table_name='batches')
+    op.drop_index(op.f('ix_batch_students_student_id'), table_name='batch_students')
+    op.drop_index('ix_attendances_batch_id_date', table_name='attendances')
+    op.drop_index('ix_attendances_student_id_date', table_name='attendances')
@@ -0,0 +1,32 @@
+"""unique attendance per student, batch and day
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Re-submitted days left duplicate rows; keep the most recent mark of each.
+    # The derived table lets MySQL delete from the table it reads.
+    op.execute(
+        "DELETE FROM attendances WHERE id NOT IN ("
+        "SELECT id FROM (SELECT MAX(id) AS id FROM attendances GROUP BY student_id, batch_id, date) AS latest)"
+    )
+    op.create_index('uq_attendances_student_id_batch_id_date', 'attendances', ['student_id', 'batch_id', 'date'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_attendances_student_id_batch_id_date', table_name='attendances')
@@ -0,0 +1,30 @@
+"""case-insensitive lookup indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_email_lower', 'users', [sa.func.lower(sa.column('email'))], unique=False)
+    op.create_index('ix_users_username_lower', 'users', [sa.func.lower(sa.column('username'))], unique=False)
+    op.create_index('ix_signup_requests_email_lower_status', 'signup_requests', [sa.func.lower(sa.column('email')), 'status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_signup_requests_email_lower_status', table_name='signup_requests')
+    op.drop_index('ix_users_username_lower', table_name='users')
+    op.drop_index('ix_users_email_lower', table_name='users')
@@ -0,0 +1,31 @@
+"""cache versions
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    cache_versions = op.create_table('cache_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.bulk_insert(cache_versions, [{'name': 'dashboard_stats', 'version': 0}])
+
+
+def downgrade() -> None:
+    op.drop_table('cache_versions')
@@ -0,0 +1,30 @@
+"""keyset pagination indexes
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_fees_due_date_id', 'fees', ['due_date', 'id'], unique=False)
+    op.create_index('ix_fees_status_due_date_id', 'fees', ['status', 'due_date', 'id'], unique=False)
+    op.create_index('ix_signup_requests_status_id', 'signup_requests', ['status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_signup_requests_status_id', table_name='signup_requests')
+    op.drop_index('ix_fees_status_due_date_id', table_name='fees')
+    op.drop_index('ix_fees_due_date_id', table_name='fees')
@@ -0,0 +1,61 @@
+"""attendance rollups
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('student_batch_attendance',
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('batch_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('present', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['batch_id'], ['batches.id'], ),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ),
+    sa.PrimaryKeyConstraint('student_id', 'batch_id')
+    )
+    op.create_index(op.f('ix_student_batch_attendance_batch_id'), 'student_batch_attendance', ['batch_id'], unique=False)
+    op.create_table('batch_daily_attendance',
+    sa.Column('batch_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('total', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('present', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['batch_id'], ['batches.id'], ),
+    sa.PrimaryKeyConstraint('batch_id', 'date')
+    )
+    op.create_index(op.f('ix_batch_daily_attendance_date'), 'batch_daily_attendance', ['date'], unique=False)
+
+    # Backfill from existing marks, leaving out those of deleted students or batches
+    marks = (
+        "FROM attendances a JOIN students s ON s.id = a.student_id JOIN batches b ON b.id = a.batch_id"
+    )
+    present = "SUM(CASE WHEN a.is_present THEN 1 ELSE 0 END)"
+    op.execute(
+        "INSERT INTO student_batch_attendance (student_id, batch_id, total, present) "
+        f"SELECT a.student_id, a.batch_id, COUNT(*), {present} {marks} GROUP BY a.student_id, a.batch_id"
+    )
+    op.execute(
+        "INSERT INTO batch_daily_attendance (batch_id, date, total, present) "
+        f"SELECT a.batch_id, a.date, COUNT(*), {present} {marks} GROUP BY a.batch_id, a.date"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_batch_daily_attendance_date'), table_name='batch_daily_attendance')
+    op.drop_table('batch_daily_attendance')
+    op.drop_index(op.f('ix_student_batch_attendance_batch_id'), table_name='student_batch_attendance')
+    op.drop_table('student_batch_attendance')
@@ -0,0 +1,27 @@
+"""reference data cache version
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    cache_versions = sa.table('cache_versions', sa.column('name', sa.String), sa.column('version', sa.Integer))
+    op.bulk_insert(cache_versions, [{'name': 'reference_data', 'version': 0}])
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM cache_versions WHERE name = 'reference_data'")
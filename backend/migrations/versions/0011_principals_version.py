@@ -0,0 +1,27 @@
+"""auth principals cache version
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    cache_versions = sa.table('cache_versions', sa.column('name', sa.String), sa.column('version', sa.Integer))
+    op.bulk_insert(cache_versions, [{'name': 'principals', 'version': 0}])
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM cache_versions WHERE name = 'principals'")
@@ -0,0 +1,29 @@
+"""signup requests listed newest first by created_at
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_signup_requests_created_at_id', 'signup_requests', ['created_at', 'id'], unique=False)
+    op.create_index('ix_signup_requests_status_created_at_id', 'signup_requests', ['status', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_signup_requests_status_id', table_name='signup_requests')
+
+
+def downgrade() -> None:
+    op.create_index('ix_signup_requests_status_id', 'signup_requests', ['status', 'id'], unique=False)
+    op.drop_index('ix_signup_requests_status_created_at_id', table_name='signup_requests')
+    op.drop_index('ix_signup_requests_created_at_id', table_name='signup_requests')
@@ -0,0 +1,15 @@
+"""/metrics answers only scrapers that present METRICS_TOKEN."""
+from app.config import settings
+
+
+def test_metrics_requires_token(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    assert client.get("/metrics").status_code == 403
+    # A user's JWT is not a scrape credential
+    assert client.get("/metrics", headers=admin_headers).status_code == 403
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 403
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert b"http_requests_total" in response.content
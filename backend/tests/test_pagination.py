@@ -0,0 +1,32 @@
+"""Cursor walks over list endpoints return every row once, in order."""
+from datetime import datetime
+from app.database import SessionLocal
+from app.models import SignupRequest
+
+
+def test_signup_requests_walk_newest_first(client, admin_headers):
+    # Requests share created_at seconds, so only id tells them apart
+    db = SessionLocal()
+    try:
+        for n in range(7):
+            request = SignupRequest(full_name=f"Walk {n}", email=f"walk{n}@example.com", phone="0",
+                                    desired_role="student", academic_focus="-", username=f"walk{n}",
+                                    password_hash="-")
+            if n % 2:
+                request.created_at = datetime(2026, 1, 1, 9, 0, 0)
+            db.add(request)
+        db.commit()
+        rows = db.query(SignupRequest.id, SignupRequest.created_at).all()
+    finally:
+        db.close()
+    expected = [row.id for row in sorted(rows, key=lambda row: (row.created_at, row.id), reverse=True)]
+
+    seen, params = [], {"limit": 2}
+    while True:
+        response = client.get("/api/signup/requests", params=params, headers=admin_headers)
+        response.raise_for_status()
+        seen += [row["id"] for row in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+    assert seen == expected
@@ -0,0 +1,48 @@
+"""Admin listings run a fixed number of SQL statements, whatever the page size.
+
+The pytest counterpart of benchmarks/check_query_counts.py: a listing that
+starts lazy-loading a relationship per row fails here with the repeated
+statement shapes in the assertion message.
+"""
+import pytest
+from sqlalchemy import func, insert
+from app.database import SessionLocal
+from app.models import Batch, Student, batch_students
+
+PAGE_SIZES = (1, 10, 100)
+
+# Statements per request: the page plus one IN query per eager-loaded relationship
+LISTING_BUDGET = 2
+
+
+@pytest.mark.parametrize("path", ["/api/admin/students", "/api/admin/teachers"])
+@pytest.mark.parametrize("limit", PAGE_SIZES)
+def test_listing_page_runs_fixed_statements(client, admin_headers, query_budget, path, limit):
+    with query_budget(LISTING_BUDGET, max_repeats=1):
+        response = client.get(path, params={"limit": limit}, headers=admin_headers)
+    assert response.status_code == 200
+    rows = response.json()
+    assert len({row["id"] for row in rows}) == len(rows)
+    assert len(rows) == limit or "X-Next-Cursor" not in response.headers
+
+
+def test_student_batches_do_not_grow_with_enrolments(client, admin_headers, query_budget):
+    db = SessionLocal()
+    try:
+        student_id = db.query(func.min(Student.id)).scalar()
+        enrolled = {row.batch_id for row in db.query(batch_students.c.batch_id).filter(
+            batch_students.c.student_id == student_id
+        )}
+        missing = [{"batch_id": batch_id, "student_id": student_id}
+                   for (batch_id,) in db.query(Batch.id) if batch_id not in enrolled]
+        if missing:
+            db.execute(insert(batch_students), missing)
+            db.commit()
+        batch_count = db.query(func.count(Batch.id)).scalar()
+    finally:
+        db.close()
+
+    with query_budget(LISTING_BUDGET, max_repeats=1):
+        response = client.get(f"/api/admin/students/{student_id}/batches", headers=admin_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == batch_count
@@ -0,0 +1,52 @@
+"""Per-worker caches drop entries that another worker's write has superseded.
+
+Each test fills this worker's cache, then commits a change and puts the
+stale entry back, as a second gunicorn worker that never saw the write
+would still hold it.
+"""
+from app.database import SessionLocal
+from app.models import Course, User
+from app.services.admin_service import reference_cache
+from app.utils.auth import principal_cache, principals_version_cache
+from benchmarks.datagen import PASSWORD
+
+
+def test_course_rename_reaches_other_workers(client, admin_headers):
+    client.get("/api/admin/courses", headers=admin_headers).raise_for_status()
+    stale = reference_cache.get("courses")
+    assert stale is not None
+
+    db = SessionLocal()
+    try:
+        course = db.query(Course).order_by(Course.id).first()
+        course_id, course.name = course.id, f"{course.name} (renamed)"
+        db.commit()
+        renamed = course.name
+    finally:
+        db.close()
+    reference_cache.set("courses", stale)
+
+    response = client.get("/api/admin/courses", headers=admin_headers)
+    assert {row["id"]: row["name"] for row in response.json()}[course_id] == renamed
+
+
+def test_deactivated_user_is_rejected_by_other_workers(client):
+    email = "student1@bench.example.com"
+    response = client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+    stale = principal_cache.get(email)
+    assert stale is not None
+
+    db = SessionLocal()
+    try:
+        db.query(User).filter(User.email == email).one().is_active = False
+        db.commit()
+        principal_cache.set(email, stale)
+        # Another worker reads the shared version once its check interval has passed
+        principals_version_cache.clear()
+        assert client.get("/api/auth/me", headers=headers).status_code == 403
+    finally:
+        db.query(User).filter(User.email == email).one().is_active = True
+        db.commit()
+        db.close()
@@ -62,7 +62,7 @@ const LoginPage = () => {
         password: formData.password
       });
 
-      const { access_token, user } = response.data;
+      const { access_token, refresh_token, user } = response.data;
 
       // Verify user role matches selected type
       if (user.role !== formData.userType) {
@@ -73,6 +73,7 @@ const LoginPage = () => {
 
       // Save token and user info
       localStorage.setItem("token", access_token);
+      localStorage.setItem("refreshToken", refresh_token);
       localStorage.setItem("user", JSON.stringify(user));
 
       // Redirect based on user type with user's name
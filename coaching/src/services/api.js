@@ -30,10 +30,32 @@ api.interceptors.request.use(
   }
 );
 
+// Exchange the stored refresh token for a new access token; concurrent 401s share one call
+let refreshPromise = null;
+const refreshAccessToken = () => {
+  const refreshToken = localStorage.getItem("refreshToken");
+  if (!refreshToken) {
+    return Promise.reject(new Error("No refresh token"));
+  }
+  if (!refreshPromise) {
+    refreshPromise = axios
+      .post(`${api.defaults.baseURL}/auth/refresh`, { refresh_token: refreshToken })
+      .then((response) => {
+        localStorage.setItem("token", response.data.access_token);
+        localStorage.setItem("refreshToken", response.data.refresh_token);
+        return response.data.access_token;
+      })
+      .finally(() => {
+        refreshPromise = null;
+      });
+  }
+  return refreshPromise;
+};
+
 // Add response interceptor to handle errors
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
+  async (error) => {
     // Log detailed error information
     console.error("API Error:", {
       url: error.config?.url,
@@ -45,8 +67,19 @@ api.interceptors.response.use(
 
     if (error.response?.status === 401) {
       const isLoginRequest = error.config?.url?.includes("/auth/login");
+      if (!isLoginRequest && !error.config._retried) {
+        try {
+          const token = await refreshAccessToken();
+          error.config._retried = true;
+          error.config.headers.Authorization = `Bearer ${token}`;
+          return api(error.config);
+        } catch (refreshError) {
+          // Fall through to a fresh login
+        }
+      }
       if (!isLoginRequest) {
         localStorage.removeItem("token");
+        localStorage.removeItem("refreshToken");
         localStorage.removeItem("user");
         window.location.href = "/login";
       }